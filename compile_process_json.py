@@ -1,160 +1,452 @@
+import argparse
 import json
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+import shutil
 import sys
-import pandas as pd # Added pandas import
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
 
-def process_json_outer_join(directory_path_str: str):
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+try:
+    import orjson
+
+    def _loads(payload: bytes):
+        return orjson.loads(payload)
+except ImportError:  # orjson is optional; the stdlib decoder gives the same result
+    _loads = json.loads
+
+TARGET_DIRECTORY = "processed_jobs"  # Directory with one JSON object per labeled job
+OUTPUT_FILENAME_PARQUET = "processed_jobs_outer_join.parquet"
+FILES_PER_PART = 2000  # JSON files decoded by one worker into one temporary part
+ROW_GROUP_SIZE = 10000  # Rows per Parquet row group in the compiled output
+
+# --- Incremental (append) mode ---
+OUTPUT_DATASET_DIR = "processed_jobs_outer_join"  # One part-NNNNN.parquet per run
+LEDGER_FILENAME = "_compiled_files.json"  # Source files already compiled, with size and mtime
+COMMON_METADATA_FILENAME = "_common_metadata"  # Schema unified over all parts
+
+
+def _load_json_file(file_path: Path) -> Tuple[Optional[Dict], Optional[str]]:
+    """
+    Read and decode one JSON file.
+
+    Returns:
+        (record, None) for a JSON object, (None, reason) for anything that has to be skipped
+    """
+    try:
+        data = _loads(file_path.read_bytes())
+    except ValueError:
+        return None, "Invalid JSON format."
+    except OSError as e:
+        return None, f"Could not read file: {e}"
+    if not isinstance(data, dict):
+        return None, "Content is not a JSON object (dictionary)."
+    return data, None
+
+
+def merge_schemas(current: Optional[pa.Schema], new: pa.Schema) -> pa.Schema:
+    """
+    Outer-join two schemas, including the fields of nested structs.
+
+    Compatible types are promoted by Arrow (null -> anything, int -> double, ...).
+    Fields whose types cannot be reconciled (e.g. a string in one file and an
+    object in another) become strings holding the JSON text of the value.
+    """
+    if current is None:
+        return new
+    try:
+        return pa.unify_schemas([current, new], promote_options="permissive")
+    except (pa.ArrowInvalid, pa.ArrowTypeError, NotImplementedError):
+        fields = {field.name: field for field in current}
+        for field in new:
+            if field.name in fields:
+                fields[field.name] = pa.field(field.name, _merge_types(fields[field.name].type, field.type))
+            else:
+                fields[field.name] = field
+        return pa.schema(list(fields.values()))
+
+
+def _merge_types(current: pa.DataType, new: pa.DataType) -> pa.DataType:
+    if pa.types.is_struct(current) and pa.types.is_struct(new):
+        return pa.struct(list(merge_schemas(pa.schema(list(current)), pa.schema(list(new)))))
+    if pa.types.is_list(current) and pa.types.is_list(new):
+        return pa.list_(_merge_types(current.value_type, new.value_type))
+    try:
+        return pa.unify_schemas([pa.schema([('v', current)]), pa.schema([('v', new)])],
+                                promote_options="permissive").field('v').type
+    except (pa.ArrowInvalid, pa.ArrowTypeError, NotImplementedError):
+        return pa.string()
+
+
+def _parquet_type(data_type: pa.DataType) -> pa.DataType:
+    """Parquet cannot store structs without fields; columns that only ever held {} become null."""
+    if pa.types.is_struct(data_type):
+        if data_type.num_fields == 0:
+            return pa.null()
+        return pa.struct([pa.field(f.name, _parquet_type(f.type)) for f in data_type])
+    if pa.types.is_list(data_type):
+        return pa.list_(_parquet_type(data_type.value_type))
+    return data_type
+
+
+def conform_array(array: pa.Array, target: pa.DataType) -> pa.Array:
+    """
+    Cast an array to the unified type, padding missing struct fields with nulls.
+
+    Args:
+        array: Column (or child) of a part table
+        target: Its type in the unified schema
+
+    Returns:
+        An array of the target type
+    """
+    if isinstance(array, pa.ChunkedArray):
+        return pa.chunked_array([conform_array(chunk, target) for chunk in array.chunks], type=target)
+    if array.type == target:
+        return array
+    if pa.types.is_null(target) or pa.types.is_null(array.type):
+        return pa.nulls(len(array), type=target)
+    if pa.types.is_struct(target) and pa.types.is_struct(array.type):
+        present = {array.type.field(i).name: i for i in range(array.type.num_fields)}
+        children = [
+            conform_array(array.field(present[field.name]), field.type) if field.name in present
+            else pa.nulls(len(array), type=field.type)
+            for field in target
+        ]
+        return pa.StructArray.from_arrays(children, fields=list(target), mask=array.is_null())
+    if pa.types.is_list(target) and pa.types.is_list(array.type):
+        values = conform_array(array.values, target.value_type)
+        return pa.ListArray.from_arrays(array.offsets, values, type=target,
+                                        mask=array.is_null() if array.null_count else None)
+    if pa.types.is_string(target) and not (pa.types.is_string(array.type) or pa.types.is_primitive(array.type)):
+        # Irreconcilable nested value: keep its JSON text
+        return pa.array([None if v is None else json.dumps(v, default=str) for v in array.to_pylist()],
+                        type=target)
+    return array.cast(target, safe=False)
+
+
+def _records_to_table(records: List[Dict]) -> pa.Table:
+    try:
+        return pa.Table.from_struct_array(pa.array(records))
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Conflicting types inside the chunk: build per record and unify like across parts
+        tables = [pa.Table.from_struct_array(pa.array([record])) for record in records]
+        schema = None
+        for table in tables:
+            schema = merge_schemas(schema, table.schema)
+        return pa.concat_tables([conform_table(table, schema) for table in tables])
+
+
+def conform_table(table: pa.Table, schema: pa.Schema) -> pa.Table:
+    """Reorder, pad and cast a table's columns to the given schema."""
+    columns = [
+        conform_array(table.column(field.name), field.type) if field.name in table.column_names
+        else pa.nulls(table.num_rows, type=field.type)
+        for field in schema
+    ]
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def decode_part(file_paths: List[Path], part_path: Path) -> Tuple[Optional[pa.Schema], int, List[Tuple[str, str]]]:
+    """
+    Decode a chunk of JSON files into a temporary Arrow IPC part (runs in a worker process).
+
+    Args:
+        file_paths: JSON files of this chunk
+        part_path: Where to write the part
+
+    Returns:
+        (schema of the part or None if nothing was valid, number of records, skipped (file, reason) pairs)
+    """
+    records = []
+    skipped = []
+    for file_path in file_paths:
+        data, error = _load_json_file(file_path)
+        if error:
+            skipped.append((file_path.name, error))
+            continue
+        # Keep the file name first, as the key every label record is traced back with
+        records.append({"source_file": file_path.name, **{k: v for k, v in data.items() if k != "source_file"}})
+
+    if not records:
+        return None, 0, skipped
+
+    table = _records_to_table(records)
+    with ipc.new_file(part_path, table.schema) as writer:
+        writer.write_table(table)
+    return table.schema, table.num_rows, skipped
+
+
+def _decode_parallel(file_paths: List[Path], temp_dir: Path, workers: Optional[int],
+                     files_per_part: int) -> Tuple[Optional[pa.Schema], List[Path], int]:
+    """
+    Decode JSON files in parallel worker processes into temporary Arrow parts.
+
+    Returns:
+        (merged schema of all parts or None, part paths in input order, number of records)
+    """
+    chunks = [file_paths[i:i + files_per_part] for i in range(0, len(file_paths), files_per_part)]
+    schema = None
+    parts: List[Tuple[int, Path]] = []
+    total_records = 0
+    skipped_files = []
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(decode_part, chunk, temp_dir / f"part-{i:05d}.arrow"): i
+            for i, chunk in enumerate(chunks)
+        }
+        # Merge schemas as parts complete
+        for future in as_completed(futures):
+            part_schema, num_records, skipped = future.result()
+            for file_name, reason in skipped:
+                print(f"Warning: Skipping '{file_name}'. {reason}", file=sys.stderr)
+            skipped_files.extend(name for name, _ in skipped)
+            if part_schema is None:
+                continue
+            schema = merge_schemas(schema, part_schema)
+            index = futures[future]
+            parts.append((index, temp_dir / f"part-{index:05d}.arrow"))
+            total_records += num_records
+
+    if parts:
+        print(f"\nProcessed {total_records} valid JSON files.")
+    if skipped_files:
+        print(f"Skipped {len(skipped_files)} files: {', '.join(skipped_files)}")
+    return schema, [path for _, path in sorted(parts)], total_records
+
+
+def _output_schema(schema: pa.Schema) -> pa.Schema:
+    """source_file first, then the data keys in sorted order, with Parquet-compatible types."""
+    fields = sorted((f for f in schema if f.name != "source_file"), key=lambda f: f.name)
+    return pa.schema([pa.field("source_file", pa.string())] +
+                     [pa.field(f.name, _parquet_type(f.type)) for f in fields])
+
+
+def _write_parts(parts: List[Path], schema: pa.Schema, output_path: Path, row_group_size: int) -> None:
+    """Conform each temporary part to the schema and append it as row groups (atomically)."""
+    temp_output = output_path.with_name(output_path.name + ".tmp")
+    with pq.ParquetWriter(temp_output, schema) as writer:
+        for part_path in parts:
+            with ipc.open_file(part_path) as reader:
+                table = reader.read_all()
+            writer.write_table(conform_table(table, schema), row_group_size=row_group_size)
+            part_path.unlink()
+    os.replace(temp_output, output_path)
+
+
+def compile_json_directory(directory_path_str: str, output_path_str: str,
+                           workers: Optional[int] = None, files_per_part: int = FILES_PER_PART,
+                           row_group_size: int = ROW_GROUP_SIZE) -> int:
     """
-    Reads all JSON files in a directory, performs an outer join on their keys,
-    and returns a list of dictionaries with all keys present.
+    Compile every JSON object file of a directory into one outer-joined Parquet file.
+
+    Chunks of files are decoded in parallel worker processes into temporary Arrow
+    parts while their schemas are merged incrementally; a final pass conforms each
+    part to the unified schema and appends it as row groups. Memory use is bounded
+    by the chunk size, not by the number of files.
 
     Args:
-        directory_path_str: The path to the directory containing JSON files.
+        directory_path_str: Directory containing the JSON files
+        output_path_str: Parquet file to write
+        workers: Number of decoding processes (defaults to the CPU count)
+        files_per_part: JSON files per worker chunk
+        row_group_size: Maximum rows per Parquet row group
 
     Returns:
-        A list of dictionaries, where each dictionary represents a processed
-        JSON file containing all unique keys found across all files.
-        Returns an empty list if the directory is not found or no valid
-        JSON files are processed.
+        Number of records written (0 if nothing valid was found)
     """
     directory_path = Path(directory_path_str)
     if not directory_path.is_dir():
         print(f"Error: Directory not found: {directory_path_str}", file=sys.stderr)
-        return []
-
-    all_keys = set()
-    original_data_list = []
-    processed_files_count = 0
-    skipped_files = []
+        return 0
 
     print(f"Processing JSON files in: {directory_path.resolve()}")
+    start_time = time.perf_counter()
+    file_paths = sorted(directory_path.glob('*.json'))
 
-    # --- First Pass: Read files, validate, collect keys and original data ---
-    for file_path in directory_path.glob('*.json'):
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            if isinstance(data, dict):
-                # Store original data along with source file name
-                original_data_list.append({"source_file": file_path.name, "data": data})
-                all_keys.update(data.keys())
-                processed_files_count += 1
-            else:
-                print(f"Warning: Skipping '{file_path.name}'. Content is not a JSON object (dictionary).", file=sys.stderr)
-                skipped_files.append(file_path.name)
+    temp_dir = Path(tempfile.mkdtemp(prefix="compile_json_"))
+    try:
+        schema, parts, total_records = _decode_parallel(file_paths, temp_dir, workers, files_per_part)
+        if not parts:
+            print("No valid JSON object files found or processed.", file=sys.stderr)
+            return 0
 
-        except json.JSONDecodeError:
-            print(f"Warning: Skipping '{file_path.name}'. Invalid JSON format.", file=sys.stderr)
-            skipped_files.append(file_path.name)
-        except IOError as e:
-            print(f"Warning: Skipping '{file_path.name}'. Could not read file: {e}", file=sys.stderr)
-            skipped_files.append(file_path.name)
-        except Exception as e:
-             print(f"Warning: Skipping '{file_path.name}'. An unexpected error occurred: {e}", file=sys.stderr)
-             skipped_files.append(file_path.name)
+        schema = _output_schema(schema)
+        print(f"\nFound {len(schema) - 1} unique keys across all files.")
+        _write_parts(parts, schema, Path(output_path_str), row_group_size)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
 
+    elapsed = time.perf_counter() - start_time
+    print(f"Compiled {total_records} records from {len(file_paths)} files in {elapsed:.1f}s "
+          f"({len(file_paths) / elapsed:.0f} files/s)")
+    return total_records
 
-    if not original_data_list:
-        print("No valid JSON object files found or processed.", file=sys.stderr)
-        return []
 
-    print(f"\nProcessed {processed_files_count} valid JSON files.")
-    if skipped_files:
-        print(f"Skipped {len(skipped_files)} files: {', '.join(skipped_files)}")
+def _load_ledger(dataset_dir: Path) -> Dict[str, Dict]:
+    ledger_path = dataset_dir / LEDGER_FILENAME
+    if not ledger_path.is_file():
+        return {}
+    with open(ledger_path, 'r', encoding='utf-8') as f:
+        return json.load(f).get("files", {})
 
-    print(f"\nFound {len(all_keys)} unique keys across all files.")
-    # print("All unique keys:", sorted(list(all_keys))) # Optional: Print all keys
 
-    # --- Second Pass: Construct the final list with outer joined keys ---
-    output_list = []
-    # Add 'source_file' key explicitly if you want it in the final output
-    all_keys_with_meta = sorted(list(all_keys))
-    output_keys_order = ['source_file'] + all_keys_with_meta # Define column order
+def _save_ledger(dataset_dir: Path, files: Dict[str, Dict]) -> None:
+    ledger_path = dataset_dir / LEDGER_FILENAME
+    temp_path = ledger_path.with_name(ledger_path.name + ".tmp")
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({"version": 1, "files": files}, f, indent=2)
+    os.replace(temp_path, ledger_path)
 
-    for item in original_data_list:
-        processed_record = {"source_file": item["source_file"]} # Start with source file
-        original_file_data = item["data"]
 
-        for key in all_keys_with_meta: # Iterate through data keys only
-            # Use .get(key, None) which returns None if the key doesn't exist
-            processed_record[key] = original_file_data.get(key, None)
+def read_dataset_schema(dataset_dir: Path) -> Optional[pa.Schema]:
+    """Return the unified schema of a compiled dataset (from its _common_metadata), if any."""
+    metadata_path = Path(dataset_dir) / COMMON_METADATA_FILENAME
+    return pq.read_schema(metadata_path) if metadata_path.is_file() else None
 
-        output_list.append(processed_record)
 
-    # Ensure consistent key order for DataFrame creation (optional but good practice)
-    # This step might not be strictly necessary if pandas handles it, but it's explicit.
-    final_ordered_list = []
-    for record in output_list:
-        ordered_record = {key: record.get(key) for key in output_keys_order}
-        final_ordered_list.append(ordered_record)
+def append_json_directory(directory_path_str: str, dataset_dir_str: str,
+                          workers: Optional[int] = None, files_per_part: int = FILES_PER_PART,
+                          row_group_size: int = ROW_GROUP_SIZE) -> int:
+    """
+    Compile only new or changed JSON files and append them to a Parquet dataset.
 
+    The dataset directory holds one part-NNNNN.parquet per run, a ledger of the
+    compiled source files (name, size, mtime) and a _common_metadata file with
+    the schema unified over all parts. Keys that appear for the first time are
+    added to that schema as nullable columns; older parts are padded when read
+    (see read_compiled_dataset), so existing parts are never rewritten.
+
+    Args:
+        directory_path_str: Directory containing the JSON files
+        dataset_dir_str: Dataset directory to append to
+        workers: Number of decoding processes (defaults to the CPU count)
+        files_per_part: JSON files per worker chunk
+        row_group_size: Maximum rows per Parquet row group
+
+    Returns:
+        Number of records appended
+    """
+    directory_path = Path(directory_path_str)
+    if not directory_path.is_dir():
+        print(f"Error: Directory not found: {directory_path_str}", file=sys.stderr)
+        return 0
+    dataset_dir = Path(dataset_dir_str)
+    dataset_dir.mkdir(parents=True, exist_ok=True)
+
+    start_time = time.perf_counter()
+    ledger = _load_ledger(dataset_dir)
+    new_files = []
+    for file_path in sorted(directory_path.glob('*.json')):
+        stat = file_path.stat()
+        entry = ledger.get(file_path.name)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            continue
+        new_files.append(file_path)
+
+    print(f"Found {len(new_files)} new or changed JSON files in: {directory_path.resolve()} "
+          f"({len(ledger)} already compiled)")
+    if not new_files:
+        return 0
+
+    temp_dir = Path(tempfile.mkdtemp(prefix="compile_json_"))
+    try:
+        schema, parts, total_records = _decode_parallel(new_files, temp_dir, workers, files_per_part)
+        part_number = 0
+        if parts:
+            part_schema = _output_schema(schema)
+            existing = sorted(dataset_dir.glob("part-*.parquet"))
+            part_number = int(existing[-1].stem.split("-")[1]) + 1 if existing else 0
+            part_path = dataset_dir / f"part-{part_number:05d}.parquet"
+            _write_parts(parts, part_schema, part_path, row_group_size)
+
+            # Schema evolution: new keys become nullable columns of the dataset schema
+            previous_schema = read_dataset_schema(dataset_dir)
+            unified = _output_schema(merge_schemas(previous_schema, part_schema))
+            added = [name for name in unified.names if previous_schema is None or name not in previous_schema.names]
+            if previous_schema is not None and added:
+                print(f"Schema evolution: added columns {', '.join(added)}")
+            pq.write_metadata(unified, dataset_dir / COMMON_METADATA_FILENAME)
+            print(f"Appended {total_records} records as {part_path.name}")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    # Files that could not be decoded are recorded too, so they are only retried once they change
+    for file_path in new_files:
+        stat = file_path.stat()
+        ledger[file_path.name] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "part": part_number}
+    _save_ledger(dataset_dir, ledger)
+
+    elapsed = time.perf_counter() - start_time
+    print(f"Appended {total_records} records from {len(new_files)} files in {elapsed:.1f}s")
+    return total_records
+
+
+def read_compiled_dataset(dataset_dir_str: str) -> pa.Table:
+    """
+    Read an appended dataset as one table with the unified schema.
+
+    Older parts are conformed to the current schema (missing columns and nested
+    fields become null). A source file recompiled after a change only keeps its
+    row from the newest part.
+    """
+    dataset_dir = Path(dataset_dir_str)
+    schema = read_dataset_schema(dataset_dir)
+    if schema is None:
+        raise FileNotFoundError(f"No compiled dataset found in {dataset_dir}")
+
+    tables = []
+    seen_files = pa.array([], type=pa.string())
+    for part_path in sorted(dataset_dir.glob("part-*.parquet"), reverse=True):
+        table = conform_table(pq.read_table(part_path), schema)
+        table = table.filter(pc.invert(pc.is_in(table.column("source_file"), value_set=seen_files)))
+        seen_files = pa.concat_arrays([seen_files, table.column("source_file").combine_chunks()])
+        tables.append(table)
+    return pa.concat_tables(reversed(tables)) if tables else schema.empty_table()
 
-    return final_ordered_list # Return the list of dictionaries
 
 # --- Main Execution ---
 if __name__ == "__main__":
-    TARGET_DIRECTORY = "processed_jobs" # <-- Set your directory name here
-    OUTPUT_FILENAME_PARQUET = "processed_jobs_outer_join.parquet" # <-- Output Parquet filename
+    arg_parser = argparse.ArgumentParser(description="Compile processed job label JSON files into Parquet.")
+    arg_parser.add_argument('--input-dir', default=TARGET_DIRECTORY)
+    arg_parser.add_argument('--output', default=None,
+                            help=f"Parquet file (default: {OUTPUT_FILENAME_PARQUET}) or, "
+                                 f"with --incremental, dataset directory (default: {OUTPUT_DATASET_DIR})")
+    arg_parser.add_argument('--incremental', action='store_true',
+                            help="Only compile new or changed files and append them as a new part")
+    arg_parser.add_argument('--workers', type=int, default=None, help="Decoding processes (default: CPU count)")
+    arg_parser.add_argument('--files-per-part', type=int, default=FILES_PER_PART)
+    arg_parser.add_argument('--row-group-size', type=int, default=ROW_GROUP_SIZE)
+    args = arg_parser.parse_args()
 
     print("Starting JSON processing...")
-    # Make sure pandas and pyarrow (or fastparquet) are installed:
-    # pip install pandas pyarrow
-    try:
-        import pandas as pd
-    except ImportError:
-        print("\nError: pandas library not found. Please install it:", file=sys.stderr)
-        print("pip install pandas pyarrow", file=sys.stderr)
-        sys.exit(1)
+    if args.incremental:
+        output = args.output or OUTPUT_DATASET_DIR
+        num_records = append_json_directory(args.input_dir, output, args.workers,
+                                            args.files_per_part, args.row_group_size)
+        if num_records:
+            print(f"\nSuccessfully appended {num_records} processed records to '{output}'")
+        else:
+            print("\nNo new records to append.")
+        sys.exit(0)
 
-    try:
-        # Check for a parquet engine - pyarrow is preferred
-        pd.DataFrame().to_parquet(os.devnull, engine='pyarrow')
-    except ImportError:
-         try:
-             # Check for fastparquet as a fallback
-             pd.DataFrame().to_parquet(os.devnull, engine='fastparquet')
-             print("Using 'fastparquet' engine.")
-         except ImportError:
-            print("\nError: No Parquet engine found (pyarrow or fastparquet). Please install one:", file=sys.stderr)
-            print("pip install pyarrow  (recommended)", file=sys.stderr)
-            print("or: pip install fastparquet", file=sys.stderr)
-            sys.exit(1)
-    except Exception: # Catch other potential errors during the dummy write test
-        pass # Assume engine is okay if check fails for non-ImportError reasons
-
-
-    results_list = process_json_outer_join(TARGET_DIRECTORY)
-
-    if results_list:
-        print(f"\n--- Processing Complete ({len(results_list)} records) ---")
-
-        # Optional: Display first few results (still useful for quick check)
-        print("First 5 records (as dictionaries):")
-        output_limit = 5
-        # Use json.dumps for pretty printing the dictionaries to console
-        print(json.dumps(results_list[:output_limit], indent=2, default=str)) # Use default=str for non-serializable types if any
-        if len(results_list) > output_limit:
-            print(f"\n(... and {len(results_list) - output_limit} more records)")
-
-        # --- Convert to DataFrame and Save as Parquet ---
-        try:
-            print(f"\nConverting {len(results_list)} records to DataFrame...")
-            # Create DataFrame directly from the list of dictionaries
-            df = pd.DataFrame(results_list)
-
-            # Optional: Explicitly set column order based on earlier definition
-            # df = df[output_keys_order] # Uncomment if you want strict column order
-
-            print(f"Saving DataFrame to Parquet file: '{OUTPUT_FILENAME_PARQUET}'")
-            # Save to Parquet, index=False prevents saving the pandas index as a column
-            df.to_parquet(OUTPUT_FILENAME_PARQUET, index=False, engine='pyarrow') # Or engine='fastparquet'
-            print(f"\nSuccessfully saved all {len(results_list)} processed records to '{OUTPUT_FILENAME_PARQUET}'")
-
-        except Exception as e: # Catch potential errors during DataFrame creation or Parquet writing
-            print(f"\nError during DataFrame conversion or Parquet saving: {e}", file=sys.stderr)
-            print("Please ensure pandas and a Parquet engine (pyarrow/fastparquet) are correctly installed.", file=sys.stderr)
+    output = args.output or OUTPUT_FILENAME_PARQUET
+    num_records = compile_json_directory(args.input_dir, output, args.workers,
+                                         args.files_per_part, args.row_group_size)
 
+    if num_records:
+        print(f"\n--- Processing Complete ({num_records} records) ---")
+        print("First 5 records:")
+        preview = pq.ParquetFile(output).read_row_group(0).slice(0, 5).to_pylist()
+        print(json.dumps(preview, indent=2, default=str))
+        print(f"\nSuccessfully saved all {num_records} processed records to '{output}'")
     else:
-        print("\nNo results generated.")
\ No newline at end of file
+        print("\nNo results generated.")
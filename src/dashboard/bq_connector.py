@@ -3,10 +3,10 @@
 import os
 import sys
 from dotenv import load_dotenv
-from google.oauth2 import service_account
-from google.cloud import bigquery
 import pandas as pd
 
+from src.events import gcp_clients
+
 # --- Helper function to clean environment variables ---
 def clean_env_var(var_value):
     """Removes leading/trailing whitespace, quotes, and inline comments."""
@@ -35,20 +35,8 @@ def fetch_latest_job_data():
     print("--- Initializing BigQuery Connection ---")
     load_dotenv() # Load environment variables from .env
 
-    # --- Load and Validate Credentials ---
-    credentials_info = {
-        "type": os.getenv("TYPE"),
-        "project_id": os.getenv("PROJECT_ID"),
-        "private_key_id": os.getenv("PRIVATE_KEY_ID"),
-        "private_key": os.getenv("PRIVATE_KEY", "").replace('\\n', '\n'),
-        "client_email": os.getenv("CLIENT_EMAIL"),
-        "client_id": os.getenv("CLIENT_ID"),
-        "auth_uri": os.getenv("AUTH_URI"),
-        "token_uri": os.getenv("TOKEN_URI"),
-        "auth_provider_x509_cert_url": os.getenv("AUTH_PROVIDER_X509_CERT_URL"),
-        "client_x509_cert_url": os.getenv("CLIENT_X509_CERT_URL"),
-        "universe_domain": os.getenv("UNIVERSE_DOMAIN")
-    }
+    # --- Validate Credentials ---
+    credentials_info = gcp_clients.credentials_info_from_env()
     required_creds = ["type", "project_id", "private_key_id", "private_key", "client_email", "client_id"]
     missing_creds = [key for key in required_creds if not credentials_info.get(key)]
     if missing_creds:
@@ -74,15 +62,11 @@ def fetch_latest_job_data():
         print(f"Error: Missing required config environment variables: {', '.join(missing_config)}")
         return pd.DataFrame(), None
 
-    # --- Create Credentials and BigQuery Client ---
+    # --- Get the Shared BigQuery Client (credentials and connections are reused across refreshes) ---
     try:
-        print("Attempting to create credentials...")
-        credentials = service_account.Credentials.from_service_account_info(credentials_info)
-        print("Credentials created.")
-
         print(f"Attempting to connect to BigQuery project: \"{gcp_project_id}\"...")
-        client = bigquery.Client(credentials=credentials, project=gcp_project_id)
-        print("BigQuery client created successfully.")
+        client = gcp_clients.get_bigquery_client(gcp_project_id)
+        print("BigQuery client ready.")
 
     except Exception as e:
         print(f"Error creating credentials or BigQuery client: {e}")
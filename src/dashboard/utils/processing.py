@@ -52,7 +52,11 @@ def calculate_metrics(df):
     common_location = df['location'].mode()[0] if 'location' in df.columns and not df['location'].mode().empty else 'N/A'
 
     remote_percentage = 'N/A'
-    if 'workplace_type' in df.columns and total_jobs > 0:
+    if 'workplace_type_code' in df.columns and df['workplace_type_code'].notna().any() and total_jobs > 0:
+        # Typed enum from the parser's normalization stage - no string scan needed
+        remote_count = (df['workplace_type_code'] == 'remote').sum()
+        remote_percentage = round((remote_count / total_jobs) * 100, 1)
+    elif 'workplace_type' in df.columns and total_jobs > 0:
         try:
             remote_count = df['workplace_type'].astype(str).str.contains('Remote', case=False, na=False).sum()
             remote_percentage = round((remote_count / total_jobs) * 100, 1)
@@ -0,0 +1,198 @@
+# gcp_clients.py
+"""
+Shared Google Cloud credentials and clients for every pipeline stage.
+
+Credentials are built once per process and scoped up front, so all clients
+share one OAuth token that is only refreshed when it expires. Storage and
+BigQuery clients are cached per project and share one HTTP session whose
+connection pool is sized for the stages' thread pools, so repeated calls reuse
+open TLS connections instead of doing a new auth handshake each time.
+The cached clients are safe to share between threads.
+
+Setting STORAGE_EMULATOR_HOST or BIGQUERY_EMULATOR_HOST points the matching
+client at a local emulator with anonymous credentials.
+
+The flat-script stages (parse_to_gcs, gcs_to_bg_sink) put src/events on
+sys.path and `import gcp_clients`; the packaged ones use
+`from src.events import gcp_clients`.
+"""
+
+import logging
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+import requests
+from google.api_core.client_options import ClientOptions
+from google.auth.credentials import AnonymousCredentials, Credentials
+from google.auth.transport.requests import AuthorizedSession
+from google.cloud import bigquery, storage
+from google.oauth2 import service_account
+
+logger = logging.getLogger(__name__)
+
+# Covers both Storage and BigQuery, so the clients never re-scope (and re-authenticate) the credentials
+CLOUD_PLATFORM_SCOPES = ["https://www.googleapis.com/auth/cloud-platform"]
+# Connections kept open per host; the sink's catch-up and the capture archive upload run thread pools
+HTTP_POOL_SIZE = int(os.getenv("GCP_HTTP_POOL_SIZE", "32"))
+
+REQUIRED_CREDENTIAL_FIELDS = ["project_id", "private_key", "client_email"]
+
+_lock = threading.RLock()
+_credentials: Optional[Credentials] = None
+_session: Optional[AuthorizedSession] = None
+_clients: Dict[Tuple[str, str], object] = {}
+
+
+def credentials_info_from_env() -> Dict[str, Optional[str]]:
+    """Service account info from the TYPE, PROJECT_ID, PRIVATE_KEY, ... environment variables."""
+    info = {
+        "type": os.getenv("TYPE", "service_account"),
+        "project_id": os.getenv("PROJECT_ID"),
+        "private_key_id": os.getenv("PRIVATE_KEY_ID"),
+        "private_key": os.getenv("PRIVATE_KEY", "").replace("\\n", "\n"),  # Fix newlines
+        "client_email": os.getenv("CLIENT_EMAIL"),
+        "client_id": os.getenv("CLIENT_ID"),
+        "auth_uri": os.getenv("AUTH_URI", "https://accounts.google.com/o/oauth2/auth"),
+        "token_uri": os.getenv("TOKEN_URI", "https://oauth2.googleapis.com/token"),
+        "auth_provider_x509_cert_url": os.getenv("AUTH_PROVIDER_X509_CERT_URL"),
+        "client_x509_cert_url": os.getenv("CLIENT_X509_CERT_URL"),
+    }
+    if os.getenv("UNIVERSE_DOMAIN"):
+        info["universe_domain"] = os.getenv("UNIVERSE_DOMAIN")
+    return info
+
+
+def get_credentials() -> Credentials:
+    """
+    Return the process-wide service account credentials, building them on first use.
+
+    Uses the GOOGLE_APPLICATION_CREDENTIALS file when it exists, otherwise the
+    service account environment variables. Key material is never logged.
+
+    Raises:
+        ValueError: If neither source provides the required fields
+    """
+    global _credentials
+    with _lock:
+        if _credentials is not None:
+            return _credentials
+
+        creds_file = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
+        if creds_file and os.path.exists(creds_file):
+            logger.info(f"Loading GCP credentials from file: {creds_file}")
+            _credentials = service_account.Credentials.from_service_account_file(
+                creds_file, scopes=CLOUD_PLATFORM_SCOPES)
+            return _credentials
+
+        info = credentials_info_from_env()
+        missing_fields = [field for field in REQUIRED_CREDENTIAL_FIELDS if not info.get(field)]
+        if missing_fields:
+            raise ValueError(
+                f"Missing required credential fields: {', '.join(missing_fields)}. Set them as environment "
+                "variables or point GOOGLE_APPLICATION_CREDENTIALS at a service account file."
+            )
+        _credentials = service_account.Credentials.from_service_account_info(info, scopes=CLOUD_PLATFORM_SCOPES)
+        logger.info(f"Loaded GCP credentials for {info['client_email']}")
+        return _credentials
+
+
+def _pooled_session(credentials: Credentials) -> AuthorizedSession:
+    """Authorized session with a connection pool large enough for the stages' worker threads."""
+    session = AuthorizedSession(credentials)
+    adapter = requests.adapters.HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_http_session() -> AuthorizedSession:
+    """The shared authorized session used by every cached client."""
+    global _session
+    with _lock:
+        if _session is None:
+            _session = _pooled_session(get_credentials())
+        return _session
+
+
+def get_project_id(*env_names: str) -> str:
+    """
+    First project ID set in env_names, falling back to the credentials' project.
+
+    Raises:
+        ValueError: If no project ID can be determined
+    """
+    for name in env_names:
+        if os.getenv(name):
+            return os.getenv(name)
+    project_id = getattr(get_credentials(), "project_id", None)
+    if not project_id:
+        raise ValueError(f"Could not determine the GCP project. Set one of {', '.join(env_names)} "
+                         "or use credentials that contain a project_id.")
+    return project_id
+
+
+def get_storage_client(project: Optional[str] = None) -> storage.Client:
+    """
+    Cached storage client for a project (default: GCP_PROJECT_ID, PROJECT_ID, then the credentials').
+
+    Uses anonymous credentials against a local emulator when STORAGE_EMULATOR_HOST is set.
+    """
+    emulator_host = os.getenv("STORAGE_EMULATOR_HOST")
+    with _lock:
+        if emulator_host:
+            project = project or os.getenv("GCP_PROJECT_ID") or os.getenv("PROJECT_ID") or "emulator"
+        else:
+            project = project or get_project_id("GCP_PROJECT_ID", "PROJECT_ID")
+        key = ("storage", project)
+        if key not in _clients:
+            if emulator_host:
+                logger.info(f"Creating storage client for emulator at {emulator_host} (project: {project})")
+                credentials = AnonymousCredentials()
+                _clients[key] = storage.Client(project=project, credentials=credentials,
+                                               _http=_pooled_session(credentials))
+            else:
+                logger.info(f"Creating storage client for project: {project}")
+                _clients[key] = storage.Client(project=project, credentials=get_credentials(),
+                                               _http=get_http_session())
+        return _clients[key]
+
+
+def get_bigquery_client(project: Optional[str] = None) -> bigquery.Client:
+    """
+    Cached BigQuery client for a project (default: GCP_PROJECT_ID, PROJECT_ID, then the credentials').
+
+    Uses anonymous credentials against a local emulator when BIGQUERY_EMULATOR_HOST is set.
+    """
+    emulator_host = os.getenv("BIGQUERY_EMULATOR_HOST")
+    with _lock:
+        if emulator_host:
+            project = project or os.getenv("GCP_PROJECT_ID") or os.getenv("PROJECT_ID") or "emulator"
+        else:
+            project = project or get_project_id("GCP_PROJECT_ID", "PROJECT_ID")
+        key = ("bigquery", project)
+        if key not in _clients:
+            if emulator_host:
+                logger.info(f"Creating BigQuery client for emulator at {emulator_host} (project: {project})")
+                credentials = AnonymousCredentials()
+                _clients[key] = bigquery.Client(project=project, credentials=credentials,
+                                                _http=_pooled_session(credentials),
+                                                client_options=ClientOptions(api_endpoint=emulator_host))
+            else:
+                logger.info(f"Creating BigQuery client for project: {project}")
+                _clients[key] = bigquery.Client(project=project, credentials=get_credentials(),
+                                                _http=get_http_session())
+        return _clients[key]
+
+
+def reset() -> None:
+    """Drop the cached credentials, session and clients (e.g. after a fork or a credential change)."""
+    global _credentials, _session
+    with _lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+        if _session is not None:
+            _session.close()
+        _credentials = None
+        _session = None
@@ -0,0 +1,247 @@
+"""
+Backfill command for the GCS -> BigQuery sink.
+
+Reloads history one daily file at a time. Every file replaces its own
+ingestionDate partition atomically (a DELETE + INSERT transaction, or a load job
+into the partition decorator with WRITE_TRUNCATE), so a backfill can be re-run
+over the same range without appending duplicates. Loads run on a bounded worker
+pool, are started at most --max-loads-per-minute times a minute (BigQuery caps
+load/query jobs and partition modifications per table per day), and are retried
+with exponential backoff.
+
+Usage (from src/events/gcs_to_bg_sink):
+    python backfill.py --start-date 2025-01-01 --end-date 2025-03-31 --workers 4
+    python backfill.py --files gs://bucket/path/linkedin_scrap_2025-04-30.parquet
+    python backfill.py --files gs://bucket/path/export.parquet=2025-04-30   # explicit ingestion date
+    python backfill.py --start-date 2025-01-01 --end-date 2025-01-31 --dry-run
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+import gcs_to_bq
+
+
+@dataclass
+class PlannedLoad:
+    """One file and the partition it replaces."""
+    file_path: str
+    ingestion_date: date
+
+
+@dataclass
+class LoadOutcome:
+    file_path: str
+    ingestion_date: str
+    status: str
+    rows: int = 0
+    attempts: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+    finished_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+
+
+class RateLimiter:
+    """Spaces out load starts so no more than max_per_minute begin in any minute."""
+
+    def __init__(self, max_per_minute: float):
+        self.interval = 60.0 / max_per_minute if max_per_minute > 0 else 0.0
+        self._next_start = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_start)
+            self._next_start = start_at + self.interval
+        if start_at > now:
+            time.sleep(start_at - now)
+
+
+def plan_date_range(bucket_name: str, prefix: str, start_date: date, end_date: date) -> List[PlannedLoad]:
+    """Plan one load per daily file whose filename date lies in [start_date, end_date]."""
+    prefix_with_slash = prefix if prefix.endswith('/') else prefix + '/'
+    start_offset = f"{prefix_with_slash}linkedin_scrap_{start_date.isoformat()}"
+    planned = []
+    for blob in gcs_to_bq.list_daily_files(bucket_name, prefix, start_offset=start_offset):
+        ingestion_dt = gcs_to_bq.extract_date_from_filename(blob.name)
+        if ingestion_dt is None or ingestion_dt < start_date:
+            continue
+        if ingestion_dt > end_date:
+            break
+        planned.append(PlannedLoad(f"gs://{bucket_name}/{blob.name}", ingestion_dt))
+    return planned
+
+
+def plan_files(files: List[str]) -> List[PlannedLoad]:
+    """
+    Plan loads for explicit files; `gs://...=YYYY-MM-DD` overrides the date taken from the filename.
+
+    Raises:
+        ValueError: If a file has neither an explicit date nor a dated filename
+    """
+    planned = []
+    for entry in files:
+        file_path, _, explicit_date = entry.partition('=')
+        if explicit_date:
+            ingestion_dt = datetime.strptime(explicit_date, "%Y-%m-%d").date()
+        else:
+            ingestion_dt = gcs_to_bq.extract_date_from_filename(file_path)
+        if ingestion_dt is None:
+            raise ValueError(f"No ingestion date for {file_path}; pass it as {file_path}=YYYY-MM-DD")
+        planned.append(PlannedLoad(file_path, ingestion_dt))
+    return planned
+
+
+def _check_one_file_per_partition(planned: List[PlannedLoad]) -> None:
+    """Each load truncates its partition, so two files for one date would overwrite each other."""
+    seen: Dict[date, str] = {}
+    for load in planned:
+        if load.ingestion_date in seen:
+            raise ValueError(f"{load.file_path} and {seen[load.ingestion_date]} both map to partition "
+                             f"{load.ingestion_date}; each partition can only be replaced from one file")
+        seen[load.ingestion_date] = load.file_path
+
+
+def run_load(load: PlannedLoad, source: str, limiter: RateLimiter, max_attempts: int,
+             base_delay: float) -> LoadOutcome:
+    """Run one partition replacement with retries and exponential backoff."""
+    replace = gcs_to_bq.replace_partition_from_uri if source == "uri" else gcs_to_bq.replace_partition_from_dataframe
+    started = time.perf_counter()
+    for attempt in range(1, max_attempts + 1):
+        limiter.wait()
+        try:
+            rows = replace(load.file_path, load.ingestion_date)
+            return LoadOutcome(load.file_path, load.ingestion_date.isoformat(), "loaded", rows=rows,
+                               attempts=attempt, seconds=round(time.perf_counter() - started, 2))
+        except ValueError as e:
+            # Schema/validation problems do not go away on retry
+            error = str(e)
+            break
+        except Exception as e:
+            error = str(e)
+            if attempt < max_attempts:
+                delay = base_delay * 2 ** (attempt - 1) * (1 + random.random())
+                logging.warning(f"Load of {load.file_path} failed (attempt {attempt}/{max_attempts}): {e}; "
+                                f"retrying in {delay:.1f}s")
+                time.sleep(delay)
+    logging.error(f"Backfill of {load.file_path} failed: {error}")
+    return LoadOutcome(load.file_path, load.ingestion_date.isoformat(), "failed", attempts=attempt,
+                       seconds=round(time.perf_counter() - started, 2), error=error)
+
+
+def run_backfill(planned: List[PlannedLoad], source: str = "uri", workers: int = 4,
+                 max_loads_per_minute: float = 30, max_attempts: int = 3, base_delay: float = 5.0) -> Dict[str, Any]:
+    """
+    Replace the partition of every planned file on a worker pool.
+
+    Returns:
+        Report with totals, throughput and per-file outcomes
+    """
+    _check_one_file_per_partition(planned)
+    limiter = RateLimiter(max_loads_per_minute)
+    started = time.perf_counter()
+    outcomes: List[LoadOutcome] = []
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_load, load, source, limiter, max_attempts, base_delay) for load in planned]
+        for done, future in enumerate(as_completed(futures), start=1):
+            outcome = future.result()
+            outcomes.append(outcome)
+            logging.info(f"[{done}/{len(planned)}] {outcome.status}: {outcome.file_path} "
+                         f"({outcome.rows} rows, {outcome.attempts} attempts, {outcome.seconds}s)")
+
+    seconds = time.perf_counter() - started
+    loaded = [o for o in outcomes if o.status == "loaded"]
+    report = {
+        "files_planned": len(planned),
+        "files_loaded": len(loaded),
+        "files_failed": len(outcomes) - len(loaded),
+        "rows": sum(o.rows for o in loaded),
+        "seconds": round(seconds, 2),
+        "files_per_minute": round(len(loaded) / seconds * 60, 2) if seconds else None,
+        "rows_per_second": round(sum(o.rows for o in loaded) / seconds, 2) if seconds else None,
+        "failures": [{"file_path": o.file_path, "error": o.error} for o in outcomes if o.status != "loaded"],
+        "outcomes": sorted((asdict(o) for o in outcomes), key=lambda o: o["ingestion_date"]),
+    }
+    logging.info(f"Backfill finished: {report['files_loaded']}/{report['files_planned']} files, "
+                 f"{report['rows']} rows in {report['seconds']}s ({report['files_per_minute']} files/min), "
+                 f"{report['files_failed']} failed")
+    return report
+
+
+def record_in_ledger(bucket_name: str, prefix: str, report: Dict[str, Any]) -> None:
+    """Mark backfilled files in the catch-up ledger so the next catch-up run skips them."""
+    generations = {
+        blob.name: blob.generation
+        for blob in gcs_to_bq.list_daily_files(bucket_name, prefix)
+    }
+    outcomes = {}
+    for outcome in report["outcomes"]:
+        blob_name = outcome["file_path"][len(f"gs://{bucket_name}/"):]
+        if outcome["file_path"].startswith(f"gs://{bucket_name}/") and blob_name in generations:
+            outcomes[blob_name] = {
+                "generation": generations[blob_name],
+                "ingestion_date": outcome["ingestion_date"],
+                "load_mode": "backfill",
+                "status": outcome["status"],
+                "rows": outcome["rows"],
+                "error": outcome["error"],
+                "finished_at": outcome["finished_at"],
+            }
+    # The watermark is left to catch-up: files outside the backfilled range may still be missing
+    if outcomes:
+        gcs_to_bq.record_file_outcomes(bucket_name, gcs_to_bq.get_ledger_blob_name(prefix), outcomes)
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    arg_parser = argparse.ArgumentParser(description="Reload daily LinkedIn files into their BigQuery partitions.")
+    selection = arg_parser.add_mutually_exclusive_group(required=True)
+    selection.add_argument('--start-date', type=date.fromisoformat, help="First ingestion date (YYYY-MM-DD)")
+    selection.add_argument('--files', nargs='+', help="gs:// paths, optionally suffixed with =YYYY-MM-DD")
+    arg_parser.add_argument('--end-date', type=date.fromisoformat, help="Last ingestion date (default: today)")
+    arg_parser.add_argument('--source', choices=['uri', 'dataframe'], default='uri',
+                            help="Load straight from the GCS URI or convert locally to the staging schema first")
+    arg_parser.add_argument('--workers', type=int, default=4)
+    arg_parser.add_argument('--max-loads-per-minute', type=float, default=30)
+    arg_parser.add_argument('--max-attempts', type=int, default=3)
+    arg_parser.add_argument('--report', help="Write the JSON report to this path")
+    arg_parser.add_argument('--dry-run', action='store_true', help="Only print the plan")
+    args = arg_parser.parse_args()
+
+    gcs_bucket = os.getenv("GCS_BUCKET_NAME")
+    gcs_prefix = os.getenv("GCS_SUBFOLDER_PATH")
+
+    if args.files:
+        plan = plan_files(args.files)
+    else:
+        if not gcs_bucket or not gcs_prefix:
+            arg_parser.error("GCS_BUCKET_NAME and GCS_SUBFOLDER_PATH must be set for a date-range backfill")
+        plan = plan_date_range(gcs_bucket, gcs_prefix, args.start_date, args.end_date or date.today())
+
+    logging.info(f"Planned {len(plan)} partition loads")
+    if args.dry_run:
+        for load in plan:
+            print(f"{load.ingestion_date}  {load.file_path}")
+        exit(0)
+
+    backfill_report = run_backfill(plan, source=args.source, workers=args.workers,
+                                   max_loads_per_minute=args.max_loads_per_minute, max_attempts=args.max_attempts)
+    if gcs_bucket and gcs_prefix:
+        record_in_ledger(gcs_bucket, gcs_prefix, backfill_report)
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(backfill_report, f, indent=2)
+    exit(1 if backfill_report["files_failed"] else 0)
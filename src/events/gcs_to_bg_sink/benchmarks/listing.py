@@ -0,0 +1,106 @@
+# benchmarks/listing.py
+"""
+Listing benchmark for the GCS sink against a local GCS emulator.
+
+Fills a bucket with years of fake daily files (plus unrelated objects under the
+same prefix), then compares how many blobs the server returns and how long it
+takes for:
+
+- a full listing of the prefix (no marker),
+- the first marker-based lookup (writes the marker),
+- a marker-based lookup after a few new days arrived.
+
+The marker-based lookup should return O(new files) blobs. gcp-storage-emulator
+ignores start_offset, so against it only match_glob bounds the listing;
+fake-gcs-server and real GCS honour both.
+
+Usage (from src/events/gcs_to_bg_sink, with an emulator running):
+    STORAGE_EMULATOR_HOST=http://localhost:9023 python benchmarks/listing.py --days 1500 --noise 3000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict
+
+SINK_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SINK_DIR))
+
+import gcs_to_bq  # noqa: E402
+
+
+class CountingClient:
+    """Storage client wrapper counting the blobs returned by list requests."""
+
+    def __init__(self, client):
+        self._client = client
+        self.blobs_listed = 0
+
+    def list_blobs(self, *args, **kwargs):
+        for blob in self._client.list_blobs(*args, **kwargs):
+            self.blobs_listed += 1
+            yield blob
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+def populate(client, bucket_name: str, prefix: str, first_day: date, days: int, noise: int) -> None:
+    """Upload one tiny object per day plus unrelated objects under the prefix."""
+    try:
+        client.create_bucket(bucket_name)
+    except Exception:
+        pass
+    bucket = client.bucket(bucket_name)
+    names = [f"{prefix}/linkedin_scrap_{first_day + timedelta(days=i)}.parquet" for i in range(days)]
+    names += [f"{prefix}/raw/capture_{i:06d}.html" for i in range(noise)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda name: bucket.blob(name).upload_from_string(b"x"), names))
+
+
+def timed_lookup(counting: CountingClient, bucket_name: str, prefix: str, use_marker: bool) -> Dict:
+    counting.blobs_listed = 0
+    started = time.perf_counter()
+    latest = gcs_to_bq.find_latest_file_in_gcs_by_name(bucket_name, prefix, use_marker=use_marker)
+    return {
+        'latest': latest,
+        'blobs_listed': counting.blobs_listed,
+        'seconds': round(time.perf_counter() - started, 3),
+    }
+
+
+def run_benchmark(bucket_name: str, prefix: str, days: int, noise: int, new_days: int) -> Dict:
+    if not os.getenv("STORAGE_EMULATOR_HOST"):
+        raise SystemExit("Set STORAGE_EMULATOR_HOST to a running GCS emulator.")
+    counting = CountingClient(gcs_to_bq.get_storage_client())
+    gcs_to_bq.get_storage_client = lambda: counting
+
+    first_day = date(2020, 1, 1)
+    populate(counting, bucket_name, prefix, first_day, days, noise)
+    results = {
+        'full_listing': timed_lookup(counting, bucket_name, prefix, use_marker=False),
+        'marker_first_run': timed_lookup(counting, bucket_name, prefix, use_marker=True),
+    }
+    new_first_day = first_day + timedelta(days=days)
+    bucket = counting.bucket(bucket_name)
+    for i in range(new_days):
+        bucket.blob(f"{prefix}/linkedin_scrap_{new_first_day + timedelta(days=i)}.parquet").upload_from_string(b"x")
+    results['marker_after_new_files'] = timed_lookup(counting, bucket_name, prefix, use_marker=True)
+    return results
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmark GCS listing strategies of the sink.")
+    arg_parser.add_argument('--bucket', default='listing-benchmark')
+    arg_parser.add_argument('--prefix', default='linkedin/parquet')
+    arg_parser.add_argument('--days', type=int, default=1000)
+    arg_parser.add_argument('--noise', type=int, default=2000)
+    arg_parser.add_argument('--new-days', type=int, default=3)
+    args = arg_parser.parse_args()
+
+    print(json.dumps(run_benchmark(args.bucket, args.prefix, args.days, args.noise, args.new_days), indent=2))
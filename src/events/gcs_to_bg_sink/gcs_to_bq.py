@@ -1,126 +1,135 @@
-import os
-import logging
+import io
 import json
-import tempfile
+import logging
+import os
 import re
-from datetime import date, datetime, timezone
-from typing import Optional, Dict, Any, List, Tuple
-
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional, Dict, Any, Iterator, List, Set, Tuple, Union
+
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from dotenv import load_dotenv
 from google.cloud import storage, bigquery
-from google.cloud.exceptions import NotFound
-from google.oauth2 import service_account
-import io
-import time
+from google.cloud.exceptions import NotFound, PreconditionFailed
 
-from dotenv import load_dotenv
+sys.path.append(str(Path(__file__).resolve().parent.parent))  # src/events, home of the shared gcp_clients
+import gcp_clients
+
+from schema import LINKEDIN_JOBS_SCHEMA, conform_to_schema, to_pandas
 
 # --- Logging Setup (Optional but Recommended) ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 # --- Authentication Setup ---
+# Credentials and clients are built once per process and shared (see src/events/gcp_clients.py)
 def get_credentials():
     """
-    Create and return service account credentials from environment variables.
+    Return the process-wide service account credentials.
     """
-    try:
-        
-        # Extract service account details from environment variables
-        credentials_dict = {
-            "type": os.getenv("TYPE"),
-            "project_id": os.getenv("PROJECT_ID"),
-            "private_key_id": os.getenv("PRIVATE_KEY_ID"),
-            "private_key": os.getenv("PRIVATE_KEY").replace("\\n", "\n"),  # Fix newlines
-            "client_email": os.getenv("CLIENT_EMAIL"),
-            "client_id": os.getenv("CLIENT_ID"),
-            "auth_uri": os.getenv("AUTH_URI"),
-            "token_uri": os.getenv("TOKEN_URI"),
-            "auth_provider_x509_cert_url": os.getenv("AUTH_PROVIDER_X509_CERT_URL"),
-            "client_x509_cert_url": os.getenv("CLIENT_X509_CERT_URL"),
-            "universe_domain": os.getenv("UNIVERSE_DOMAIN")
-        }
-        print(credentials_dict)
-        print(os.getenv("PRIVATE_KEY"))
-        
-        # Validate required credential fields
-        required_fields = ["project_id", "private_key", "client_email"]
-        missing_fields = [field for field in required_fields if not credentials_dict.get(field)]
-        
-        if missing_fields:
-            raise ValueError(f"Missing required credential fields: {', '.join(missing_fields)}")
-        
-        # Create credentials object from dictionary
-        return service_account.Credentials.from_service_account_info(credentials_dict)
-        
-    except Exception as e:
-        logging.error(f"Failed to create credentials: {e}", exc_info=True)
-        raise
+    return gcp_clients.get_credentials()
 
 def get_storage_client():
     """
-    Create and return an authenticated GCS storage client.
+    Return the shared, authenticated GCS storage client.
+    Uses anonymous credentials against a local emulator when STORAGE_EMULATOR_HOST is set.
     """
-    try:
-        # Get credentials
-        credentials = get_credentials()
-
-        # Determine project ID
-        project_id = os.getenv("GCP_PROJECT_ID") or os.getenv("PROJECT_ID")
-        if not project_id:
-            # Attempt to get project_id from credentials if available
-             project_id = credentials.project_id if hasattr(credentials, 'project_id') else None
-        if not project_id:
-            raise ValueError("Could not determine project ID for Storage client. Set GCP_PROJECT_ID or PROJECT_ID env var, or ensure credentials contain it.")
-
-        logging.info(f"Creating storage client for project: {project_id}")
-        # Create and return the storage client with the credentials
-        return storage.Client(project=project_id, credentials=credentials)
-
-    except Exception as e:
-        logging.error(f"Failed to create storage client: {e}", exc_info=True)
-        raise
+    return gcp_clients.get_storage_client()
 
 def get_bigquery_client():
     """
-    Create and return an authenticated BigQuery client.
+    Return the shared, authenticated BigQuery client for LINKEDIN_BQ_PROJECT_ID
+    (falling back to GCP_PROJECT_ID, PROJECT_ID, then the credentials' project).
+    Uses anonymous credentials against a local emulator when BIGQUERY_EMULATOR_HOST is set.
     """
-    try:
-        # Get credentials
-        credentials = get_credentials()
+    return gcp_clients.get_bigquery_client(os.getenv("LINKEDIN_BQ_PROJECT_ID"))
+
+# --- GCS Functions ---
+
+def list_daily_files(
+    bucket_name: str,
+    prefix: str,
+    start_offset: Optional[str] = None,
+    file_name_prefix: str = "linkedin_scrap_",
+    file_name_suffix: str = ".parquet",
+    page_size: int = 1000
+) -> List[storage.Blob]:
+    """
+    Lists the daily files in a GCS prefix, optionally starting at a blob name.
 
-        # Determine project ID (prioritize LinkedIn specific, then general GCP, then default)
-        project_id = os.getenv("LINKEDIN_BQ_PROJECT_ID") or os.getenv("GCP_PROJECT_ID") or os.getenv("PROJECT_ID")
-        if not project_id:
-             # Attempt to get project_id from credentials if available
-             project_id = credentials.project_id if hasattr(credentials, 'project_id') else None
-        if not project_id:
-             raise ValueError("Could not determine project ID for BigQuery client. Set LINKEDIN_BQ_PROJECT_ID, GCP_PROJECT_ID, or PROJECT_ID env var, or ensure credentials contain it.")
+    The listing is bounded server-side: the request prefix includes the file name
+    prefix, match_glob keeps other objects out of the pages, and start_offset skips
+    every name that sorts before it. Because the names end in YYYY-MM-DD, a
+    start_offset of a known file returns only that file and the ones after it.
 
-        logging.info(f"Creating BigQuery client for project: {project_id}")
-        # Create and return the BigQuery client with the credentials
-        return bigquery.Client(project=project_id, credentials=credentials)
+    The files live in one flat prefix rather than per-date folders (the parser
+    uploads them that way), so this lexicographic start_offset on the dated names
+    is what bounds the listing, the same way a per-date prefix would.
 
-    except Exception as e:
-        logging.error(f"Failed to create BigQuery client: {e}", exc_info=True)
-        raise
+    Args:
+        bucket_name: The name of the GCS bucket.
+        prefix: The prefix (subfolder path) within the bucket.
+        start_offset: Only list blob names >= this name (full blob name).
+        file_name_prefix: The starting part of the filename to match.
+        file_name_suffix: The ending part (extension) of the filename.
+        page_size: Blobs per list request.
 
-# --- GCS Functions ---
+    Returns:
+        Matching blobs, sorted by name.
+    """
+    prefix_with_slash = prefix if prefix.endswith('/') else prefix + '/'
+    name_prefix = f"{prefix_with_slash}{file_name_prefix}"
+    blobs = get_storage_client().list_blobs(
+        bucket_name,
+        prefix=name_prefix,
+        match_glob=f"{name_prefix}*{file_name_suffix}",
+        start_offset=start_offset,
+        page_size=page_size,
+    )
+    # Re-check on the client: some emulators ignore start_offset/match_glob
+    matching = [
+        blob for blob in blobs
+        if '/' not in blob.name[len(prefix_with_slash):]
+        and blob.name.endswith(file_name_suffix)
+        and (start_offset is None or blob.name >= start_offset)
+    ]
+    matching.sort(key=lambda blob: blob.name)
+    return matching
+
+def get_listing_marker_blob_name(prefix: str) -> str:
+    """Object caching the latest file name seen (LINKEDIN_GCS_LISTING_MARKER_PATH, default next to the files)."""
+    return os.getenv("LINKEDIN_GCS_LISTING_MARKER_PATH") or f"{prefix.rstrip('/')}/_latest_file_marker"
 
 def find_latest_file_in_gcs_by_name(
     bucket_name: str,
     prefix: str,
     file_name_prefix: str = "linkedin_scrap_",
-    file_name_suffix: str = ".parquet"
+    file_name_suffix: str = ".parquet",
+    use_marker: bool = True
 ) -> Optional[str]:
     """
     Finds the most recent file in a GCS prefix based on filename sorting,
     expecting a 'YYYY-MM-DD' date format before the suffix.
 
+    The name of the latest file is cached in a small marker object, and the next
+    call lists from that name onwards, so the cost grows with the number of new
+    files instead of with the whole history. Without a usable marker (first run,
+    or the marked file was deleted) the whole prefix is listed once.
+
     Args:
         bucket_name: The name of the GCS bucket.
         prefix: The prefix (subfolder path) within the bucket.
         file_name_prefix: The starting part of the filename to match.
         file_name_suffix: The ending part (extension) of the filename.
+        use_marker: Read and update the cached last-seen marker.
 
     Returns:
         The full GCS path (gs://...) of the latest file found by filename sort,
@@ -130,40 +139,43 @@ def find_latest_file_in_gcs_by_name(
         logging.error("GCS_BUCKET_NAME and GCS_LINKEDIN_SUBFOLDER_PATH environment variables must be set.")
         return None
 
-    if not prefix.endswith('/'):
-        prefix_with_slash = prefix + '/'
-    else:
-        prefix_with_slash = prefix
-
+    prefix_with_slash = prefix if prefix.endswith('/') else prefix + '/'
     full_gcs_prefix = f"gs://{bucket_name}/{prefix_with_slash}"
     logging.info(f"Searching for latest file by name matching '{file_name_prefix}*{file_name_suffix}' in: {full_gcs_prefix}")
 
     try:
-        # Uses the authentication helper function
-        storage_client = get_storage_client()
-        blobs = storage_client.list_blobs(bucket_name, prefix=prefix_with_slash)
-
-        matching_files = []
-        for blob in blobs:
-            file_name = os.path.basename(blob.name)
-            # Ensure it's not just the prefix "folder" itself
-            if blob.name == prefix_with_slash and blob.size == 0:
-                 logging.debug(f"Ignoring prefix directory object: {blob.name}")
-                 continue
-            if file_name.startswith(file_name_prefix) and file_name.endswith(file_name_suffix):
-                matching_files.append(blob.name) # Store the full blob name (path)
-                logging.debug(f"Found potential file: {blob.name}")
+        bucket = get_storage_client().bucket(bucket_name)
+        marker_blob = bucket.blob(get_listing_marker_blob_name(prefix))
+        marker = None
+        if use_marker:
+            try:
+                marker = marker_blob.download_as_text().strip() or None
+            except NotFound:
+                logging.info("No listing marker yet; listing the whole prefix.")
+
+        matching_files = list_daily_files(bucket_name, prefix, start_offset=marker,
+                                          file_name_prefix=file_name_prefix, file_name_suffix=file_name_suffix)
+        if marker and not matching_files:
+            logging.warning(f"Marked file {marker} no longer exists; listing the whole prefix.")
+            matching_files = list_daily_files(bucket_name, prefix, file_name_prefix=file_name_prefix,
+                                              file_name_suffix=file_name_suffix)
+        logging.info(f"Listed {len(matching_files)} matching files"
+                     f"{f' from marker {marker}' if marker else ''}")
 
         if not matching_files:
             logging.warning(f"No files matching pattern '{file_name_prefix}*{file_name_suffix}' found in {full_gcs_prefix}")
             return None
 
-        # Sort filenames alphabetically (YYYY-MM-DD ensures latest is last)
-        matching_files.sort()
-
-        latest_blob_name = matching_files[-1]
+        # Sorted by name (YYYY-MM-DD ensures latest is last)
+        latest_blob_name = matching_files[-1].name
         latest_file_gcs_path = f"gs://{bucket_name}/{latest_blob_name}"
 
+        if use_marker and latest_blob_name != marker:
+            try:
+                marker_blob.upload_from_string(latest_blob_name, content_type="text/plain")
+            except Exception as e:
+                logging.warning(f"Could not update listing marker: {e}")
+
         logging.info(f"Latest file found (by filename sort): {latest_file_gcs_path}")
         return latest_file_gcs_path
 
@@ -204,45 +216,24 @@ def extract_date_from_filename(
         logging.warning(f"Could not find date pattern in filename '{base_filename}' using regex '{pattern}'")
         return None
 
-def read_parquet_from_gcs(file_path: str) -> pd.DataFrame:
-    """
-    Read a Parquet file from GCS using the Google Cloud Storage client.
+def read_parquet_table_from_gcs(file_path: str, columns: Optional[List[str]] = None) -> pa.Table:
     """
-    logging.info(f"Reading Parquet file from GCS: {file_path}")
-    if not file_path.startswith('gs://'):
-        raise ValueError(f"Invalid GCS path: {file_path}. Must start with 'gs://'")
-    path_parts = file_path[5:].split('/', 1)
-    if len(path_parts) != 2:
-        raise ValueError(f"Invalid GCS path format: {file_path}")
-    bucket_name, blob_name = path_parts
-    try:
-        # Uses the authentication helper function
-        storage_client = get_storage_client()
-        bucket = storage_client.bucket(bucket_name)
-        blob = bucket.blob(blob_name)
-
-        # Use download_as_bytes and pandas read_parquet directly from memory
-        # This avoids potential issues with temp files on some systems (e.g. Cloud Run)
-        logging.info(f"Downloading {blob_name} into memory.")
-        file_bytes = blob.download_as_bytes()
-        logging.info(f"Reading Parquet data from memory ({len(file_bytes)} bytes).")
-        df = pd.read_parquet(io.BytesIO(file_bytes))
-
-        # --- Alternative using tempfile (your original method) ---
-        # with tempfile.NamedTemporaryFile(suffix='.parquet', delete=True) as temp_file:
-        #     logging.info(f"Downloading {blob_name} to temporary file {temp_file.name}")
-        #     blob.download_to_filename(temp_file.name)
-        #     # No need to flush/fsync before read_parquet usually
-        #     logging.info(f"Reading Parquet data from {temp_file.name}")
-        #     df = pd.read_parquet(temp_file.name)
-        # --- End Alternative ---
-
-        logging.info(f"Successfully read Parquet file: {len(df)} rows")
-        return df
-    except Exception as e:
-        logging.error(f"Failed to read Parquet file from GCS: {file_path} - {e}", exc_info=True)
-        raise Exception(f"Failed to read Parquet file from GCS: {str(e)}") from e
+    Read a Parquet file from GCS straight into an Arrow table (no pandas conversion).
 
+    Args:
+        file_path: gs:// URI of the Parquet file
+        columns: Only read these columns (those missing from the file are skipped)
+    """
+    if not file_path.startswith('gs://') or '/' not in file_path[5:]:
+        raise ValueError(f"Invalid GCS path: {file_path}. Must be gs://<bucket>/<object>")
+    bucket_name, blob_name = file_path[5:].split('/', 1)
+    file_bytes = get_storage_client().bucket(bucket_name).blob(blob_name).download_as_bytes()
+    parquet_file = pq.ParquetFile(pa.BufferReader(file_bytes))
+    if columns is not None:
+        columns = [c for c in columns if c in parquet_file.schema_arrow.names]
+    table = parquet_file.read(columns=columns)
+    logging.info(f"Read {table.num_rows} rows ({len(file_bytes)} bytes) from {file_path}")
+    return table
 
 # --- Data Processing ---
 
@@ -251,6 +242,9 @@ def process_linkedin_job_data(df: pd.DataFrame, ingestion_date: date) -> pd.Data
     Transforms the raw LinkedIn job DataFrame to match the BigQuery schema
     and adds the ingestion date.
 
+    The conversion runs on Arrow (schema.conform_to_schema), so missing values
+    stay <NA> instead of becoming the string "None".
+
     Args:
         df: The DataFrame containing raw data from the Parquet file.
         ingestion_date: The date extracted from the filename.
@@ -259,58 +253,48 @@ def process_linkedin_job_data(df: pd.DataFrame, ingestion_date: date) -> pd.Data
         A DataFrame with the transformed data, ready for BigQuery insertion.
     """
     logging.info(f"Starting transformation for {len(df)} raw LinkedIn job records.")
-    transformed_df = pd.DataFrame()
-
     try:
-        # Define target columns based on BQ schema
-        final_columns = [
-            'job_id', 'job_title', 'company_name', 'location', 'employment_type',
-            'experience_level', 'workplace_type', 'applicant_count', 'reposted_info',
-            'skills_summary', 'application_type', 'job_description', 'job_link',
-            'company_logo_url', 'source_file', 'ingestionDate'
-        ]
-
-        # Copy existing columns, handling potential missing ones
-        for col in final_columns:
-            if col == 'ingestionDate':
-                transformed_df[col] = ingestion_date # Assign the fixed ingestion date
-            elif col in df.columns:
-                # Convert to string and handle potential NA values appropriately
-                transformed_df[col] = df[col].astype(str).fillna(pd.NA)
-            else:
-                logging.warning(f"Source DataFrame missing column '{col}'. It will be added with NA values.")
-                transformed_df[col] = pd.NA # Add missing columns as NA
-
-        # Ensure correct data types where necessary (especially primary key and date)
-        transformed_df['job_id'] = transformed_df['job_id'].astype(str)
-        # Convert ingestionDate to datetime objects suitable for BQ DATE type
-        # The BQ client library handles the conversion from pandas datetime/date to BQ DATE
-        transformed_df['ingestionDate'] = pd.to_datetime(transformed_df['ingestionDate'])
-
-        # Check for null job_ids which are part of the primary key
-        null_job_ids = transformed_df['job_id'].isnull().sum()
-        if null_job_ids > 0:
-             logging.warning(f"Found {null_job_ids} rows with null job_id. These might cause issues if job_id is NOT NULL in BigQuery.")
-             # Optional handling: drop them, fill with a placeholder, etc.
-             # transformed_df = transformed_df.dropna(subset=['job_id'])
-
-        # Reorder columns to match the final list for clarity
-        transformed_df = transformed_df[final_columns]
-
-        logging.info(f"Successfully transformed LinkedIn data. Resulting shape: {transformed_df.shape}")
-        # logging.debug(f"Transformed DataFrame dtypes:\n{transformed_df.dtypes}")
-
-    except KeyError as e:
-        logging.error(f"Missing expected column in source DataFrame during processing: {e}", exc_info=True)
-        raise
+        table = conform_to_schema(pa.Table.from_pandas(df, preserve_index=False), ingestion_date)
+        transformed_df = to_pandas(table)
     except Exception as e:
         logging.error(f"Error during LinkedIn data transformation: {e}", exc_info=True)
         raise
-
+    logging.info(f"Successfully transformed LinkedIn data. Resulting shape: {transformed_df.shape}")
     return transformed_df
 
 # --- BigQuery Functions ---
-def check_existing_keys_in_bigquery(df: pd.DataFrame) -> List[tuple]:
+
+def log_query_cost(query_job: bigquery.QueryJob, description: str) -> None:
+    """Log the bytes processed and billed by a finished query job, so per-run cost can be tracked."""
+    billed = query_job.total_bytes_billed or 0
+    processed = query_job.total_bytes_processed or 0
+    logging.info(f"{description} query {query_job.job_id}: {processed / 1024 / 1024:.1f} MB processed, "
+                 f"{billed / 1024 / 1024:.1f} MB billed, cache hit: {bool(query_job.cache_hit)}")
+
+KEY_ARROW_SCHEMA = pa.schema([("job_id", pa.string()), ("ingestionDate", pa.date32())])
+
+def _key_table(keys) -> pa.Table:
+    """
+    Turn (job_id, ingestionDate) keys into an Arrow table with KEY_ARROW_SCHEMA.
+
+    Accepts an Arrow table or DataFrame with those two columns, or the list of
+    (job_id, date) tuples older callers pass.
+    """
+    if isinstance(keys, list):
+        keys = [(str(k[0]), k[1]) for k in keys if isinstance(k[1], date)]
+        return pa.table({
+            "job_id": pa.array([k[0] for k in keys], pa.string()),
+            "ingestionDate": pa.array([k[1] for k in keys]).cast(pa.date32()) if keys else pa.array([], pa.date32()),
+        })
+    if isinstance(keys, pd.DataFrame):
+        keys = pa.Table.from_pandas(keys[["job_id", "ingestionDate"]], preserve_index=False)
+    # Timestamps (how pandas carries DATE values) truncate to their day
+    return pa.table({
+        "job_id": keys.column("job_id").cast(pa.string()),
+        "ingestionDate": keys.column("ingestionDate").cast(pa.date32()),
+    })
+
+def check_existing_keys_in_bigquery(df: pd.DataFrame) -> pa.Table:
     """
     Check which (job_id, ingestionDate) pairs already exist in the BigQuery table.
     
@@ -318,10 +302,11 @@ def check_existing_keys_in_bigquery(df: pd.DataFrame) -> List[tuple]:
         df: DataFrame containing the keys to check (must have 'job_id' and 'ingestionDate' columns)
         
     Returns:
-        List of (job_id, ingestionDate) tuples that already exist in BigQuery
+        Arrow table (job_id string, ingestionDate date32) of the keys that already exist in BigQuery
     """
     # Get BigQuery configuration from environment variables
-    bq_project_id = os.getenv("LINKEDIN_BQ_PROJECT_ID") or get_bigquery_client().project
+    bq_client = get_bigquery_client()
+    bq_project_id = os.getenv("LINKEDIN_BQ_PROJECT_ID") or bq_client.project
     bq_dataset_id = os.getenv("LINKEDIN_BQ_DATASET_ID")
     bq_table_id = os.getenv("LINKEDIN_BQ_TABLE_ID")
     
@@ -345,73 +330,48 @@ def check_existing_keys_in_bigquery(df: pd.DataFrame) -> List[tuple]:
         
         if len(key_pairs) == 0:
             logging.info("No valid key pairs (job_id, ingestionDate) to check in BigQuery after processing.")
-            return []
-        
-        # Create temporary table ID for the query
-        temp_dataset = f"{bq_dataset_id}"
-        temp_table_name = f"temp_lookup"
-        temp_table_id = f"{bq_project_id}.{temp_dataset}.{temp_table_name}"
-        
-        # Get BigQuery client
-        bq_client = get_bigquery_client()
-        
-        # Ensure temp dataset exists
-        try:
-            bq_client.get_dataset(f"{bq_project_id}.{temp_dataset}")
-        except Exception:
-            dataset = bigquery.Dataset(f"{bq_project_id}.{temp_dataset}")
-            bq_client.create_dataset(dataset, exists_ok=True)
-        
-        # Define explicit schema to match the target table
+            return KEY_ARROW_SCHEMA.empty_table()
+
+        # Upload the keys to a run-scoped lookup table (unique name, expires on its own)
         schema = [
             bigquery.SchemaField("job_id", "STRING"),
             bigquery.SchemaField("ingestionDate", "DATE")  # Use DATE type to match BigQuery
         ]
-        
-        # Create the table with explicit schema
-        table = bigquery.Table(temp_table_id, schema=schema)
-        table = bq_client.create_table(table, exists_ok=True)
-        
-        # Upload the lookup DataFrame to BigQuery
-        logging.info(f"Creating temporary lookup table with {len(key_pairs)} key pairs")
-
-        job_config = bigquery.LoadJobConfig(
-            write_disposition=bigquery.WriteDisposition.WRITE_APPEND
-        )
-        
-        load_job = bq_client.load_table_from_dataframe(
-            key_pairs, temp_table_id, job_config=job_config
-        )
-        load_job.result()  # Wait for the job to complete
-        
-        # Execute query to find matching keys
-        query = f"""
-        SELECT t.job_id, t.ingestionDate
-        FROM `{full_table_id}` t
-        INNER JOIN `{temp_table_id}` l
-        ON t.job_id = l.job_id
-        AND t.ingestionDate = l.ingestionDate
-        """
-        
-        # Run the query
-        logging.info("Checking for existing key pairs in BigQuery")
-        query_job = bq_client.query(query)
-        
-        # Collect results 
-        existing_keys = []
-        for row in query_job:
-            # Convert back to the format needed for comparison
-            existing_keys.append((row.job_id, row.ingestionDate))
-
-        logging.info(f"Found {len(existing_keys)} existing key pairs in BigQuery")
-
-        # Attempt to clean up the temporary table
-        try:
-            bq_client.delete_table(temp_table_id)
-            logging.info(f"Deleted temporary table {temp_table_id}")
-        except Exception as e:
-            logging.warning(f"Could not delete temporary table: {e}")
-        
+        with scratch_table(bq_client, full_table_id, "lookup", schema=schema) as temp_table_id:
+            logging.info(f"Creating temporary lookup table {temp_table_id} with {len(key_pairs)} key pairs")
+            job_config = bigquery.LoadJobConfig(
+                schema=schema,
+                write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE
+            )
+            load_job = bq_client.load_table_from_dataframe(
+                key_pairs, temp_table_id, job_config=job_config
+            )
+            load_job.result()  # Wait for the job to complete
+
+            # Execute query to find matching keys, reading only the partitions of the
+            # batch's ingestion dates (a file normally carries exactly one)
+            batch_dates = sorted(key_pairs['ingestionDate'].unique())
+            query = f"""
+            SELECT t.job_id, t.ingestionDate
+            FROM `{full_table_id}` t
+            INNER JOIN `{temp_table_id}` l
+            ON t.job_id = l.job_id
+            AND t.ingestionDate = l.ingestionDate
+            WHERE t.ingestionDate IN UNNEST(@dates)
+            """
+            job_config = bigquery.QueryJobConfig(query_parameters=[
+                bigquery.ArrayQueryParameter("dates", "DATE", batch_dates)
+            ])
+
+            # Run the query
+            logging.info(f"Checking for existing key pairs in BigQuery for ingestion dates {[d.isoformat() for d in batch_dates]}")
+            query_job = bq_client.query(query, job_config=job_config)
+
+            # Fetch the result as columns instead of iterating rows into Python tuples
+            existing_keys = _key_table(query_job.to_arrow())
+            log_query_cost(query_job, "Existing key check")
+
+        logging.info(f"Found {existing_keys.num_rows} existing key pairs in BigQuery")
         return existing_keys
         
     except Exception as e:
@@ -419,56 +379,54 @@ def check_existing_keys_in_bigquery(df: pd.DataFrame) -> List[tuple]:
         # Raising is safer to prevent accidental duplicate loads if the check fails
         raise
 
-def filter_out_duplicates(df: pd.DataFrame, existing_keys: List[Tuple[str, date]]) -> pd.DataFrame:
+def filter_out_duplicates(df: Union[pd.DataFrame, pa.Table], existing_keys) -> Union[pd.DataFrame, pa.Table]:
     """
     Filters out rows from the DataFrame whose (job_id, ingestionDate) pair
     already exists in BigQuery.
 
+    The keys of the DataFrame are anti-joined against the existing keys with an
+    Arrow hash join on typed (string, date32) columns, so no per-row Python
+    tuples are built.
+
     Args:
-        df: DataFrame containing the data to filter (must have 'job_id', 'ingestionDate').
-        existing_keys: List of (job_id, ingestionDate<date object>) tuples that exist in BigQuery.
+        df: DataFrame or conformed Arrow table containing the data to filter (must have 'job_id', 'ingestionDate').
+        existing_keys: Existing (job_id, ingestionDate) keys as returned by
+            check_existing_keys_in_bigquery (Arrow table), a DataFrame, or a list of
+            (job_id, date) tuples.
 
     Returns:
-        DataFrame with only the new rows.
+        DataFrame (or Arrow table) with only the new rows.
     """
-    if not existing_keys:
+    existing_table = _key_table(existing_keys)
+    if existing_table.num_rows == 0:
         logging.info("No existing keys provided - keeping all rows.")
         return df
-    if df.empty:
+    if len(df) == 0:
         logging.info("Input DataFrame is empty - returning empty DataFrame.")
         return df
 
     try:
-        # Ensure 'ingestionDate' in df is comparable (convert to date objects)
-        if pd.api.types.is_datetime64_any_dtype(df['ingestionDate']):
-             df_dates = df['ingestionDate'].dt.date
+        if isinstance(df, pa.Table):
+            df_keys = _key_table(df.select(["job_id", "ingestionDate"]))
         else:
-             # Attempt conversion if not already datetime
-             try:
-                 df_dates = pd.to_datetime(df['ingestionDate'], errors='coerce').dt.date
-             except Exception:
-                 logging.error("Could not convert 'ingestionDate' column to date objects for filtering.")
-                 raise # Or handle differently
-
-        # Create a set of existing keys for efficient lookup
-        # Ensure keys in the set are (str, date)
-        existing_keys_set = set((str(k[0]), k[1]) for k in existing_keys if isinstance(k[1], date))
-
-
-        # Create tuples from the DataFrame rows for comparison
-        # Ensure keys are (str, date) and handle potential NaT in dates
-        df_key_tuples = list(zip(df['job_id'].astype(str), df_dates))
-
-        # Create a boolean mask: True if the tuple is *not* in the existing set
-        # Handle potential NaT dates during comparison
-        keep_mask = [
-             (job_id, dt) not in existing_keys_set if pd.notna(dt) else True # Keep rows with invalid dates for now? Or False?
-             for job_id, dt in df_key_tuples
-        ]
-
+            # Rows with an unparseable ingestionDate get a null date, never match, and are kept
+            df_dates = df["ingestionDate"]
+            if not pd.api.types.is_datetime64_any_dtype(df_dates):
+                df_dates = pd.to_datetime(df_dates, errors="coerce")
+            df_keys = _key_table(pd.DataFrame({
+                "job_id": df["job_id"].astype(str),
+                "ingestionDate": df_dates,
+            }))
+        df_keys = df_keys.append_column("__row", pa.array(np.arange(len(df), dtype=np.int64)))
+
+        new_rows = df_keys.join(existing_table, keys=["job_id", "ingestionDate"], join_type="left anti")
+        keep_positions = np.sort(new_rows.column("__row").to_numpy())
 
         initial_count = len(df)
-        filtered_df = df[keep_mask].reset_index(drop=True)
+        if isinstance(df, pa.Table):
+            filtered_df = df.take(keep_positions)
+        else:
+            filtered_df = df.iloc[keep_positions].reset_index(drop=True)
         removed_count = initial_count - len(filtered_df)
 
         logging.info(f"Filtered out {removed_count} duplicate rows based on (job_id, ingestionDate), keeping {len(filtered_df)} new rows.")
@@ -478,12 +436,27 @@ def filter_out_duplicates(df: pd.DataFrame, existing_keys: List[Tuple[str, date]
         logging.error(f"Error filtering out duplicates: {e}", exc_info=True)
         raise
 
-def load_to_bigquery(df: pd.DataFrame) -> None:
+def load_data(bq_client: bigquery.Client, data: Union[pd.DataFrame, pa.Table], destination: str,
+              job_config: bigquery.LoadJobConfig) -> bigquery.LoadJob:
+    """
+    Start a load job from a DataFrame or from a conformed Arrow table.
+
+    Arrow tables are written to Parquet in memory and loaded as they are, so their
+    types reach BigQuery without another round of pandas type inference.
+    """
+    if isinstance(data, pd.DataFrame):
+        return bq_client.load_table_from_dataframe(data, destination, job_config=job_config)
+    buffer = io.BytesIO()
+    pq.write_table(data, buffer, compression="snappy")
+    job_config.source_format = bigquery.SourceFormat.PARQUET
+    return bq_client.load_table_from_file(buffer, destination, job_config=job_config, rewind=True)
+
+def load_to_bigquery(df: Union[pd.DataFrame, pa.Table]) -> None:
     """
     Loads the DataFrame to the configured LinkedIn BigQuery table.
 
     Args:
-        df: The DataFrame to load.
+        df: The DataFrame (or conformed Arrow table) to load.
     """
     bq_project_id = os.getenv("LINKEDIN_BQ_PROJECT_ID") # Let get_bigquery_client handle fallback logic
     bq_dataset_id = os.getenv("LINKEDIN_BQ_DATASET_ID")
@@ -496,7 +469,7 @@ def load_to_bigquery(df: pd.DataFrame) -> None:
     if not all([bq_dataset_id, bq_table_id]):
         raise ValueError("Missing required BigQuery config (LINKEDIN_BQ_DATASET_ID, LINKEDIN_BQ_TABLE_ID)")
 
-    if df.empty:
+    if len(df) == 0:
         logging.info("DataFrame is empty. No data to load to BigQuery.")
         return
 
@@ -522,24 +495,9 @@ def load_to_bigquery(df: pd.DataFrame) -> None:
             autodetect=False, # Explicitly False is safer if schema is known
             # Define schema based on your final_columns in process_linkedin_job_data
             # This provides better validation and control.
-            schema=[
-                bigquery.SchemaField("job_id", "STRING", mode="REQUIRED"),
-                bigquery.SchemaField("job_title", "STRING"),
-                bigquery.SchemaField("company_name", "STRING"),
-                bigquery.SchemaField("location", "STRING"),
-                bigquery.SchemaField("employment_type", "STRING"),
-                bigquery.SchemaField("experience_level", "STRING"),
-                bigquery.SchemaField("workplace_type", "STRING"),
-                bigquery.SchemaField("applicant_count", "STRING"), # Keep as STRING if inconsistent numbers/text
-                bigquery.SchemaField("reposted_info", "STRING"),
-                bigquery.SchemaField("skills_summary", "STRING"),
-                bigquery.SchemaField("application_type", "STRING"),
-                bigquery.SchemaField("job_description", "STRING"),
-                bigquery.SchemaField("job_link", "STRING"),
-                bigquery.SchemaField("company_logo_url", "STRING"),
-                bigquery.SchemaField("source_file", "STRING"),
-                bigquery.SchemaField("ingestionDate", "DATE", mode="REQUIRED") # Define as DATE
-            ],
+            schema=LINKEDIN_JOBS_SCHEMA,
+            # Lets existing tables pick up the typed columns on the next append
+            schema_update_options=[bigquery.SchemaUpdateOption.ALLOW_FIELD_ADDITION],
             time_partitioning=bigquery.TimePartitioning(
                 type_=bigquery.TimePartitioningType.DAY,
                 field="ingestionDate" # Match the partition column name
@@ -553,7 +511,7 @@ def load_to_bigquery(df: pd.DataFrame) -> None:
         # df['ingestionDate'] = df['ingestionDate'].dt.date # Convert to date objects if necessary before load
 
         # Load DataFrame to BigQuery
-        job = bq_client.load_table_from_dataframe(df, full_table_id, job_config=job_config)
+        job = load_data(bq_client, df, full_table_id, job_config)
         logging.info(f"Load job started: {job.job_id}")
         job.result()  # Wait for job to complete
 
@@ -574,6 +532,630 @@ def load_to_bigquery(df: pd.DataFrame) -> None:
                  logging.error(f"BigQuery error detail: {error['message']}")
         raise # Re-raise the exception
 
+def get_target_table_id(bq_client: bigquery.Client) -> str:
+    """Return the fully qualified ID of the LinkedIn staging table from the environment."""
+    bq_project_id = os.getenv("LINKEDIN_BQ_PROJECT_ID") or bq_client.project
+    bq_dataset_id = os.getenv("LINKEDIN_BQ_DATASET_ID")
+    bq_table_id = os.getenv("LINKEDIN_BQ_TABLE_ID")
+    if not all([bq_project_id, bq_dataset_id, bq_table_id]):
+        raise ValueError("Missing required BigQuery config (LINKEDIN_BQ_PROJECT_ID/Client Project, LINKEDIN_BQ_DATASET_ID, LINKEDIN_BQ_TABLE_ID)")
+    return f"{bq_project_id}.{bq_dataset_id}.{bq_table_id}"
+
+# Staging tables whose columns were already checked by this process
+_ensured_tables: Set[str] = set()
+_ensured_tables_lock = threading.Lock()
+
+def ensure_target_columns(bq_client: bigquery.Client, target_table_id: str) -> List[str]:
+    """
+    Add the LINKEDIN_JOBS_SCHEMA columns the staging table does not have yet, as NULLABLE.
+
+    The MERGE and partition writes name every schema column, and unlike the append
+    load they cannot add columns through ALLOW_FIELD_ADDITION, so tables created
+    before the typed columns existed are migrated here first. Each table is checked
+    once per process.
+
+    Returns:
+        Names of the columns that were added
+    """
+    with _ensured_tables_lock:
+        if target_table_id in _ensured_tables:
+            return []
+        table = bq_client.get_table(target_table_id)
+        existing = {field.name for field in table.schema}
+        missing = [field for field in LINKEDIN_JOBS_SCHEMA if field.name not in existing]
+        if missing:
+            table.schema = list(table.schema) + [
+                bigquery.SchemaField(field.name, field.field_type, mode="NULLABLE", description=field.description)
+                for field in missing
+            ]
+            bq_client.update_table(table, ["schema"])
+            logging.info(f"Added columns {', '.join(field.name for field in missing)} to {target_table_id}")
+        _ensured_tables.add(target_table_id)
+        return [field.name for field in missing]
+
+def build_source_select(scratch_table_id: str, source_expressions: Optional[Dict[str, str]] = None) -> str:
+    """
+    Build the SELECT producing staging rows from a scratch table, one row per (job_id, ingestionDate).
+
+    Duplicate keys keep the latest capture, then the first source_file (the parser's
+    dedup also prefers the latest capture), so reloading a file always keeps the same row.
+
+    Args:
+        scratch_table_id: Fully qualified scratch table holding the file's rows
+        source_expressions: SQL expression over the scratch columns for every target
+            column; None when the scratch table already has the target schema
+    """
+    columns = [field.name for field in LINKEDIN_JOBS_SCHEMA]
+    select_list = "*" if source_expressions is None else \
+        ", ".join(f"{source_expressions[c]} AS `{c}`" for c in columns)
+    return f"""
+        SELECT * FROM (SELECT {select_list} FROM `{scratch_table_id}`)
+        WHERE job_id IS NOT NULL
+        QUALIFY ROW_NUMBER() OVER (
+            PARTITION BY job_id, ingestionDate ORDER BY captured_at DESC NULLS LAST, source_file
+        ) = 1
+    """
+
+def build_merge_query(target_table_id: str, scratch_table_id: str,
+                      source_expressions: Optional[Dict[str, str]] = None) -> str:
+    """
+    Build the MERGE that inserts rows whose (job_id, ingestionDate) is not in the target yet.
+
+    Rows already in the target are left untouched, like the append mode's duplicate filter.
+    Duplicate keys within the file are collapsed to one row. The @ingestion_date
+    parameter restricts the target scan to the file's partition.
+
+    Args:
+        target_table_id: Fully qualified staging table
+        scratch_table_id: Fully qualified scratch table holding the file's rows
+        source_expressions: See build_source_select
+    """
+    columns = [field.name for field in LINKEDIN_JOBS_SCHEMA]
+    column_list = ", ".join(f"`{c}`" for c in columns)
+    source_list = ", ".join(f"S.`{c}`" for c in columns)
+    return f"""
+    MERGE `{target_table_id}` T
+    USING ({build_source_select(scratch_table_id, source_expressions)}) S
+    ON T.ingestionDate = @ingestion_date
+       AND T.job_id = S.job_id
+       AND T.ingestionDate = S.ingestionDate
+    WHEN NOT MATCHED THEN
+        INSERT ({column_list}) VALUES ({source_list})
+    """
+
+def get_scratch_table_id(target_table_id: str, tag: str) -> str:
+    """Unique per-run scratch table name in LINKEDIN_BQ_SCRATCH_DATASET_ID (default: the staging dataset)."""
+    scratch_dataset = os.getenv("LINKEDIN_BQ_SCRATCH_DATASET_ID") or target_table_id.split('.')[1]
+    return (f"{target_table_id.split('.')[0]}.{scratch_dataset}."
+            f"_scratch_linkedin_{tag}_{uuid.uuid4().hex[:12]}")
+
+def scratch_table_expiration() -> datetime:
+    """Expiration for scratch tables, so they disappear even if the run dies before dropping them."""
+    return datetime.now(timezone.utc) + timedelta(hours=int(os.getenv("LINKEDIN_BQ_SCRATCH_TTL_HOURS", "6")))
+
+@contextmanager
+def scratch_table(bq_client: bigquery.Client, target_table_id: str, tag: str,
+                  schema: Optional[List[bigquery.SchemaField]] = None) -> Iterator[str]:
+    """
+    Create a run-scoped scratch table and drop it on exit.
+
+    Every caller gets its own uniquely named table with an expiration, so concurrent
+    sink runs (e.g. a backfill next to the daily load) never share a table, and a run
+    that crashes before the drop leaves nothing behind for longer than the TTL.
+
+    Args:
+        bq_client: BigQuery client
+        target_table_id: Staging table the scratch table belongs to (its project/dataset are reused)
+        tag: Short label included in the table name (e.g. the ingestion date)
+        schema: Schema of the table; None lets the first load job define it
+
+    Yields:
+        Fully qualified ID of the scratch table
+    """
+    scratch_table_id = get_scratch_table_id(target_table_id, tag)
+    table = bigquery.Table(scratch_table_id, schema=schema)
+    table.expires = scratch_table_expiration()
+    table.labels = {"linkedin_sink": "scratch"}
+    bq_client.create_table(table)
+    try:
+        yield scratch_table_id
+    finally:
+        try:
+            bq_client.delete_table(scratch_table_id, not_found_ok=True)
+        except Exception as e:
+            logging.warning(f"Could not delete scratch table {scratch_table_id} (it expires on its own): {e}")
+
+def merge_into_bigquery(df: Union[pd.DataFrame, pa.Table], ingestion_date: date) -> int:
+    """
+    Stage the DataFrame into a per-run scratch table and MERGE it into the staging table.
+
+    Replaces the key lookup, client-side filter and second load of the append mode with
+    one load job and one query job. The scratch table gets an expiration so it is
+    cleaned up even if this process dies before dropping it.
+
+    Args:
+        df: Transformed DataFrame (output of process_linkedin_job_data) or conformed Arrow table
+        ingestion_date: Date the file was ingested, used to prune the target scan
+
+    Returns:
+        Number of rows inserted into the staging table
+    """
+    if len(df) == 0:
+        logging.info("DataFrame is empty. No data to merge into BigQuery.")
+        return 0
+
+    bq_client = get_bigquery_client()
+    target_table_id = get_target_table_id(bq_client)
+
+    try:
+        ensure_target_columns(bq_client, target_table_id)
+
+        # 1. Stage the whole file into a scratch table that expires on its own
+        with scratch_table(bq_client, target_table_id, f"{ingestion_date:%Y%m%d}",
+                           schema=LINKEDIN_JOBS_SCHEMA) as scratch_table_id:
+            load_job = load_data(
+                bq_client, df, scratch_table_id,
+                bigquery.LoadJobConfig(schema=LINKEDIN_JOBS_SCHEMA,
+                                       write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE)
+            )
+            load_job.result()
+            logging.info(f"Staged {load_job.output_rows} rows into scratch table {scratch_table_id}")
+
+            # 2. One MERGE on (job_id, ingestionDate) into the staging table
+            merge_job = bq_client.query(
+                build_merge_query(target_table_id, scratch_table_id),
+                job_config=bigquery.QueryJobConfig(query_parameters=[
+                    bigquery.ScalarQueryParameter("ingestion_date", "DATE", ingestion_date)
+                ])
+            )
+            merge_job.result()
+            log_query_cost(merge_job, "MERGE")
+            inserted = merge_job.num_dml_affected_rows or 0
+            logging.info(f"MERGE inserted {inserted} new rows into {target_table_id} "
+                         f"({len(df) - inserted} already present or duplicated in the file).")
+            return inserted
+
+    except Exception as e:
+        logging.error(f"Error merging data into BigQuery table {target_table_id}: {e}", exc_info=True)
+        raise
+
+
+def _arrow_type_matches(arrow_type: pa.DataType, bq_type: str) -> bool:
+    """Whether a Parquet column (as Arrow type) can be loaded into a column of the given BigQuery type."""
+    if pa.types.is_dictionary(arrow_type):
+        arrow_type = arrow_type.value_type
+    if pa.types.is_null(arrow_type):
+        return True
+    if bq_type == "STRING":
+        return pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type)
+    if bq_type == "INT64":
+        return pa.types.is_integer(arrow_type)
+    if bq_type == "BOOL":
+        return pa.types.is_boolean(arrow_type)
+    if bq_type == "TIMESTAMP":
+        return pa.types.is_timestamp(arrow_type)
+    if bq_type == "DATE":
+        return pa.types.is_date(arrow_type) or pa.types.is_timestamp(arrow_type)
+    return False
+
+def validate_parquet_footer(file_path: str) -> pa.Schema:
+    """
+    Read only the Parquet footer of a GCS object (ranged reads) and check it against the staging schema.
+
+    Args:
+        file_path: gs:// URI of the Parquet file
+
+    Returns:
+        The Arrow schema of the file
+
+    Raises:
+        ValueError: If job_id is missing or a column cannot be loaded into its staging type
+    """
+    bucket_name, blob_name = file_path[5:].split('/', 1)
+    blob = get_storage_client().bucket(bucket_name).blob(blob_name)
+    # BlobReader fetches byte ranges on demand, so only the footer (and its length) is read
+    with blob.open("rb", chunk_size=256 * 1024) as reader:
+        parquet_file = pq.ParquetFile(reader)
+        schema = parquet_file.schema_arrow
+        metadata = parquet_file.metadata
+    logging.info(f"Parquet footer of {file_path}: {metadata.num_rows} rows, "
+                 f"{metadata.num_row_groups} row groups, {len(schema)} columns")
+
+    if 'job_id' not in schema.names:
+        raise ValueError(f"{file_path} has no job_id column")
+    incompatible = [
+        f"{field.name} ({schema.field(field.name).type} -> {field.field_type})"
+        for field in LINKEDIN_JOBS_SCHEMA
+        if field.name in schema.names and not _arrow_type_matches(schema.field(field.name).type, field.field_type)
+    ]
+    if incompatible:
+        raise ValueError(f"{file_path} has columns incompatible with the staging schema: {', '.join(incompatible)}")
+    return schema
+
+def _source_expression(column: str, target_type: str, scratch_types: Dict[str, str]) -> str:
+    """SQL turning a scratch column (as loaded from the file) into the staging column."""
+    if column == "ingestionDate":
+        return "@ingestion_date"
+    scratch_type = scratch_types.get(column)
+    if scratch_type is None:
+        return f"CAST(NULL AS {target_type})"
+    if scratch_type == target_type or (scratch_type, target_type) in {("INTEGER", "INT64"), ("BOOLEAN", "BOOL")}:
+        return f"`{column}`"
+    return f"CAST(`{column}` AS {target_type})"
+
+def stage_parquet_uri(bq_client: bigquery.Client, file_path: str, scratch_table_id: str) -> Dict[str, str]:
+    """
+    Load a Parquet file from its gs:// URI into a scratch table.
+
+    Returns:
+        Source expressions mapping the scratch columns onto LINKEDIN_JOBS_SCHEMA (see build_source_select)
+    """
+    load_job = bq_client.load_table_from_uri(
+        file_path, scratch_table_id,
+        job_config=bigquery.LoadJobConfig(
+            source_format=bigquery.SourceFormat.PARQUET,
+            write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
+            create_disposition=bigquery.CreateDisposition.CREATE_IF_NEEDED,
+        )
+    )
+    load_job.result()
+    # WRITE_TRUNCATE replaces the table's schema; re-apply the expiration with it
+    loaded_table = bq_client.get_table(scratch_table_id)
+    loaded_table.expires = scratch_table_expiration()
+    bq_client.update_table(loaded_table, ["expires"])
+    logging.info(f"Loaded {load_job.output_rows} rows from {file_path} into scratch table {scratch_table_id}")
+
+    scratch_types = {field.name: field.field_type for field in loaded_table.schema}
+    return {
+        field.name: _source_expression(field.name, field.field_type, scratch_types)
+        for field in LINKEDIN_JOBS_SCHEMA
+    }
+
+def load_parquet_uri_to_bigquery(file_path: str, ingestion_date: date) -> int:
+    """
+    Load a Parquet file straight from its gs:// URI into the staging table.
+
+    The file's footer is validated first; BigQuery then loads the object itself into a
+    scratch table, and one MERGE maps it onto the staging schema, sets ingestionDate
+    from the @ingestion_date parameter and skips keys that already exist. The file's
+    bytes never pass through this process.
+
+    A load job straight into the staging table would be cheaper, but it cannot skip
+    existing keys, set ingestionDate (the parser's files do not carry it) or cast the
+    parser's column types, so this costs a second job: the MERGE is billed for the
+    scratch table plus the one target partition it scans.
+
+    Args:
+        file_path: gs:// URI of the Parquet file
+        ingestion_date: Date extracted from the filename
+
+    Returns:
+        Number of rows inserted into the staging table
+    """
+    validate_parquet_footer(file_path)
+
+    bq_client = get_bigquery_client()
+    target_table_id = get_target_table_id(bq_client)
+
+    try:
+        ensure_target_columns(bq_client, target_table_id)
+        with scratch_table(bq_client, target_table_id, f"{ingestion_date:%Y%m%d}") as scratch_table_id:
+            # 1. BigQuery reads the object directly; Parquet carries its own schema
+            source_expressions = stage_parquet_uri(bq_client, file_path, scratch_table_id)
+
+            # 2. Map onto the staging schema and MERGE on (job_id, ingestionDate)
+            merge_job = bq_client.query(
+                build_merge_query(target_table_id, scratch_table_id, source_expressions),
+                job_config=bigquery.QueryJobConfig(query_parameters=[
+                    bigquery.ScalarQueryParameter("ingestion_date", "DATE", ingestion_date)
+                ])
+            )
+            merge_job.result()
+            log_query_cost(merge_job, "MERGE")
+            inserted = merge_job.num_dml_affected_rows or 0
+            logging.info(f"MERGE inserted {inserted} new rows from {file_path} into {target_table_id}.")
+            return inserted
+
+    except Exception as e:
+        logging.error(f"Error loading {file_path} into BigQuery table {target_table_id}: {e}", exc_info=True)
+        raise
+
+
+def get_partition_id(target_table_id: str, ingestion_date: date) -> str:
+    """Partition decorator of the staging table for one ingestion date (table$YYYYMMDD)."""
+    return f"{target_table_id}${ingestion_date:%Y%m%d}"
+
+def build_partition_replace_script(target_table_id: str, scratch_table_id: str,
+                                   source_expressions: Dict[str, str]) -> str:
+    """
+    Build the transaction that swaps the @ingestion_date partition for the scratch table's rows.
+
+    The rows are written by DML into the table itself, so its column modes (REQUIRED
+    job_id and ingestionDate) hold; a query writing to the partition decorator would
+    produce an all-NULLABLE result that BigQuery refuses to truncate the table with.
+    """
+    column_list = ", ".join(f"`{field.name}`" for field in LINKEDIN_JOBS_SCHEMA)
+    return f"""
+    BEGIN TRANSACTION;
+    DELETE FROM `{target_table_id}` WHERE ingestionDate = @ingestion_date;
+    INSERT INTO `{target_table_id}` ({column_list})
+    SELECT {column_list} FROM ({build_source_select(scratch_table_id, source_expressions)});
+    COMMIT TRANSACTION;
+    """
+
+def replace_partition_from_uri(file_path: str, ingestion_date: date) -> int:
+    """
+    Replace the file's ingestionDate partition with the file's rows, read straight from GCS.
+
+    The file is staged into a scratch table, and one transaction deletes the partition's
+    rows and inserts the mapped, de-duplicated ones, so the partition is swapped
+    atomically: readers see either the old or the new rows, and reloading a file
+    never appends duplicates. Deleting a whole partition is a metadata operation.
+
+    Args:
+        file_path: gs:// URI of the Parquet file
+        ingestion_date: Partition to replace
+
+    Returns:
+        Number of rows in the partition after the replacement
+    """
+    validate_parquet_footer(file_path)
+
+    bq_client = get_bigquery_client()
+    target_table_id = get_target_table_id(bq_client)
+    partition_id = get_partition_id(target_table_id, ingestion_date)
+    ensure_target_columns(bq_client, target_table_id)
+
+    with scratch_table(bq_client, target_table_id, f"{ingestion_date:%Y%m%d}") as scratch_table_id:
+        source_expressions = stage_parquet_uri(bq_client, file_path, scratch_table_id)
+        query_job = bq_client.query(
+            build_partition_replace_script(target_table_id, scratch_table_id, source_expressions),
+            job_config=bigquery.QueryJobConfig(query_parameters=[
+                bigquery.ScalarQueryParameter("ingestion_date", "DATE", ingestion_date)
+            ])
+        )
+        query_job.result()
+        log_query_cost(query_job, "Partition replace")
+
+    rows = bq_client.get_table(partition_id).num_rows or 0
+    logging.info(f"Replaced partition {partition_id} with {rows} rows from {file_path}")
+    return rows
+
+def replace_partition_from_dataframe(file_path: str, ingestion_date: date) -> int:
+    """
+    Replace the file's ingestionDate partition from a locally converted copy of the file.
+
+    The columns are converted locally by schema.conform_to_schema and loaded with the
+    staging schema into the partition decorator with WRITE_TRUNCATE, which swaps the
+    partition atomically like replace_partition_from_uri.
+
+    Returns:
+        Number of rows written to the partition
+    """
+    table = conform_to_schema(read_parquet_table_from_gcs(file_path, columns=[f.name for f in LINKEDIN_JOBS_SCHEMA]),
+                              ingestion_date)
+    job_ids = table.column("job_id").to_pandas()
+    table = table.filter(pa.array((job_ids.notna() & ~job_ids.duplicated()).to_numpy()))
+
+    bq_client = get_bigquery_client()
+    target_table_id = get_target_table_id(bq_client)
+    ensure_target_columns(bq_client, target_table_id)
+    partition_id = get_partition_id(target_table_id, ingestion_date)
+    load_job = load_data(
+        bq_client, table, partition_id,
+        bigquery.LoadJobConfig(
+            schema=LINKEDIN_JOBS_SCHEMA,
+            write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
+            create_disposition=bigquery.CreateDisposition.CREATE_NEVER,
+            time_partitioning=bigquery.TimePartitioning(
+                type_=bigquery.TimePartitioningType.DAY,
+                field="ingestionDate"
+            ),
+        )
+    )
+    load_job.result()
+    logging.info(f"Replaced partition {partition_id} with {load_job.output_rows} rows from {file_path}")
+    return load_job.output_rows or 0
+
+
+# --- Catch-up Ingestion ---
+
+def get_ledger_blob_name(prefix: str) -> str:
+    """Object holding the processed-file ledger (LINKEDIN_BQ_LEDGER_PATH, default next to the files)."""
+    return os.getenv("LINKEDIN_BQ_LEDGER_PATH") or f"{prefix.rstrip('/')}/_bq_load_ledger.json"
+
+def read_ledger(bucket_name: str, ledger_blob_name: str,
+                max_attempts: int = 5) -> Tuple[Dict[str, Any], Optional[int]]:
+    """
+    Read the processed-file ledger from GCS.
+
+    The generation is taken from the download response itself, so it always belongs
+    to the bytes that were read, even if another run rewrites the ledger meanwhile.
+
+    Returns:
+        (ledger, generation of the ledger object or None if it does not exist yet)
+    """
+    for attempt in range(1, max_attempts + 1):
+        blob = get_storage_client().bucket(bucket_name).blob(ledger_blob_name)
+        try:
+            ledger = json.loads(blob.download_as_text())
+            if blob.generation is not None:
+                return ledger, blob.generation
+            # Some emulators omit the generation header: look it up, then re-read exactly that generation
+            blob.reload()
+            return json.loads(blob.download_as_text(if_generation_match=blob.generation)), blob.generation
+        except NotFound:
+            return {"files": {}}, None
+        except PreconditionFailed:
+            if attempt == max_attempts:
+                raise
+            logging.info(f"Ledger gs://{bucket_name}/{ledger_blob_name} changed while reading, retrying ({attempt})")
+
+def record_file_outcomes(bucket_name: str, ledger_blob_name: str, outcomes: Dict[str, Dict[str, Any]],
+                         update_watermark: bool = False, max_attempts: int = 5) -> None:
+    """
+    Merge per-file outcomes into the ledger, optionally advancing its watermark.
+
+    The watermark should only be advanced once every listed file has an outcome,
+    otherwise a file still loading could end up behind it.
+
+    The write is conditional on the generation that was read, so a concurrent sink run
+    cannot overwrite another run's entries; on a precondition failure the ledger is
+    re-read and the outcomes merged again.
+    """
+    blob = get_storage_client().bucket(bucket_name).blob(ledger_blob_name)
+    for attempt in range(1, max_attempts + 1):
+        ledger, generation = read_ledger(bucket_name, ledger_blob_name)
+        for blob_name, outcome in outcomes.items():
+            previous = ledger["files"].get(blob_name, {})
+            # A file loaded earlier stays loaded even if a later retry of it failed
+            if previous.get("status") == "loaded" and outcome["status"] != "loaded" \
+                    and previous.get("generation") == outcome.get("generation"):
+                continue
+            outcome["attempts"] = previous.get("attempts", 0) + 1
+            ledger["files"][blob_name] = outcome
+        if update_watermark:
+            advance_watermark(ledger)
+        try:
+            blob.upload_from_string(json.dumps(ledger, indent=2, sort_keys=True, default=str),
+                                    content_type="application/json",
+                                    if_generation_match=generation or 0)
+            return
+        except Exception as e:
+            if getattr(e, "code", None) != 412 or attempt == max_attempts:
+                raise
+            logging.info(f"Ledger gs://{bucket_name}/{ledger_blob_name} changed concurrently, retrying ({attempt})")
+
+def find_unprocessed_files(bucket_name: str, prefix: str, ledger: Dict[str, Any],
+                           since: Optional[date] = None,
+                           file_name_prefix: str = "linkedin_scrap_",
+                           file_name_suffix: str = ".parquet") -> List[Tuple[str, int, date]]:
+    """
+    List the daily files that are not in the ledger as loaded (at their current generation).
+
+    Listing starts at the ledger's watermark (every file before it is loaded) or at
+    `since`, whichever is later, so only files from the watermark on are fetched.
+
+    Args:
+        bucket_name: The name of the GCS bucket.
+        prefix: The prefix (subfolder path) within the bucket.
+        ledger: Ledger as returned by read_ledger.
+        since: Ignore files dated before this day (bounds the first catch-up run).
+
+    Returns:
+        (gs:// path, generation, ingestion date) tuples, oldest first
+    """
+    prefix_with_slash = prefix if prefix.endswith('/') else prefix + '/'
+    offsets = [ledger.get("watermark")]
+    if since:
+        offsets.append(f"{prefix_with_slash}{file_name_prefix}{since.isoformat()}")
+    start_offset = max((o for o in offsets if o), default=None)
+
+    pending = []
+    for blob in list_daily_files(bucket_name, prefix, start_offset=start_offset,
+                                 file_name_prefix=file_name_prefix, file_name_suffix=file_name_suffix):
+        ingestion_dt = extract_date_from_filename(blob.name)
+        if not ingestion_dt:
+            continue
+        entry = ledger["files"].get(blob.name, {})
+        # A rewritten file gets a new generation and is loaded again (the MERGE skips existing keys)
+        if entry.get("status") == "loaded" and entry.get("generation") == blob.generation:
+            continue
+        pending.append((f"gs://{bucket_name}/{blob.name}", blob.generation, ingestion_dt))
+    pending.sort(key=lambda item: item[2])
+    logging.info(f"Found {len(pending)} unprocessed files in gs://{bucket_name}/{prefix_with_slash}"
+                 f"{f' from {start_offset}' if start_offset else ''}")
+    return pending
+
+def advance_watermark(ledger: Dict[str, Any]) -> Optional[str]:
+    """
+    Move the ledger watermark to the last file of the unbroken run of loaded files after it.
+
+    Files before the watermark are not listed again, so a failed file holds it back
+    until it has been loaded.
+    """
+    watermark = ledger.get("watermark")
+    for blob_name in sorted(ledger["files"]):
+        if watermark and blob_name <= watermark:
+            continue
+        if ledger["files"][blob_name].get("status") != "loaded":
+            break
+        watermark = blob_name
+    ledger["watermark"] = watermark
+    return watermark
+
+def load_file_to_bigquery(file_path: str, ingestion_date: date, load_mode: str) -> int:
+    """
+    Load one daily file with a MERGE-based mode, so running it twice inserts nothing the second time.
+
+    Returns:
+        Number of rows inserted
+    """
+    if load_mode == "uri":
+        return load_parquet_uri_to_bigquery(file_path, ingestion_date)
+    processed = conform_to_schema(read_parquet_table_from_gcs(file_path), ingestion_date)
+    if processed.num_rows == 0:
+        logging.info(f"{file_path} has no rows after transformation. Nothing to load.")
+        return 0
+    return merge_into_bigquery(processed, ingestion_date)
+
+def catch_up(bucket_name: str, prefix: str, load_mode: str, max_workers: int = 4,
+             since: Optional[date] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Load every daily file that has not been loaded yet, a bounded number at a time.
+
+    Each file is its own MERGE into its own ingestionDate partition, so files can load
+    concurrently and a file that is loaded twice adds no rows. The outcome of every
+    file is written to the ledger as soon as it finishes, so a crash mid-run keeps the
+    progress made so far and a failed file is retried by the next run.
+
+    Args:
+        bucket_name: The name of the GCS bucket.
+        prefix: The prefix (subfolder path) within the bucket.
+        load_mode: "uri" or "merge"; the append mode is not idempotent and falls back to "merge".
+        max_workers: Files loaded in parallel.
+        since: Ignore files dated before this day.
+
+    Returns:
+        Outcome per blob name (status, generation, rows, error, finished_at)
+    """
+    if load_mode not in ("uri", "merge"):
+        logging.info(f"Load mode '{load_mode}' is not idempotent; catch-up uses 'merge' instead.")
+        load_mode = "merge"
+
+    ledger_blob_name = get_ledger_blob_name(prefix)
+    ledger, _ = read_ledger(bucket_name, ledger_blob_name)
+    pending = find_unprocessed_files(bucket_name, prefix, ledger, since=since)
+    outcomes: Dict[str, Dict[str, Any]] = {}
+    ledger_lock = threading.Lock()
+
+    def load_one(file_path: str, generation: int, ingestion_dt: date) -> Tuple[str, Dict[str, Any]]:
+        started = time.perf_counter()
+        outcome: Dict[str, Any] = {"generation": generation, "ingestion_date": ingestion_dt.isoformat(),
+                                   "load_mode": load_mode}
+        try:
+            outcome.update(status="loaded", rows=load_file_to_bigquery(file_path, ingestion_dt, load_mode))
+        except Exception as e:
+            logging.error(f"Catch-up load of {file_path} failed: {e}", exc_info=True)
+            outcome.update(status="failed", error=str(e))
+        outcome.update(seconds=round(time.perf_counter() - started, 2),
+                       finished_at=datetime.now(timezone.utc).isoformat())
+        return file_path[5:].split('/', 1)[1], outcome
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(load_one, *item) for item in pending]
+        for future in as_completed(futures):
+            blob_name, outcome = future.result()
+            outcomes[blob_name] = outcome
+            with ledger_lock:
+                record_file_outcomes(bucket_name, ledger_blob_name, {blob_name: dict(outcome)})
+    record_file_outcomes(bucket_name, ledger_blob_name, {}, update_watermark=True)
+
+    loaded = sum(1 for o in outcomes.values() if o["status"] == "loaded")
+    logging.info(f"Catch-up finished: {loaded} of {len(outcomes)} files loaded, "
+                 f"{sum(o.get('rows', 0) for o in outcomes.values())} rows inserted.")
+    return outcomes
+
 # --- Main Execution Logic (Example) ---
 if __name__ == "__main__":
     # Example usage: Replace with your actual environment variable setup or config loading
@@ -589,6 +1171,21 @@ if __name__ == "__main__":
         logging.error("Required environment variables GCS_BUCKET_NAME or GCS_LINKEDIN_SUBFOLDER_PATH are not set.")
         exit(1) # Or handle appropriately
 
+    if os.getenv("LINKEDIN_BQ_CATCH_UP", "false").lower() == "true":
+        # Load every file the ledger does not list as loaded, not just the latest one
+        since = os.getenv("LINKEDIN_BQ_CATCH_UP_SINCE")
+        try:
+            outcomes = catch_up(
+                gcs_bucket, gcs_prefix,
+                load_mode=os.getenv("LINKEDIN_BQ_LOAD_MODE", "merge").lower(),
+                max_workers=int(os.getenv("LINKEDIN_BQ_CATCH_UP_WORKERS", "4")),
+                since=datetime.strptime(since, "%Y-%m-%d").date() if since else None,
+            )
+        except Exception as e:
+            logging.error(f"LinkedIn catch-up ingestion failed: {e}", exc_info=True)
+            exit(1)
+        exit(1 if any(o["status"] != "loaded" for o in outcomes.values()) else 0)
+
     try:
         # 1. Find the latest file
         latest_file_path = find_latest_file_in_gcs_by_name(gcs_bucket, gcs_prefix)
@@ -603,23 +1200,35 @@ if __name__ == "__main__":
             logging.error(f"Could not extract date from filename: {latest_file_path}. Skipping load.")
             exit(1) # Or handle appropriately
 
-        # 3. Read data from GCS
-        raw_df = read_parquet_from_gcs(latest_file_path)
+        load_mode = os.getenv("LINKEDIN_BQ_LOAD_MODE", "append").lower()
+        if load_mode == "uri":
+            # 3. Validate the footer and let BigQuery read the file itself
+            load_parquet_uri_to_bigquery(latest_file_path, ingestion_dt)
+            logging.info("LinkedIn data processing pipeline finished successfully.")
+            exit(0)
 
-        # 4. Process/Transform data
-        processed_df = process_linkedin_job_data(raw_df, ingestion_dt)
+        # 3. Read data from GCS as Arrow (only the staging columns)
+        raw_table = read_parquet_table_from_gcs(latest_file_path, columns=[f.name for f in LINKEDIN_JOBS_SCHEMA])
 
-        if not processed_df.empty:
+        # 4. Process/Transform data into the declared staging schema
+        processed = conform_to_schema(raw_table, ingestion_dt)
+
+        if processed.num_rows == 0:
+            logging.info("Processed table is empty after transformation. Nothing to load.")
+        elif load_mode == "merge":
+            # 5. Stage into a scratch table and MERGE on (job_id, ingestionDate)
+            merge_into_bigquery(processed, ingestion_dt)
+        else:
             # 5. Check for existing keys in BigQuery
-            existing_keys_in_bq = check_existing_keys_in_bigquery(processed_df)
+            existing_keys_in_bq = check_existing_keys_in_bigquery(
+                processed.select(["job_id", "ingestionDate"]).to_pandas(date_as_object=False)
+            )
 
             # 6. Filter out duplicates
-            df_to_load = filter_out_duplicates(processed_df, existing_keys_in_bq)
+            df_to_load = filter_out_duplicates(processed, existing_keys_in_bq)
 
             # 7. Load new data to BigQuery
             load_to_bigquery(df_to_load)
-        else:
-            logging.info("Processed DataFrame is empty after transformation. Nothing to load.")
 
         logging.info("LinkedIn data processing pipeline finished successfully.")
 
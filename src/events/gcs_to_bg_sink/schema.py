@@ -0,0 +1,127 @@
+"""
+Schema of the LinkedIn staging table, declared once for BigQuery and Arrow.
+
+LINKEDIN_JOBS_SCHEMA is the BigQuery schema (see staging.sql) and
+LINKEDIN_JOBS_ARROW_SCHEMA is derived from it, so the two cannot drift.
+conform_to_schema turns the raw Parquet table written by the parser into
+exactly that Arrow schema in one columnar pass: missing values stay null
+(instead of becoming the string "None"), dictionary columns are decoded,
+timestamps are brought to microseconds in UTC and ingestionDate is filled in.
+"""
+
+import logging
+from datetime import date
+
+import pandas as pd
+import pyarrow as pa
+from google.cloud import bigquery
+
+LINKEDIN_JOBS_SCHEMA = [
+    bigquery.SchemaField("job_id", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("job_title", "STRING"),
+    bigquery.SchemaField("company_name", "STRING"),
+    bigquery.SchemaField("location", "STRING"),
+    bigquery.SchemaField("employment_type", "STRING"),
+    bigquery.SchemaField("experience_level", "STRING"),
+    bigquery.SchemaField("workplace_type", "STRING"),
+    bigquery.SchemaField("applicant_count", "STRING"), # Keep as STRING if inconsistent numbers/text
+    bigquery.SchemaField("reposted_info", "STRING"),
+    bigquery.SchemaField("skills_summary", "STRING"),
+    bigquery.SchemaField("application_type", "STRING"),
+    bigquery.SchemaField("job_description", "STRING"),
+    bigquery.SchemaField("job_link", "STRING"),
+    bigquery.SchemaField("company_logo_url", "STRING"),
+    bigquery.SchemaField("source_file", "STRING"),
+    bigquery.SchemaField("ingestionDate", "DATE", mode="REQUIRED"), # Define as DATE
+    # Typed columns from the parser's normalization stage
+    bigquery.SchemaField("captured_at", "TIMESTAMP"),
+    bigquery.SchemaField("applicant_count_num", "INT64"),
+    bigquery.SchemaField("applicant_count_bucket", "STRING"),
+    bigquery.SchemaField("is_reposted", "BOOL"),
+    bigquery.SchemaField("posted_at", "TIMESTAMP"),
+    bigquery.SchemaField("reposted_at", "TIMESTAMP"),
+    bigquery.SchemaField("workplace_type_code", "STRING"),
+    bigquery.SchemaField("employment_type_code", "STRING"),
+    bigquery.SchemaField("experience_level_code", "STRING")
+]
+
+# BigQuery type -> Arrow type written to Parquet for load jobs
+BQ_TO_ARROW_TYPES = {
+    "STRING": pa.string(),
+    "DATE": pa.date32(),
+    "TIMESTAMP": pa.timestamp("us", tz="UTC"),
+    "INT64": pa.int64(),
+    "BOOL": pa.bool_(),
+}
+
+# Columns added by the parser's normalization stage; files written before it simply lack them
+TYPED_COLUMNS = {
+    "captured_at", "applicant_count_num", "applicant_count_bucket", "is_reposted", "posted_at",
+    "reposted_at", "workplace_type_code", "employment_type_code", "experience_level_code",
+}
+
+LINKEDIN_JOBS_ARROW_SCHEMA = pa.schema([
+    pa.field(field.name, BQ_TO_ARROW_TYPES[field.field_type], nullable=field.mode != "REQUIRED")
+    for field in LINKEDIN_JOBS_SCHEMA
+])
+
+# pandas dtypes that keep nulls when a conformed table is turned into a DataFrame
+PANDAS_TYPES = {
+    pa.string(): pd.StringDtype(),
+    pa.int64(): pd.Int64Dtype(),
+    pa.bool_(): pd.BooleanDtype(),
+}
+
+
+def _conform_column(column: pa.ChunkedArray, target: pa.DataType, name: str) -> pa.ChunkedArray:
+    """Cast one raw column to its target type, keeping nulls as nulls."""
+    if pa.types.is_dictionary(column.type):
+        column = column.cast(column.type.value_type)
+    if column.type == target:
+        return column
+    if pa.types.is_null(column.type):
+        return pa.chunked_array([pa.nulls(len(column), target)])
+    if pa.types.is_timestamp(target) and not pa.types.is_timestamp(column.type):
+        # Strings or other encodings of a timestamp: unparseable values become null, as before
+        parsed = pd.to_datetime(column.to_pandas(), utc=True, errors='coerce')
+        return pa.chunked_array([pa.Array.from_pandas(parsed).cast(target)])
+    try:
+        return column.cast(target)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+        raise ValueError(f"Column '{name}' ({column.type}) cannot be converted to {target}: {e}") from e
+
+
+def conform_to_schema(table: pa.Table, ingestion_date: date) -> pa.Table:
+    """
+    Turn a raw parser table into LINKEDIN_JOBS_ARROW_SCHEMA.
+
+    Args:
+        table: Table read from the daily Parquet file (extra columns are ignored)
+        ingestion_date: Date extracted from the filename, written to every row
+
+    Returns:
+        Table with exactly the staging columns, in schema order
+    """
+    columns = []
+    for field in LINKEDIN_JOBS_ARROW_SCHEMA:
+        if field.name == "ingestionDate":
+            columns.append(pa.chunked_array([pa.repeat(pa.scalar(ingestion_date, field.type), table.num_rows)]))
+        elif field.name in table.column_names:
+            columns.append(_conform_column(table.column(field.name), field.type, field.name))
+        else:
+            if field.name not in TYPED_COLUMNS:
+                logging.warning(f"Source table missing column '{field.name}'. It will be added with null values.")
+            columns.append(pa.chunked_array([pa.nulls(table.num_rows, field.type)]))
+
+    null_job_ids = columns[LINKEDIN_JOBS_ARROW_SCHEMA.get_field_index("job_id")].null_count
+    if null_job_ids:
+        logging.warning(f"Found {null_job_ids} rows with null job_id. These might cause issues if job_id is NOT NULL in BigQuery.")
+
+    # Nullability is checked by BigQuery on load; the Arrow fields stay nullable so the cast never fails here
+    schema = pa.schema([f.with_nullable(True) for f in LINKEDIN_JOBS_ARROW_SCHEMA])
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def to_pandas(table: pa.Table) -> pd.DataFrame:
+    """Conformed table -> DataFrame with nullable dtypes (strings stay <NA>, not "None")."""
+    return table.to_pandas(types_mapper=PANDAS_TYPES.get, date_as_object=False)
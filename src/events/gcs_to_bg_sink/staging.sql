@@ -18,7 +18,17 @@ CREATE TABLE IF NOT EXISTS `your_project.your_dataset.linkedin_jobs_staging`
   job_link            STRING    OPTIONS(description="URL link to the original job posting."),
   company_logo_url    STRING    OPTIONS(description="URL of the company's logo image."),
   source_file         STRING    OPTIONS(description="Name of the source file from which this record was ingested."),
-  ingestionDate       DATE      NOT NULL OPTIONS(description="Date when the data was ingested into the staging table, derived from the source filename.")
+  ingestionDate       DATE      NOT NULL OPTIONS(description="Date when the data was ingested into the staging table, derived from the source filename."),
+  -- Typed columns derived by the parser's normalization stage
+  captured_at            TIMESTAMP OPTIONS(description="When the job page was captured by the scraper."),
+  applicant_count_num    INT64     OPTIONS(description="Numeric applicant count (lower bound for 'Over N'; NULL for 'Be among the first N')."),
+  applicant_count_bucket STRING    OPTIONS(description="Applicant count bucket: 0-25, 25-50, 50-100, 100+."),
+  is_reposted            BOOL      OPTIONS(description="Whether the listing was reposted."),
+  posted_at              TIMESTAMP OPTIONS(description="Original posting time, derived from the relative age and capture time."),
+  reposted_at            TIMESTAMP OPTIONS(description="Repost time, derived from the relative age and capture time."),
+  workplace_type_code    STRING    OPTIONS(description="Workplace enum: on_site, hybrid, remote."),
+  employment_type_code   STRING    OPTIONS(description="Employment enum: full_time, part_time, contract, temporary, internship, volunteer, other."),
+  experience_level_code  STRING    OPTIONS(description="Experience enum: internship, entry_level, associate, mid_senior_level, director, executive.")
 )
 PARTITION BY
   ingestionDate
@@ -31,4 +41,17 @@ OPTIONS (
 
 -- Optional: Add Primary Key constraint if supported and desired (informational only in BQ)
 -- ALTER TABLE `your_project.your_dataset.linkedin_jobs_staging`
--- ADD PRIMARY KEY (job_id, ingestionDate) NOT ENFORCED;
\ No newline at end of file
+-- ADD PRIMARY KEY (job_id, ingestionDate) NOT ENFORCED;
+
+-- Migration for tables created before the typed columns existed
+-- (the sink's ensure_target_columns also adds them before its first MERGE or partition write)
+-- ALTER TABLE `your_project.your_dataset.linkedin_jobs_staging`
+--   ADD COLUMN IF NOT EXISTS captured_at TIMESTAMP,
+--   ADD COLUMN IF NOT EXISTS applicant_count_num INT64,
+--   ADD COLUMN IF NOT EXISTS applicant_count_bucket STRING,
+--   ADD COLUMN IF NOT EXISTS is_reposted BOOL,
+--   ADD COLUMN IF NOT EXISTS posted_at TIMESTAMP,
+--   ADD COLUMN IF NOT EXISTS reposted_at TIMESTAMP,
+--   ADD COLUMN IF NOT EXISTS workplace_type_code STRING,
+--   ADD COLUMN IF NOT EXISTS employment_type_code STRING,
+--   ADD COLUMN IF NOT EXISTS experience_level_code STRING;
\ No newline at end of file
@@ -0,0 +1,269 @@
+# tests/conftest.py
+"""
+In-memory stand-ins for the GCS and BigQuery clients the sink talks to.
+
+FakeStorageClient honours prefix, match_glob and start_offset like GCS and
+counts the blobs it returns; FakeBigQueryClient records every job with its
+config so tests can assert on the exact sequence a load runs.
+"""
+
+import fnmatch
+import io
+import re
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from google.cloud.exceptions import NotFound, PreconditionFailed
+
+# The sink modules use flat imports (import gcs_to_bq), so put their directory on sys.path
+SINK_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SINK_DIR))
+
+import gcs_to_bq  # noqa: E402
+from schema import LINKEDIN_JOBS_SCHEMA  # noqa: E402
+
+PROJECT = "test-project"
+DATASET = "jobs"
+TABLE = "linkedin_jobs_staging"
+TARGET_TABLE_ID = f"{PROJECT}.{DATASET}.{TABLE}"
+# The staging columns that existed before the parser's typed columns were added
+ORIGINAL_COLUMNS = 16
+
+
+# --- Storage ---
+
+class FakeBlob:
+    def __init__(self, client: "FakeStorageClient", bucket: "FakeBucket", name: str):
+        self._client = client
+        self.bucket = bucket
+        self.name = name
+        self.generation: Optional[int] = None
+
+    def _stored(self) -> Tuple[bytes, int]:
+        try:
+            return self._client.objects[(self.bucket.name, self.name)]
+        except KeyError:
+            raise NotFound(f"gs://{self.bucket.name}/{self.name}")
+
+    def reload(self) -> None:
+        self.generation = self._stored()[1]
+
+    def exists(self) -> bool:
+        return (self.bucket.name, self.name) in self._client.objects
+
+    def download_as_bytes(self, if_generation_match: Optional[int] = None) -> bytes:
+        data, generation = self._stored()
+        if if_generation_match is not None and if_generation_match != generation:
+            raise PreconditionFailed(f"gs://{self.bucket.name}/{self.name} is at generation {generation}")
+        # GCS reports the generation of the bytes in the response headers
+        self.generation = generation
+        return data
+
+    def download_as_text(self, if_generation_match: Optional[int] = None) -> str:
+        return self.download_as_bytes(if_generation_match).decode("utf-8")
+
+    def upload_from_string(self, data, content_type: Optional[str] = None,
+                           if_generation_match: Optional[int] = None, **kwargs) -> None:
+        current = self._client.objects.get((self.bucket.name, self.name))
+        if if_generation_match is not None and if_generation_match != (current[1] if current else 0):
+            raise PreconditionFailed(f"gs://{self.bucket.name}/{self.name} changed")
+        self._client.put(self.bucket.name, self.name, data)
+        self.generation = self._client.objects[(self.bucket.name, self.name)][1]
+
+    def open(self, mode: str = "rb", **kwargs):
+        assert mode == "rb"
+        return io.BytesIO(self.download_as_bytes())
+
+
+class FakeBucket:
+    def __init__(self, client: "FakeStorageClient", name: str):
+        self.client = client
+        self.name = name
+
+    def blob(self, name: str) -> FakeBlob:
+        return FakeBlob(self.client, self, name)
+
+
+class FakeStorageClient:
+    def __init__(self):
+        self.objects: Dict[Tuple[str, str], Tuple[bytes, int]] = {}
+        self._generation = 1000
+        self.blobs_listed = 0
+        self.list_calls: List[Dict] = []
+
+    def put(self, bucket_name: str, name: str, data) -> None:
+        self._generation += 1
+        data = data.encode("utf-8") if isinstance(data, str) else data
+        self.objects[(bucket_name, name)] = (data, self._generation)
+
+    def bucket(self, name: str) -> FakeBucket:
+        return FakeBucket(self, name)
+
+    def list_blobs(self, bucket_or_name, prefix: Optional[str] = None, match_glob: Optional[str] = None,
+                   start_offset: Optional[str] = None, page_size: Optional[int] = None):
+        bucket_name = getattr(bucket_or_name, "name", bucket_or_name)
+        self.list_calls.append({"prefix": prefix, "match_glob": match_glob, "start_offset": start_offset})
+        # In GCS globs, * does not cross a /
+        glob_regex = re.compile(fnmatch.translate(match_glob).replace(".*", "[^/]*")) if match_glob else None
+        for (bucket, name), (_, generation) in sorted(self.objects.items()):
+            if bucket != bucket_name or (prefix and not name.startswith(prefix)):
+                continue
+            if start_offset and name < start_offset:
+                continue
+            if glob_regex and not glob_regex.match(name):
+                continue
+            self.blobs_listed += 1
+            blob = FakeBlob(self, FakeBucket(self, bucket), name)
+            blob.generation = generation
+            yield blob
+
+
+# --- BigQuery ---
+
+class FakeJob:
+    def __init__(self, kind: str, destination: Optional[str], job_config, sql: Optional[str] = None,
+                 output_rows: Optional[int] = None, num_dml_affected_rows: Optional[int] = None,
+                 result_table: Optional[pa.Table] = None, error: Optional[Exception] = None):
+        self.kind = kind
+        self.destination = destination
+        self.job_config = job_config
+        self.sql = sql
+        self.job_id = f"job_{kind}"
+        self.output_rows = output_rows
+        self.num_dml_affected_rows = num_dml_affected_rows
+        self.total_bytes_processed = 1024 * 1024
+        self.total_bytes_billed = 10 * 1024 * 1024
+        self.cache_hit = False
+        self.errors = None
+        self._result_table = result_table
+        self._error = error
+
+    def result(self):
+        if self._error:
+            raise self._error
+        return self
+
+    def to_arrow(self) -> pa.Table:
+        self.result()
+        return self._result_table
+
+
+class FakeBigQueryClient:
+    def __init__(self, target_schema=None):
+        self.project = PROJECT
+        self.tables: Dict[str, SimpleNamespace] = {
+            TARGET_TABLE_ID: SimpleNamespace(table_id=TARGET_TABLE_ID, schema=list(target_schema or LINKEDIN_JOBS_SCHEMA),
+                                             num_rows=0, expires=None, labels={}),
+        }
+        self.jobs: List[FakeJob] = []
+        self.calls: List[Tuple] = []
+        # Knobs for the next jobs
+        self.dml_affected_rows = 0
+        self.query_result: Optional[pa.Table] = None
+        self.query_error: Optional[Exception] = None
+        self.delete_error: Optional[Exception] = None
+        # Schema BigQuery would infer when loading a Parquet file from a URI
+        self.uri_schema: List = []
+
+    @property
+    def created_tables(self) -> List[SimpleNamespace]:
+        return [args[0] for name, *args in self.calls if name == "create_table"]
+
+    @property
+    def deleted_tables(self) -> List[str]:
+        return [args[0] for name, *args in self.calls if name == "delete_table"]
+
+    def _table(self, table_id: str) -> SimpleNamespace:
+        base_id = table_id.split("$")[0]
+        if base_id not in self.tables:
+            raise NotFound(table_id)
+        return self.tables[base_id]
+
+    def create_table(self, table):
+        self.calls.append(("create_table", table))
+        table_id = f"{table.project}.{table.dataset_id}.{table.table_id}"
+        self.tables[table_id] = SimpleNamespace(table_id=table_id, schema=list(table.schema or []), num_rows=0,
+                                                expires=table.expires, labels=dict(table.labels or {}))
+        return table
+
+    def delete_table(self, table_id: str, not_found_ok: bool = False):
+        self.calls.append(("delete_table", table_id))
+        if self.delete_error:
+            raise self.delete_error
+        self.tables.pop(table_id, None)
+
+    def get_table(self, table_id: str):
+        self.calls.append(("get_table", table_id))
+        table = self._table(table_id)
+        return SimpleNamespace(table_id=table_id, schema=list(table.schema), num_rows=table.num_rows,
+                               expires=table.expires, labels=table.labels)
+
+    def update_table(self, table, fields: List[str]):
+        self.calls.append(("update_table", table.table_id, list(fields)))
+        stored = self._table(table.table_id)
+        for field in fields:
+            setattr(stored, field, list(getattr(table, field)) if field == "schema" else getattr(table, field))
+        return table
+
+    def _load(self, kind: str, destination: str, job_config, rows: int) -> FakeJob:
+        job = FakeJob(kind, destination, job_config, output_rows=rows)
+        self.jobs.append(job)
+        self.calls.append((kind, destination))
+        return job
+
+    def load_table_from_file(self, buffer, destination: str, job_config=None, rewind: bool = False):
+        if rewind:
+            buffer.seek(0)
+        return self._load("load_file", destination, job_config, pq.read_table(buffer).num_rows)
+
+    def load_table_from_dataframe(self, df, destination: str, job_config=None):
+        return self._load("load_dataframe", destination, job_config, len(df))
+
+    def load_table_from_uri(self, uri: str, destination: str, job_config=None):
+        job = self._load("load_uri", destination, job_config, None)
+        job.uri = uri
+        self._table(destination).schema = list(self.uri_schema)
+        return job
+
+    def query(self, sql: str, job_config=None):
+        job = FakeJob("query", None, job_config, sql=sql, num_dml_affected_rows=self.dml_affected_rows,
+                      result_table=self.query_result, error=self.query_error)
+        self.jobs.append(job)
+        self.calls.append(("query",))
+        return job
+
+
+@pytest.fixture
+def sink_env(monkeypatch):
+    monkeypatch.setenv("LINKEDIN_BQ_PROJECT_ID", PROJECT)
+    monkeypatch.setenv("LINKEDIN_BQ_DATASET_ID", DATASET)
+    monkeypatch.setenv("LINKEDIN_BQ_TABLE_ID", TABLE)
+    monkeypatch.delenv("LINKEDIN_BQ_SCRATCH_DATASET_ID", raising=False)
+    monkeypatch.delenv("LINKEDIN_BQ_LEDGER_PATH", raising=False)
+    monkeypatch.delenv("LINKEDIN_GCS_LISTING_MARKER_PATH", raising=False)
+
+
+@pytest.fixture
+def bq(monkeypatch, sink_env) -> FakeBigQueryClient:
+    client = FakeBigQueryClient()
+    monkeypatch.setattr(gcs_to_bq, "get_bigquery_client", lambda: client)
+    monkeypatch.setattr(gcs_to_bq, "_ensured_tables", set())
+    return client
+
+
+@pytest.fixture
+def gcs(monkeypatch, sink_env) -> FakeStorageClient:
+    client = FakeStorageClient()
+    monkeypatch.setattr(gcs_to_bq, "get_storage_client", lambda: client)
+    return client
+
+
+def parquet_bytes(table: pa.Table) -> bytes:
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer)
+    return buffer.getvalue()
@@ -0,0 +1,152 @@
+# tests/test_backfill.py
+import time
+from datetime import date, timedelta
+
+import pyarrow as pa
+import pytest
+from google.cloud import bigquery
+
+import backfill
+import gcs_to_bq
+from backfill import PlannedLoad, RateLimiter
+from conftest import TARGET_TABLE_ID, parquet_bytes
+from schema import LINKEDIN_JOBS_SCHEMA
+
+DAY = date(2025, 7, 14)
+FILE_PATH = "gs://bucket/linkedin/linkedin_scrap_2025-07-14.parquet"
+
+
+def put_file(gcs, table: pa.Table) -> None:
+    gcs.put("bucket", "linkedin/linkedin_scrap_2025-07-14.parquet", parquet_bytes(table))
+
+
+def test_uri_partition_replace_is_one_transaction_on_the_table(bq, gcs):
+    put_file(gcs, pa.table({"job_id": ["1", "2"]}))
+    bq.uri_schema = [bigquery.SchemaField("job_id", "STRING")]
+
+    gcs_to_bq.replace_partition_from_uri(FILE_PATH, DAY)
+
+    load, script = bq.jobs
+    assert load.kind == "load_uri"
+    # DML into the table itself keeps its REQUIRED columns; a query destination would not
+    assert script.job_config.destination is None
+    assert script.job_config.write_disposition is None
+    [parameter] = script.job_config.query_parameters
+    assert (parameter.name, parameter.value) == ("ingestion_date", DAY)
+
+    statements = [" ".join(s.split()) for s in script.sql.split(";") if s.strip()]
+    assert statements[0] == "BEGIN TRANSACTION"
+    assert statements[1] == f"DELETE FROM `{TARGET_TABLE_ID}` WHERE ingestionDate = @ingestion_date"
+    column_list = ", ".join(f"`{field.name}`" for field in LINKEDIN_JOBS_SCHEMA)
+    assert statements[2].startswith(f"INSERT INTO `{TARGET_TABLE_ID}` ({column_list}) SELECT {column_list} FROM (")
+    assert "@ingestion_date AS `ingestionDate`" in statements[2]
+    assert statements[3] == "COMMIT TRANSACTION"
+    assert len(bq.deleted_tables) == 1
+
+
+def test_dataframe_partition_replace_loads_the_staging_schema_into_the_partition(bq, gcs):
+    put_file(gcs, pa.table({"job_id": ["1", None, "2", "1"], "job_title": ["a", "b", "c", "d"]}))
+
+    assert gcs_to_bq.replace_partition_from_dataframe(FILE_PATH, DAY) == 2
+
+    [load] = bq.jobs
+    assert (load.kind, load.destination) == ("load_file", f"{TARGET_TABLE_ID}$20250714")
+    config = load.job_config
+    assert config.schema == LINKEDIN_JOBS_SCHEMA
+    assert config.write_disposition == bigquery.WriteDisposition.WRITE_TRUNCATE
+    assert config.create_disposition == bigquery.CreateDisposition.CREATE_NEVER
+    assert config.time_partitioning.field == "ingestionDate"
+
+
+def test_date_range_plans_every_file_in_the_range(gcs):
+    for i in range(10):
+        gcs.put("bucket", f"linkedin/linkedin_scrap_{DAY + timedelta(days=i)}.parquet", b"x")
+    gcs.put("bucket", "linkedin/linkedin_scrap_broken.parquet", b"x")
+
+    planned = backfill.plan_date_range("bucket", "linkedin", DAY + timedelta(days=2), DAY + timedelta(days=4))
+
+    assert planned == [
+        PlannedLoad(f"gs://bucket/linkedin/linkedin_scrap_{DAY + timedelta(days=i)}.parquet", DAY + timedelta(days=i))
+        for i in (2, 3, 4)
+    ]
+    assert gcs.list_calls[-1]["start_offset"] == f"linkedin/linkedin_scrap_{DAY + timedelta(days=2)}"
+
+
+def test_explicit_files_take_their_date_from_the_name_or_the_suffix():
+    assert backfill.plan_files([FILE_PATH, "gs://bucket/export.parquet=2025-01-02"]) == [
+        PlannedLoad(FILE_PATH, DAY),
+        PlannedLoad("gs://bucket/export.parquet", date(2025, 1, 2)),
+    ]
+    with pytest.raises(ValueError, match="=YYYY-MM-DD"):
+        backfill.plan_files(["gs://bucket/export.parquet"])
+
+
+def test_two_files_for_one_partition_are_refused():
+    backfill._check_one_file_per_partition([PlannedLoad("a", DAY), PlannedLoad("b", DAY + timedelta(days=1))])
+    with pytest.raises(ValueError, match="both map to partition 2025-07-14"):
+        backfill._check_one_file_per_partition([PlannedLoad("a", DAY), PlannedLoad("b", DAY)])
+
+
+def test_rate_limiter_spaces_out_starts():
+    limiter = RateLimiter(max_per_minute=3000)  # one start every 20 ms
+    started = time.monotonic()
+    for _ in range(6):
+        limiter.wait()
+    assert time.monotonic() - started >= 5 * 0.02
+
+    unlimited = RateLimiter(max_per_minute=0)
+    started = time.monotonic()
+    for _ in range(100):
+        unlimited.wait()
+    assert time.monotonic() - started < 0.05
+
+
+class FlakyReplace:
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self, file_path, ingestion_date):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return 42
+
+
+def run(monkeypatch, replace, max_attempts=3):
+    monkeypatch.setattr(gcs_to_bq, "replace_partition_from_uri", replace)
+    return backfill.run_load(PlannedLoad(FILE_PATH, DAY), "uri", RateLimiter(0), max_attempts, base_delay=0)
+
+
+def test_transient_failures_are_retried(monkeypatch):
+    replace = FlakyReplace([RuntimeError("backend error"), RuntimeError("rate limited")])
+    outcome = run(monkeypatch, replace)
+    assert (outcome.status, outcome.rows, outcome.attempts, replace.calls) == ("loaded", 42, 3, 3)
+
+
+def test_validation_errors_are_not_retried(monkeypatch):
+    replace = FlakyReplace([ValueError("no job_id column")])
+    outcome = run(monkeypatch, replace)
+    assert (outcome.status, outcome.attempts, outcome.error, replace.calls) == ("failed", 1, "no job_id column", 1)
+
+
+def test_retries_stop_after_max_attempts(monkeypatch):
+    replace = FlakyReplace([RuntimeError("down")] * 5)
+    outcome = run(monkeypatch, replace, max_attempts=2)
+    assert (outcome.status, outcome.attempts, replace.calls) == ("failed", 2, 2)
+
+
+def test_backfill_report_counts_loaded_and_failed_files(monkeypatch):
+    def replace(file_path, ingestion_date):
+        if ingestion_date == DAY:
+            raise ValueError("bad footer")
+        return 10
+
+    monkeypatch.setattr(gcs_to_bq, "replace_partition_from_dataframe", replace)
+    planned = [PlannedLoad(f"gs://bucket/f{i}.parquet", DAY + timedelta(days=i)) for i in range(4)]
+
+    report = backfill.run_backfill(planned, source="dataframe", workers=2, max_loads_per_minute=0, base_delay=0)
+
+    assert (report["files_planned"], report["files_loaded"], report["files_failed"], report["rows"]) == (4, 3, 1, 30)
+    assert report["failures"] == [{"file_path": "gs://bucket/f0.parquet", "error": "bad footer"}]
+    assert [o["ingestion_date"] for o in report["outcomes"]] == [(DAY + timedelta(days=i)).isoformat() for i in range(4)]
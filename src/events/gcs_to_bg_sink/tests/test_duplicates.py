@@ -0,0 +1,82 @@
+# tests/test_duplicates.py
+from datetime import date
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+from google.cloud import bigquery
+
+import gcs_to_bq
+from schema import conform_to_schema, to_pandas
+
+DAY = date(2025, 7, 14)
+NEXT_DAY = date(2025, 7, 15)
+
+
+def staged(job_ids, ingestion_date=DAY) -> pa.Table:
+    return conform_to_schema(pa.table({"job_id": job_ids, "job_title": [f"t{j}" for j in job_ids]}),
+                             ingestion_date)
+
+
+def existing(*keys) -> pa.Table:
+    return pa.table({"job_id": pa.array([k[0] for k in keys], pa.string()),
+                     "ingestionDate": pa.array([k[1] for k in keys], pa.date32())})
+
+
+@pytest.mark.parametrize("as_frame", [False, True])
+def test_existing_keys_are_removed_and_row_order_is_kept(as_frame):
+    data = staged(["5", "1", "4", "2", "3"])
+    data = to_pandas(data) if as_frame else data
+
+    result = gcs_to_bq.filter_out_duplicates(data, existing(("4", DAY), ("1", DAY)))
+
+    job_ids = list(result["job_id"]) if as_frame else result.column("job_id").to_pylist()
+    assert job_ids == ["5", "2", "3"]
+    assert type(result) is type(data)
+
+
+def test_keys_only_match_on_the_same_ingestion_date():
+    result = gcs_to_bq.filter_out_duplicates(staged(["1", "2"]), existing(("1", NEXT_DAY), ("2", DAY)))
+    assert result.column("job_id").to_pylist() == ["1"]
+
+
+@pytest.mark.parametrize("keys", [
+    [("1", DAY)],
+    pd.DataFrame({"job_id": ["1"], "ingestionDate": pd.to_datetime([DAY])}),
+])
+def test_existing_keys_may_come_as_tuples_or_a_frame(keys):
+    assert gcs_to_bq.filter_out_duplicates(staged(["1", "2"]), keys).column("job_id").to_pylist() == ["2"]
+
+
+def test_frame_keys_are_compared_as_strings_and_days():
+    frame = pd.DataFrame({"job_id": [1, 2], "ingestionDate": ["2025-07-14 08:30", "not a date"]})
+    result = gcs_to_bq.filter_out_duplicates(frame, [("1", DAY), ("2", DAY)])
+    # job 1 matches at day granularity; the unparseable date never matches and is kept
+    assert list(result["job_id"]) == [2]
+
+
+def test_nothing_to_compare_returns_the_input_unchanged():
+    data = staged(["1"])
+    assert gcs_to_bq.filter_out_duplicates(data, existing()) is data
+    empty = staged([])
+    assert gcs_to_bq.filter_out_duplicates(empty, existing(("1", DAY))) is empty
+
+
+def test_existing_key_lookup_reads_only_the_batch_partitions(bq):
+    bq.query_result = pa.table({"job_id": ["2"], "ingestionDate": pa.array([DAY], pa.date32())})
+    frame = to_pandas(staged(["1", "2", "2"]))
+
+    keys = gcs_to_bq.check_existing_keys_in_bigquery(frame)
+
+    assert keys.to_pylist() == [{"job_id": "2", "ingestionDate": DAY}]
+    load, query = bq.jobs
+    assert load.kind == "load_dataframe"
+    assert load.output_rows == 2  # unique keys only
+    assert "WHERE t.ingestionDate IN UNNEST(@dates)" in query.sql
+    [parameter] = query.job_config.query_parameters
+    assert isinstance(parameter, bigquery.ArrayQueryParameter)
+    assert (parameter.name, parameter.array_type, list(parameter.values)) == ("dates", "DATE", [DAY])
+    # The lookup table is scratch: created with an expiry and dropped again
+    [lookup] = bq.created_tables
+    assert lookup.table_id.startswith("_scratch_linkedin_lookup_") and lookup.expires is not None
+    assert bq.deleted_tables == [f"{lookup.project}.{lookup.dataset_id}.{lookup.table_id}"]
@@ -0,0 +1,113 @@
+# tests/test_gcp_clients.py
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from google.auth.credentials import AnonymousCredentials
+
+import gcs_to_bq  # noqa: F401  (puts src/events on sys.path)
+import gcp_clients
+
+CREDENTIAL_ENV = ["GOOGLE_APPLICATION_CREDENTIALS", "TYPE", "PROJECT_ID", "PRIVATE_KEY_ID", "PRIVATE_KEY",
+                  "CLIENT_EMAIL", "CLIENT_ID", "GCP_PROJECT_ID", "STORAGE_EMULATOR_HOST",
+                  "BIGQUERY_EMULATOR_HOST", "UNIVERSE_DOMAIN"]
+
+
+@pytest.fixture(scope="module")
+def private_key() -> str:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                             serialization.NoEncryption()).decode()
+
+
+@pytest.fixture(autouse=True)
+def clean_clients(monkeypatch):
+    for name in CREDENTIAL_ENV:
+        monkeypatch.delenv(name, raising=False)
+    gcp_clients.reset()
+    yield
+    gcp_clients.reset()
+
+
+@pytest.fixture
+def env_credentials(monkeypatch, private_key):
+    monkeypatch.setenv("PROJECT_ID", "env-project")
+    # .env files carry the key on one line with literal \n
+    monkeypatch.setenv("PRIVATE_KEY", private_key.replace("\n", "\\n"))
+    monkeypatch.setenv("CLIENT_EMAIL", "sink@env-project.iam.gserviceaccount.com")
+
+
+def test_credentials_are_built_once_with_the_cloud_platform_scope(env_credentials):
+    credentials = gcp_clients.get_credentials()
+    assert gcp_clients.get_credentials() is credentials
+    assert credentials.service_account_email == "sink@env-project.iam.gserviceaccount.com"
+    assert credentials.project_id == "env-project"
+    assert credentials.scopes == gcp_clients.CLOUD_PLATFORM_SCOPES
+
+
+def test_credentials_file_takes_precedence(env_credentials, monkeypatch, tmp_path, private_key):
+    creds_file = tmp_path / "sa.json"
+    creds_file.write_text(json.dumps({
+        "type": "service_account", "project_id": "file-project", "private_key": private_key,
+        "client_email": "sink@file-project.iam.gserviceaccount.com", "token_uri": "https://oauth2.googleapis.com/token",
+    }))
+    monkeypatch.setenv("GOOGLE_APPLICATION_CREDENTIALS", str(creds_file))
+
+    assert gcp_clients.get_credentials().project_id == "file-project"
+
+
+def test_missing_credential_fields_are_named():
+    with pytest.raises(ValueError, match="project_id, private_key, client_email"):
+        gcp_clients.get_credentials()
+
+
+def test_project_id_prefers_the_environment(env_credentials, monkeypatch):
+    assert gcp_clients.get_project_id("GCP_PROJECT_ID") == "env-project"
+    monkeypatch.setenv("GCP_PROJECT_ID", "other-project")
+    assert gcp_clients.get_project_id("GCP_PROJECT_ID") == "other-project"
+
+
+def test_clients_are_cached_per_project_and_share_one_session(env_credentials):
+    storage_client = gcp_clients.get_storage_client()
+    bigquery_client = gcp_clients.get_bigquery_client()
+
+    assert gcp_clients.get_storage_client() is storage_client
+    assert gcp_clients.get_storage_client("env-project") is storage_client
+    assert gcp_clients.get_bigquery_client() is bigquery_client
+    assert gcp_clients.get_storage_client("other-project") is not storage_client
+    assert storage_client.project == "env-project"
+
+    session = gcp_clients.get_http_session()
+    assert storage_client._http is session
+    assert bigquery_client._http is session
+    assert gcp_clients.get_storage_client("other-project")._http is session
+    assert session.credentials is gcp_clients.get_credentials()
+
+
+def test_concurrent_first_use_builds_one_client(env_credentials):
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        clients = list(executor.map(lambda _: gcp_clients.get_bigquery_client(), range(64)))
+    assert len({id(client) for client in clients}) == 1
+
+
+def test_reset_drops_every_cached_object(env_credentials):
+    credentials = gcp_clients.get_credentials()
+    client = gcp_clients.get_storage_client()
+
+    gcp_clients.reset()
+
+    assert gcp_clients.get_credentials() is not credentials
+    assert gcp_clients.get_storage_client() is not client
+
+
+def test_emulator_clients_need_no_credentials(monkeypatch):
+    monkeypatch.setenv("STORAGE_EMULATOR_HOST", "http://localhost:9023")
+
+    client = gcp_clients.get_storage_client()
+
+    assert isinstance(client._credentials, AnonymousCredentials)
+    assert client.project == "emulator"
+    assert gcp_clients.get_storage_client() is client
+    assert gcp_clients._credentials is None
@@ -0,0 +1,153 @@
+# tests/test_ledger.py
+import json
+from datetime import date
+
+import pytest
+from google.cloud.exceptions import PreconditionFailed
+
+import gcs_to_bq
+from conftest import FakeBlob
+
+LEDGER = "linkedin/_bq_load_ledger.json"
+
+
+def file_name(day: int) -> str:
+    return f"linkedin/linkedin_scrap_2025-07-{day:02d}.parquet"
+
+
+def stored_ledger(gcs) -> dict:
+    return json.loads(gcs.objects[("bucket", LEDGER)][0])
+
+
+def test_ledger_defaults_next_to_the_files(sink_env, monkeypatch):
+    assert gcs_to_bq.get_ledger_blob_name("linkedin/") == LEDGER
+    monkeypatch.setenv("LINKEDIN_BQ_LEDGER_PATH", "state/ledger.json")
+    assert gcs_to_bq.get_ledger_blob_name("linkedin") == "state/ledger.json"
+
+
+def test_missing_ledger_reads_as_empty(gcs):
+    assert gcs_to_bq.read_ledger("bucket", LEDGER) == ({"files": {}}, None)
+
+
+def test_ledger_generation_comes_from_the_download(gcs):
+    gcs.put("bucket", LEDGER, json.dumps({"files": {}, "watermark": None}))
+    ledger, generation = gcs_to_bq.read_ledger("bucket", LEDGER)
+    assert generation == gcs.objects[("bucket", LEDGER)][1]
+
+
+def test_ledger_without_a_generation_header_is_reread_at_the_reloaded_generation(gcs, monkeypatch):
+    download = FakeBlob.download_as_bytes
+
+    def download_without_header(blob, if_generation_match=None):
+        data = download(blob, if_generation_match)
+        if if_generation_match is None:
+            blob.generation = None
+        return data
+
+    monkeypatch.setattr(FakeBlob, "download_as_bytes", download_without_header)
+    gcs.put("bucket", LEDGER, json.dumps({"files": {"a": {"status": "loaded"}}}))
+
+    ledger, generation = gcs_to_bq.read_ledger("bucket", LEDGER)
+    assert ledger == {"files": {"a": {"status": "loaded"}}}
+    assert generation == gcs.objects[("bucket", LEDGER)][1]
+
+
+def test_outcomes_are_merged_and_counted(gcs):
+    gcs_to_bq.record_file_outcomes("bucket", LEDGER, {file_name(1): {"status": "failed", "generation": 7}})
+    gcs_to_bq.record_file_outcomes("bucket", LEDGER, {file_name(1): {"status": "loaded", "generation": 7},
+                                                      file_name(2): {"status": "loaded", "generation": 3}})
+
+    files = stored_ledger(gcs)["files"]
+    assert files[file_name(1)] == {"status": "loaded", "generation": 7, "attempts": 2}
+    assert files[file_name(2)] == {"status": "loaded", "generation": 3, "attempts": 1}
+
+
+def test_a_loaded_file_stays_loaded_when_a_retry_of_it_fails(gcs):
+    gcs_to_bq.record_file_outcomes("bucket", LEDGER, {file_name(1): {"status": "loaded", "generation": 7}})
+    gcs_to_bq.record_file_outcomes("bucket", LEDGER, {file_name(1): {"status": "failed", "generation": 7}})
+    assert stored_ledger(gcs)["files"][file_name(1)]["status"] == "loaded"
+
+    # A rewritten file (new generation) is a different file
+    gcs_to_bq.record_file_outcomes("bucket", LEDGER, {file_name(1): {"status": "failed", "generation": 8}})
+    assert stored_ledger(gcs)["files"][file_name(1)]["status"] == "failed"
+
+
+def test_concurrent_ledger_write_is_retried_without_losing_either_run(gcs, monkeypatch):
+    read_ledger = gcs_to_bq.read_ledger
+    reads = []
+
+    def read_then_lose_the_race(bucket_name, ledger_blob_name):
+        result = read_ledger(bucket_name, ledger_blob_name)
+        reads.append(result[1])
+        if len(reads) == 1:
+            # Another sink run writes its outcome after this run has read the ledger
+            gcs.put("bucket", LEDGER, json.dumps({"files": {file_name(2): {"status": "loaded"}}}))
+        return result
+
+    monkeypatch.setattr(gcs_to_bq, "read_ledger", read_then_lose_the_race)
+    gcs_to_bq.record_file_outcomes("bucket", LEDGER, {file_name(1): {"status": "loaded"}})
+
+    assert len(reads) == 2  # the first write failed its generation precondition (412) and was retried
+    assert set(stored_ledger(gcs)["files"]) == {file_name(1), file_name(2)}
+
+
+def test_ledger_write_gives_up_after_max_attempts(gcs, monkeypatch):
+    monkeypatch.setattr(gcs_to_bq, "read_ledger", lambda bucket_name, ledger_blob_name: ({"files": {}}, 1))
+    gcs.put("bucket", LEDGER, "{}")
+    with pytest.raises(PreconditionFailed):
+        gcs_to_bq.record_file_outcomes("bucket", LEDGER, {file_name(1): {"status": "loaded"}}, max_attempts=3)
+
+
+@pytest.mark.parametrize("statuses, start, expected", [
+    ({}, None, None),
+    ({1: "loaded", 2: "loaded", 3: "failed", 4: "loaded"}, None, 2),
+    ({1: "failed", 2: "loaded"}, None, None),
+    ({1: "failed", 2: "loaded", 3: "loaded"}, 1, 3),  # files before the watermark are not looked at again
+    ({3: "loaded"}, 5, 5),
+])
+def test_watermark_stops_at_the_first_file_not_loaded(statuses, start, expected):
+    ledger = {"files": {file_name(day): {"status": status} for day, status in statuses.items()},
+              "watermark": file_name(start) if start else None}
+    assert gcs_to_bq.advance_watermark(ledger) == (file_name(expected) if expected else None)
+    assert ledger["watermark"] == (file_name(expected) if expected else None)
+
+
+def test_watermark_is_only_advanced_on_request(gcs):
+    gcs_to_bq.record_file_outcomes("bucket", LEDGER, {file_name(1): {"status": "loaded"}})
+    assert "watermark" not in stored_ledger(gcs)
+    gcs_to_bq.record_file_outcomes("bucket", LEDGER, {file_name(2): {"status": "loaded"}}, update_watermark=True)
+    assert stored_ledger(gcs)["watermark"] == file_name(2)
+
+
+def test_unprocessed_files_skip_loaded_generations_and_start_at_the_watermark(gcs):
+    for day in range(1, 6):
+        gcs.put("bucket", file_name(day), b"parquet")
+    generation = {day: gcs.objects[("bucket", file_name(day))][1] for day in range(1, 6)}
+    ledger = {
+        "watermark": file_name(2),
+        "files": {
+            file_name(1): {"status": "loaded", "generation": generation[1]},
+            file_name(2): {"status": "loaded", "generation": generation[2]},
+            file_name(3): {"status": "loaded", "generation": generation[3]},
+            file_name(4): {"status": "loaded", "generation": generation[4] - 100},  # rewritten since
+            file_name(5): {"status": "failed", "generation": generation[5]},
+        },
+    }
+
+    pending = gcs_to_bq.find_unprocessed_files("bucket", "linkedin", ledger)
+
+    assert pending == [
+        (f"gs://bucket/{file_name(4)}", generation[4], date(2025, 7, 4)),
+        (f"gs://bucket/{file_name(5)}", generation[5], date(2025, 7, 5)),
+    ]
+    assert gcs.list_calls[-1]["start_offset"] == file_name(2)
+
+
+def test_since_bounds_the_listing_when_it_is_past_the_watermark(gcs):
+    for day in range(1, 4):
+        gcs.put("bucket", file_name(day), b"parquet")
+
+    pending = gcs_to_bq.find_unprocessed_files("bucket", "linkedin", {"files": {}}, since=date(2025, 7, 2))
+
+    assert [ingestion_date for _, _, ingestion_date in pending] == [date(2025, 7, 2), date(2025, 7, 3)]
+    assert gcs.list_calls[-1]["start_offset"] == "linkedin/linkedin_scrap_2025-07-02"
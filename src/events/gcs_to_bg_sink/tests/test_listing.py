@@ -0,0 +1,66 @@
+# tests/test_listing.py
+from datetime import date, timedelta
+
+import pytest
+
+import gcs_to_bq
+
+PREFIX = "linkedin"
+FIRST_DAY = date(2021, 1, 1)
+
+
+def daily_name(day: date) -> str:
+    return f"{PREFIX}/linkedin_scrap_{day.isoformat()}.parquet"
+
+
+@pytest.fixture
+def history(gcs):
+    """Three years of daily files plus unrelated objects under the same prefix."""
+    for i in range(3 * 365):
+        gcs.put("bucket", daily_name(FIRST_DAY + timedelta(days=i)), b"x")
+    for i in range(500):
+        gcs.put("bucket", f"{PREFIX}/raw/capture_{i:04d}.html", b"x")
+        gcs.put("bucket", f"{PREFIX}/linkedin_scrap_notes_{i:04d}.txt", b"x")
+    return gcs
+
+
+def test_listing_returns_only_daily_files_from_the_offset(history):
+    last = FIRST_DAY + timedelta(days=3 * 365 - 1)
+    blobs = gcs_to_bq.list_daily_files("bucket", PREFIX, start_offset=daily_name(last - timedelta(days=2)))
+    assert [blob.name for blob in blobs] == [daily_name(last - timedelta(days=i)) for i in (2, 1, 0)]
+
+
+def test_marker_bounds_the_listing_to_the_new_files(history):
+    last = FIRST_DAY + timedelta(days=3 * 365 - 1)
+
+    # First run: no marker, the whole history is listed once
+    assert gcs_to_bq.find_latest_file_in_gcs_by_name("bucket", PREFIX) == f"gs://bucket/{daily_name(last)}"
+    assert history.blobs_listed == 3 * 365
+    assert history.objects[("bucket", f"{PREFIX}/_latest_file_marker")][0].decode() == daily_name(last)
+
+    # Later runs list the marked file and the new ones, however long the history is
+    for new_days in (1, 5):
+        for i in range(1, new_days + 1):
+            history.put("bucket", daily_name(last + timedelta(days=i)), b"x")
+        last += timedelta(days=new_days)
+        history.blobs_listed = 0
+
+        assert gcs_to_bq.find_latest_file_in_gcs_by_name("bucket", PREFIX) == f"gs://bucket/{daily_name(last)}"
+        assert history.blobs_listed == new_days + 1
+
+
+def test_stale_marker_falls_back_to_a_full_listing(gcs):
+    for i in range(3):
+        gcs.put("bucket", daily_name(FIRST_DAY + timedelta(days=i)), b"x")
+    gcs.put("bucket", f"{PREFIX}/_latest_file_marker", daily_name(FIRST_DAY + timedelta(days=30)))
+
+    assert gcs_to_bq.find_latest_file_in_gcs_by_name("bucket", PREFIX) == \
+        f"gs://bucket/{daily_name(FIRST_DAY + timedelta(days=2))}"
+    assert [call["start_offset"] for call in gcs.list_calls] == [daily_name(FIRST_DAY + timedelta(days=30)), None]
+
+
+def test_listing_without_marker_leaves_no_marker(gcs):
+    gcs.put("bucket", daily_name(FIRST_DAY), b"x")
+    assert gcs_to_bq.find_latest_file_in_gcs_by_name("bucket", PREFIX, use_marker=False) == \
+        f"gs://bucket/{daily_name(FIRST_DAY)}"
+    assert ("bucket", f"{PREFIX}/_latest_file_marker") not in gcs.objects
@@ -0,0 +1,140 @@
+# tests/test_merge.py
+from datetime import date
+
+import pyarrow as pa
+import pytest
+from google.cloud import bigquery
+
+import gcs_to_bq
+from conftest import ORIGINAL_COLUMNS, TARGET_TABLE_ID, parquet_bytes
+from schema import LINKEDIN_JOBS_SCHEMA, conform_to_schema
+
+INGESTION_DATE = date(2025, 7, 14)
+
+
+def raw_jobs(job_ids):
+    return pa.table({
+        "job_id": job_ids,
+        "job_title": [f"Engineer {i}" for i in range(len(job_ids))],
+        "source_file": [f"page_{i}.html" for i in range(len(job_ids))],
+    })
+
+
+def test_merge_query_inserts_every_staging_column_and_prunes_the_target():
+    sql = gcs_to_bq.build_merge_query(TARGET_TABLE_ID, "p.d._scratch")
+
+    assert f"MERGE `{TARGET_TABLE_ID}` T" in sql
+    assert "FROM `p.d._scratch`" in sql
+    assert "ON T.ingestionDate = @ingestion_date" in sql
+    assert "WHEN NOT MATCHED THEN" in sql
+    assert "WHEN MATCHED" not in sql
+    insert_columns = sql.split("INSERT (")[1].split(")")[0]
+    assert insert_columns == ", ".join(f"`{field.name}`" for field in LINKEDIN_JOBS_SCHEMA)
+
+
+def test_merge_query_uses_source_expressions_when_given():
+    expressions = {field.name: f"CAST(NULL AS {field.field_type})" for field in LINKEDIN_JOBS_SCHEMA}
+    expressions["job_id"] = "job_id"
+    sql = gcs_to_bq.build_merge_query(TARGET_TABLE_ID, "p.d._scratch", expressions)
+
+    assert "SELECT *" not in sql.split("FROM `p.d._scratch`")[0].split("SELECT * FROM (")[1]
+    assert "job_id AS `job_id`" in sql
+    assert "CAST(NULL AS DATE) AS `ingestionDate`" in sql
+
+
+def test_scratch_table_lives_in_the_staging_dataset_unless_overridden(sink_env, monkeypatch):
+    first = gcs_to_bq.get_scratch_table_id(TARGET_TABLE_ID, "20250714")
+    second = gcs_to_bq.get_scratch_table_id(TARGET_TABLE_ID, "20250714")
+    assert first.startswith("test-project.jobs._scratch_linkedin_20250714_")
+    assert first != second
+
+    monkeypatch.setenv("LINKEDIN_BQ_SCRATCH_DATASET_ID", "scratch")
+    assert gcs_to_bq.get_scratch_table_id(TARGET_TABLE_ID, "x").startswith("test-project.scratch._scratch_linkedin_x_")
+
+
+def test_merge_stages_into_an_expiring_scratch_table_and_drops_it(bq):
+    bq.dml_affected_rows = 2
+    table = conform_to_schema(raw_jobs(["1", "2", "2"]), INGESTION_DATE)
+
+    assert gcs_to_bq.merge_into_bigquery(table, INGESTION_DATE) == 2
+
+    [scratch] = bq.created_tables
+    scratch_id = f"{scratch.project}.{scratch.dataset_id}.{scratch.table_id}"
+    assert scratch.expires is not None
+    assert scratch.labels == {"linkedin_sink": "scratch"}
+    assert [field.name for field in scratch.schema] == [field.name for field in LINKEDIN_JOBS_SCHEMA]
+
+    load, merge = bq.jobs
+    assert (load.kind, load.destination) == ("load_file", scratch_id)
+    assert load.job_config.write_disposition == bigquery.WriteDisposition.WRITE_TRUNCATE
+    assert load.output_rows == 3
+    assert merge.sql.lstrip().startswith(f"MERGE `{TARGET_TABLE_ID}`")
+    [parameter] = merge.job_config.query_parameters
+    assert (parameter.name, parameter.type_, parameter.value) == ("ingestion_date", "DATE", INGESTION_DATE)
+
+    assert bq.deleted_tables == [scratch_id]
+    assert scratch_id not in bq.tables
+
+
+def test_merge_drops_the_scratch_table_when_the_merge_fails(bq):
+    bq.query_error = RuntimeError("quota exceeded")
+
+    with pytest.raises(RuntimeError, match="quota exceeded"):
+        gcs_to_bq.merge_into_bigquery(conform_to_schema(raw_jobs(["1"]), INGESTION_DATE), INGESTION_DATE)
+
+    assert len(bq.deleted_tables) == 1
+    assert not [table_id for table_id in bq.tables if "_scratch_" in table_id]
+
+
+def test_merge_of_an_empty_frame_runs_no_jobs(bq):
+    empty = conform_to_schema(raw_jobs([]), INGESTION_DATE)
+    assert gcs_to_bq.merge_into_bigquery(empty, INGESTION_DATE) == 0
+    assert bq.calls == []
+
+
+def test_merge_adds_the_typed_columns_to_a_table_created_before_them(bq):
+    target = bq.tables[TARGET_TABLE_ID]
+    target.schema = target.schema[:ORIGINAL_COLUMNS]
+    assert "captured_at" not in {field.name for field in target.schema}
+
+    gcs_to_bq.merge_into_bigquery(conform_to_schema(raw_jobs(["1"]), INGESTION_DATE), INGESTION_DATE)
+
+    assert [field.name for field in target.schema] == [field.name for field in LINKEDIN_JOBS_SCHEMA]
+    added = target.schema[ORIGINAL_COLUMNS:]
+    assert {field.mode for field in added} == {"NULLABLE"}
+    # The columns exist before the MERGE that inserts into them runs
+    assert bq.calls.index(("update_table", TARGET_TABLE_ID, ["schema"])) < bq.calls.index(("query",))
+
+    # Checked once per table per process
+    gcs_to_bq.merge_into_bigquery(conform_to_schema(raw_jobs(["2"]), INGESTION_DATE), INGESTION_DATE)
+    assert [call for call in bq.calls if call[0] == "update_table"] == [("update_table", TARGET_TABLE_ID, ["schema"])]
+
+
+def test_merge_leaves_an_up_to_date_table_alone(bq):
+    gcs_to_bq.merge_into_bigquery(conform_to_schema(raw_jobs(["1"]), INGESTION_DATE), INGESTION_DATE)
+    assert not [call for call in bq.calls if call[0] == "update_table"]
+
+
+@pytest.mark.parametrize("load", [
+    gcs_to_bq.load_parquet_uri_to_bigquery,
+    gcs_to_bq.replace_partition_from_uri,
+    gcs_to_bq.replace_partition_from_dataframe,
+])
+def test_uri_and_partition_loads_add_the_typed_columns_first(bq, gcs, load):
+    target = bq.tables[TARGET_TABLE_ID]
+    target.schema = target.schema[:ORIGINAL_COLUMNS]
+    gcs.put("bucket", "linkedin/linkedin_scrap_2025-07-14.parquet", parquet_bytes(raw_jobs(["1", "2"])))
+    bq.uri_schema = [bigquery.SchemaField("job_id", "STRING"), bigquery.SchemaField("job_title", "STRING"),
+                     bigquery.SchemaField("source_file", "STRING")]
+
+    load("gs://bucket/linkedin/linkedin_scrap_2025-07-14.parquet", INGESTION_DATE)
+
+    assert [field.name for field in target.schema] == [field.name for field in LINKEDIN_JOBS_SCHEMA]
+    first_job = next(i for i, call in enumerate(bq.calls) if call[0] in ("query", "load_file", "load_uri"))
+    assert bq.calls.index(("update_table", TARGET_TABLE_ID, ["schema"])) < first_job
+
+
+def test_duplicate_keys_keep_the_latest_capture_deterministically():
+    sql = " ".join(gcs_to_bq.build_source_select("p.d._scratch").split())
+    assert ("ROW_NUMBER() OVER ( PARTITION BY job_id, ingestionDate "
+            "ORDER BY captured_at DESC NULLS LAST, source_file ) = 1") in sql
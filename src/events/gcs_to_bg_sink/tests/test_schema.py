@@ -0,0 +1,90 @@
+# tests/test_schema.py
+from datetime import date, datetime, timezone
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+import gcs_to_bq
+from schema import LINKEDIN_JOBS_ARROW_SCHEMA, LINKEDIN_JOBS_SCHEMA, conform_to_schema, to_pandas
+
+DAY = date(2025, 7, 14)
+
+
+def test_conformed_table_has_exactly_the_staging_columns():
+    table = conform_to_schema(pa.table({"job_id": ["1", "2"], "extra": [1, 2]}), DAY)
+
+    assert table.schema.names == [field.name for field in LINKEDIN_JOBS_SCHEMA]
+    assert [field.type for field in table.schema] == [field.type for field in LINKEDIN_JOBS_ARROW_SCHEMA]
+    assert table.column("ingestionDate").to_pylist() == [DAY, DAY]
+    # Columns the file does not have are all null, not empty strings
+    assert table.column("job_description").null_count == 2
+    assert table.column("applicant_count_num").null_count == 2
+
+
+def test_missing_values_stay_null_instead_of_becoming_none_strings():
+    raw = pa.Table.from_pandas(pd.DataFrame({
+        "job_id": ["1", "2", "3"],
+        "job_title": ["Engineer", None, float("nan")],
+        "company_name": pa.array([None, None, None]).to_pandas(),
+    }), preserve_index=False)
+
+    table = conform_to_schema(raw, DAY)
+
+    assert table.column("job_title").to_pylist() == ["Engineer", None, None]
+    assert table.column("company_name").to_pylist() == [None, None, None]
+    assert "None" not in table.column("job_title").to_pylist()
+
+
+def test_dictionary_and_narrow_columns_are_decoded_and_widened():
+    raw = pa.table({
+        "job_id": ["1", "2"],
+        "workplace_type_code": pa.array(["remote", None]).dictionary_encode(),
+        "applicant_count_num": pa.array([25, None], pa.int32()),
+        "is_reposted": pa.array([None, True]),
+    })
+
+    table = conform_to_schema(raw, DAY)
+
+    assert table.column("workplace_type_code").type == pa.string()
+    assert table.column("workplace_type_code").to_pylist() == ["remote", None]
+    assert table.column("applicant_count_num").to_pylist() == [25, None]
+    assert table.column("is_reposted").to_pylist() == [None, True]
+
+
+def test_timestamps_become_utc_microseconds_and_bad_strings_become_null():
+    raw = pa.table({
+        "job_id": ["1", "2", "3"],
+        "captured_at": pa.array([0, None, 1_000_000_000], pa.timestamp("ns", tz="Europe/Paris")),
+        "posted_at": ["2025-07-13T10:00:00+02:00", "not a date", None],
+    })
+
+    table = conform_to_schema(raw, DAY)
+
+    assert table.column("captured_at").type == pa.timestamp("us", tz="UTC")
+    assert table.column("captured_at").to_pylist() == [
+        datetime(1970, 1, 1, tzinfo=timezone.utc), None, datetime(1970, 1, 1, 0, 0, 1, tzinfo=timezone.utc)]
+    assert table.column("posted_at").to_pylist() == [datetime(2025, 7, 13, 8, tzinfo=timezone.utc), None, None]
+
+
+def test_null_job_ids_are_kept_and_reported(caplog):
+    table = conform_to_schema(pa.table({"job_id": ["1", None]}), DAY)
+    assert table.column("job_id").to_pylist() == ["1", None]
+    assert "1 rows with null job_id" in caplog.text
+
+
+def test_unconvertible_column_names_the_column():
+    with pytest.raises(ValueError, match="Column 'applicant_count_num'"):
+        conform_to_schema(pa.table({"job_id": ["1"], "applicant_count_num": ["many"]}), DAY)
+
+
+def test_dataframes_keep_nulls_as_na():
+    frame = gcs_to_bq.process_linkedin_job_data(
+        pd.DataFrame({"job_id": ["1", "2"], "job_title": ["Engineer", None], "is_reposted": [True, None]}), DAY)
+
+    assert frame["job_title"].dtype == pd.StringDtype()
+    assert frame["job_title"].isna().tolist() == [False, True]
+    assert frame["is_reposted"].dtype == pd.BooleanDtype()
+    assert frame["applicant_count_num"].dtype == pd.Int64Dtype()
+    assert (frame["ingestionDate"].dt.date == DAY).all()
+    assert to_pandas(conform_to_schema(pa.table({"job_id": ["1"]}), DAY))["job_title"].isna().all()
@@ -0,0 +1,54 @@
+# tests/test_scratch_table.py
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from google.cloud import bigquery
+
+import gcs_to_bq
+from conftest import TARGET_TABLE_ID
+
+
+def test_scratch_table_is_unique_expiring_and_dropped(bq):
+    schema = [bigquery.SchemaField("job_id", "STRING")]
+    with gcs_to_bq.scratch_table(bq, TARGET_TABLE_ID, "20250714", schema=schema) as scratch_id:
+        assert scratch_id in bq.tables
+        [created] = bq.created_tables
+        assert created.schema == schema
+        assert created.labels == {"linkedin_sink": "scratch"}
+        ttl = created.expires - datetime.now(timezone.utc)
+        assert timedelta(hours=5, minutes=59) < ttl <= timedelta(hours=6)
+
+    assert bq.deleted_tables == [scratch_id]
+    assert scratch_id not in bq.tables
+
+
+def test_scratch_ttl_is_configurable(monkeypatch):
+    monkeypatch.setenv("LINKEDIN_BQ_SCRATCH_TTL_HOURS", "1")
+    ttl = gcs_to_bq.scratch_table_expiration() - datetime.now(timezone.utc)
+    assert timedelta(minutes=59) < ttl <= timedelta(hours=1)
+
+
+def test_scratch_table_is_dropped_when_the_body_fails(bq):
+    with pytest.raises(RuntimeError):
+        with gcs_to_bq.scratch_table(bq, TARGET_TABLE_ID, "x") as scratch_id:
+            raise RuntimeError("load failed")
+    assert bq.deleted_tables == [scratch_id]
+
+
+def test_failed_drop_only_warns(bq, caplog):
+    bq.delete_error = RuntimeError("permission denied")
+    with gcs_to_bq.scratch_table(bq, TARGET_TABLE_ID, "x") as scratch_id:
+        pass
+    assert f"Could not delete scratch table {scratch_id}" in caplog.text
+
+
+def test_concurrent_runs_never_share_a_scratch_table(bq):
+    def stage(tag):
+        with gcs_to_bq.scratch_table(bq, TARGET_TABLE_ID, tag) as scratch_id:
+            return scratch_id
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        scratch_ids = list(executor.map(stage, ["lookup"] * 50))
+    assert len(set(scratch_ids)) == 50
+    assert sorted(bq.deleted_tables) == sorted(scratch_ids)
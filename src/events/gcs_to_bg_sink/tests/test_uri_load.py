@@ -0,0 +1,91 @@
+# tests/test_uri_load.py
+from datetime import date
+
+import pyarrow as pa
+import pytest
+from google.cloud import bigquery
+
+import gcs_to_bq
+from conftest import TARGET_TABLE_ID, parquet_bytes
+
+INGESTION_DATE = date(2025, 7, 14)
+FILE_PATH = "gs://bucket/linkedin/linkedin_scrap_2025-07-14.parquet"
+
+
+def put_file(gcs, table: pa.Table) -> None:
+    gcs.put("bucket", "linkedin/linkedin_scrap_2025-07-14.parquet", parquet_bytes(table))
+
+
+def test_footer_of_a_parser_file_is_accepted(gcs):
+    put_file(gcs, pa.table({
+        "job_id": ["1"],
+        "job_title": pa.array(["Engineer"]).dictionary_encode(),
+        "captured_at": pa.array([0], pa.timestamp("us", tz="UTC")),
+        "applicant_count_num": pa.array([None], pa.int32()),
+        "is_reposted": [True],
+        "not_a_staging_column": [1.5],
+    }))
+
+    schema = gcs_to_bq.validate_parquet_footer(FILE_PATH)
+    assert "not_a_staging_column" in schema.names
+
+
+def test_footer_without_job_id_is_rejected(gcs):
+    put_file(gcs, pa.table({"job_title": ["Engineer"]}))
+    with pytest.raises(ValueError, match="no job_id column"):
+        gcs_to_bq.validate_parquet_footer(FILE_PATH)
+
+
+def test_footer_with_an_incompatible_column_is_rejected(gcs):
+    put_file(gcs, pa.table({"job_id": ["1"], "applicant_count_num": ["many"], "captured_at": [1.0]}))
+    with pytest.raises(ValueError) as excinfo:
+        gcs_to_bq.validate_parquet_footer(FILE_PATH)
+    assert "applicant_count_num (string -> INT64)" in str(excinfo.value)
+    assert "captured_at (double -> TIMESTAMP)" in str(excinfo.value)
+
+
+@pytest.mark.parametrize("column, target_type, scratch_type, expected", [
+    ("ingestionDate", "DATE", "DATE", "@ingestion_date"),
+    ("ingestionDate", "DATE", None, "@ingestion_date"),
+    ("posted_at", "TIMESTAMP", None, "CAST(NULL AS TIMESTAMP)"),
+    ("job_title", "STRING", "STRING", "`job_title`"),
+    ("applicant_count_num", "INT64", "INTEGER", "`applicant_count_num`"),
+    ("is_reposted", "BOOL", "BOOLEAN", "`is_reposted`"),
+    ("captured_at", "TIMESTAMP", "DATETIME", "CAST(`captured_at` AS TIMESTAMP)"),
+    ("job_id", "STRING", "INTEGER", "CAST(`job_id` AS STRING)"),
+])
+def test_source_expression_maps_loaded_types_onto_the_staging_schema(column, target_type, scratch_type, expected):
+    scratch_types = {} if scratch_type is None else {column: scratch_type}
+    assert gcs_to_bq._source_expression(column, target_type, scratch_types) == expected
+
+
+def test_uri_load_stages_the_object_and_merges_it(bq, gcs):
+    put_file(gcs, pa.table({"job_id": ["1", "2"], "job_title": ["a", "b"]}))
+    bq.uri_schema = [bigquery.SchemaField("job_id", "STRING"), bigquery.SchemaField("job_title", "STRING")]
+    bq.dml_affected_rows = 2
+
+    assert gcs_to_bq.load_parquet_uri_to_bigquery(FILE_PATH, INGESTION_DATE) == 2
+
+    [scratch] = bq.created_tables
+    scratch_id = f"{scratch.project}.{scratch.dataset_id}.{scratch.table_id}"
+    assert not scratch.schema  # the Parquet file defines it
+
+    load, merge = bq.jobs
+    assert (load.kind, load.uri, load.destination) == ("load_uri", FILE_PATH, scratch_id)
+    assert load.job_config.source_format == bigquery.SourceFormat.PARQUET
+    assert load.job_config.write_disposition == bigquery.WriteDisposition.WRITE_TRUNCATE
+    # WRITE_TRUNCATE replaced the table, so the expiration is set again
+    assert ("update_table", scratch_id, ["expires"]) in bq.calls
+
+    assert merge.sql.lstrip().startswith(f"MERGE `{TARGET_TABLE_ID}`")
+    assert "`job_title` AS `job_title`" in merge.sql
+    assert "CAST(NULL AS TIMESTAMP) AS `captured_at`" in merge.sql
+    assert "@ingestion_date AS `ingestionDate`" in merge.sql
+    assert bq.deleted_tables == [scratch_id]
+
+
+def test_uri_load_never_stages_a_file_with_a_bad_footer(bq, gcs):
+    put_file(gcs, pa.table({"job_title": ["a"]}))
+    with pytest.raises(ValueError):
+        gcs_to_bq.load_parquet_uri_to_bigquery(FILE_PATH, INGESTION_DATE)
+    assert bq.calls == []
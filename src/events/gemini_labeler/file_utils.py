@@ -9,7 +9,8 @@ from google.cloud.exceptions import NotFound
 import logging # Use logging for better error messages
 from urllib.parse import urlparse, parse_qs
 import re
-from google.oauth2 import service_account
+
+from .. import gcp_clients # Shared credentials and clients
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -58,84 +59,21 @@ def save_json(data: dict, filepath: str):
 # --- NEW BigQuery Helper Functions ---
 def get_credentials():
     """
-    Create and return service account credentials from environment variables.
-    Handles both file path and individual env var methods.
+    Return the process-wide service account credentials (see src/events/gcp_clients.py).
+    Handles both the GOOGLE_APPLICATION_CREDENTIALS file and individual env var methods.
     """
-    try:
-        # Check if credentials file path is provided
-        creds_file = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
-        if creds_file and os.path.exists(creds_file):
-            logging.info(f"Using credentials from file: {creds_file}")
-            # Ensure correct scope if needed, although BQ/GCS often infer defaults
-            # scopes = ["https://www.googleapis.com/auth/cloud-platform"]
-            # return service_account.Credentials.from_service_account_file(creds_file, scopes=scopes)
-            return service_account.Credentials.from_service_account_file(creds_file)
-
-        # Extract service account details from environment variables
-        credentials_dict = {
-            "type": os.getenv("TYPE", "service_account"), # Default type if missing
-            "project_id": os.getenv("PROJECT_ID"),
-            "private_key_id": os.getenv("PRIVATE_KEY_ID"),
-            # Ensure correct newline replacement for private keys from env vars
-            "private_key": os.getenv("PRIVATE_KEY", "").replace("\\n", "\n"),
-            "client_email": os.getenv("CLIENT_EMAIL"),
-            "client_id": os.getenv("CLIENT_ID"),
-            "auth_uri": os.getenv("AUTH_URI", "https://accounts.google.com/o/oauth2/auth"),
-            "token_uri": os.getenv("TOKEN_URI", "https://oauth2.googleapis.com/token"),
-            "auth_provider_x509_cert_url": os.getenv("AUTH_PROVIDER_X509_CERT_URL", "https://www.googleapis.com/oauth2/v1/certs"),
-            "client_x509_cert_url": os.getenv("CLIENT_X509_CERT_URL"),
-            # Add universe_domain if needed for your environment, otherwise omit
-            # "universe_domain": os.getenv("UNIVERSE_DOMAIN", "googleapis.com")
-        }
-        # Attempt to get universe_domain if set
-        universe_domain = os.getenv("UNIVERSE_DOMAIN")
-        if universe_domain:
-            credentials_dict["universe_domain"] = universe_domain
-
-        # Validate required credential fields extracted from env vars
-        required_fields = ["project_id", "private_key", "client_email"]
-        missing_fields = [field for field in required_fields if not credentials_dict.get(field)]
-
-        if missing_fields:
-            # Log details but raise a clearer error if no creds method worked
-            logging.error(f"Missing required credential environment variables: {', '.join(missing_fields)}")
-            raise ValueError(
-                "Could not create credentials. Ensure GOOGLE_APPLICATION_CREDENTIALS file exists "
-                f"OR all required env vars ({', '.join(required_fields)}) are set."
-            )
-
-        logging.info(f"Using credentials constructed from environment variables for project: {credentials_dict['project_id']}")
-        # Ensure correct scope if needed
-        # scopes = ["https://www.googleapis.com/auth/cloud-platform"]
-        # return service_account.Credentials.from_service_account_info(credentials_dict, scopes=scopes)
-        return service_account.Credentials.from_service_account_info(credentials_dict)
-
-    except Exception as e:
-        logging.error(f"Failed to get or create credentials: {e}", exc_info=True)
-        raise
+    return gcp_clients.get_credentials()
 
 # --- BigQuery Client using the above credentials ---
 def get_bigquery_client():
     """
-    Create and return an authenticated BigQuery client using credentials
-    obtained via get_credentials().
+    Return the shared, authenticated BigQuery client for BQ_PROJECT_ID
+    (falling back to GCP_PROJECT_ID, then the project in the credentials).
     """
     try:
-        # Get credentials using your defined method
-        credentials = get_credentials()
-
-        # Determine the project ID for the client.
-        # Prioritize BQ specific, then general GCP, then the one from creds dict.
-        project_id = os.getenv("BQ_PROJECT_ID") or os.getenv("GCP_PROJECT_ID") or credentials.project_id
-
-        if not project_id:
-             raise ValueError("Could not determine BigQuery project ID. Set BQ_PROJECT_ID, GCP_PROJECT_ID, or ensure PROJECT_ID is in credentials.")
-
-        logging.info(f"Creating BigQuery client for project: {project_id} using provided service account credentials.")
-
-        # Create and return the BigQuery client, explicitly passing the credentials
-        return bigquery.Client(project=project_id, credentials=credentials)
-
+        return gcp_clients.get_bigquery_client(
+            gcp_clients.get_project_id("BQ_PROJECT_ID", "GCP_PROJECT_ID")
+        )
     except Exception as e:
         logging.error(f"Failed to create BigQuery client: {e}", exc_info=True)
         raise
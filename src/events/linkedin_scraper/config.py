@@ -26,4 +26,11 @@ JOB_LIST_SCROLL_CONTAINER = ".jobs-search-results-list__list" # Specific scroll
 
 # Pagination
 PAGINATION_NEXT_BUTTON_SELECTOR = (By.CSS_SELECTOR, "button[aria-label='View next page']")
-CURRENT_PAGE_SELECTOR = (By.CSS_SELECTOR, "li[data-test-pagination-page-btn].active > span")
\ No newline at end of file
+CURRENT_PAGE_SELECTOR = (By.CSS_SELECTOR, "li[data-test-pagination-page-btn].active > span")
+
+# --- Stored HTML ---
+# Strip scripts, styles, SVG, comments and unused attributes before saving a page.
+# Each sanitized page is verified against the parser's selectors; the raw page is kept on any difference.
+SANITIZE_HTML = True
+# Attributes kept on every element, in addition to those referenced by the parser's selectors
+SANITIZER_KEEP_ATTRIBUTES = ['class', 'id', 'href', 'src', 'type', 'charset', 'lang', 'dir', 'aria-label', 'aria-hidden']
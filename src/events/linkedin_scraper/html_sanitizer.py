@@ -0,0 +1,130 @@
+# html_sanitizer.py
+"""Strips boilerplate from captured job pages before they are stored.
+
+LinkedIn pages are mostly inline scripts, style blocks, SVG icons and tracking
+attributes that the parser (src/events/parse_to_gcs) never reads. The sanitizer
+removes them and keeps everything the parser uses: the DOM matched by its CSS
+selectors, JSON-LD scripts and the <code> blocks holding Voyager payloads.
+
+Removing nodes can shift positional selectors (:nth-child, :first-of-type), so
+each sanitized page is checked against the parser's own selectors and the raw
+page is stored instead whenever the extracted fields differ.
+"""
+
+import importlib.util
+import re
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
+
+import config
+
+PARSER_CONFIG_PATH = Path(__file__).resolve().parent.parent / "parse_to_gcs" / "config.py"
+
+# Elements that never carry job fields
+_DROP_TAGS = ('style', 'svg', 'noscript', 'iframe', 'template')
+_PRESERVE_WHITESPACE_TAGS = ('pre', 'textarea', 'code')
+_SELECTOR_ATTRIBUTE_REGEX = re.compile(r'\[\s*([a-zA-Z_:][-a-zA-Z0-9_:.]*)')
+
+_parser_selectors: Optional[Dict[str, str]] = None
+
+
+def load_parser_selectors() -> Dict[str, str]:
+    """Load SELECTORS from the parser's config.py (the scraper has its own `config` module)."""
+    global _parser_selectors
+    if _parser_selectors is None:
+        spec = importlib.util.spec_from_file_location("parse_to_gcs_config", PARSER_CONFIG_PATH)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _parser_selectors = dict(module.SELECTORS)
+    return _parser_selectors
+
+
+def _kept_attributes(selectors: Dict[str, str]) -> set:
+    """Attributes to keep: the configured base set plus every attribute the selectors test."""
+    kept = set(config.SANITIZER_KEEP_ATTRIBUTES)
+    for selector in selectors.values():
+        kept.update(_SELECTOR_ATTRIBUTE_REGEX.findall(selector))
+    return kept
+
+
+def sanitize_html(page_source: str, selectors: Dict[str, str]) -> str:
+    """
+    Remove scripts (except JSON-LD), styles, SVG, comments and unused attributes.
+
+    Args:
+        page_source: The page as returned by the driver
+        selectors: Parser selectors, used to decide which attributes to keep
+
+    Returns:
+        The sanitized page
+    """
+    document = lxml.html.document_fromstring(page_source)
+    kept_attributes = _kept_attributes(selectors)
+
+    for element in list(document.iter(etree.Comment, etree.ProcessingInstruction)):
+        element.drop_tree()
+
+    for element in list(document.iter('script', *_DROP_TAGS)):
+        if element.tag == 'script' and (element.get('type') or '').lower() == 'application/ld+json':
+            continue
+        element.drop_tree()
+
+    for element in document.iter(etree.Element):
+        for attribute in list(element.attrib):
+            if attribute not in kept_attributes:
+                del element.attrib[attribute]
+        # Dropped nodes leave runs of blank lines behind; whitespace-only text is never extracted
+        if element.tail and not element.tail.strip():
+            element.tail = '\n'
+        if element.text and not element.text.strip() and element.tag not in _PRESERVE_WHITESPACE_TAGS:
+            element.text = '\n'
+
+    return lxml.html.tostring(document, encoding='unicode', doctype='<!DOCTYPE html>')
+
+
+def extract_with_selectors(page_source: str, selectors: Dict[str, str]) -> Dict[str, Optional[str]]:
+    """Apply the parser's selectors the way LinkedInJobParser does (text, description text, href/src)."""
+    soup = BeautifulSoup(page_source, 'lxml')
+    fields = {}
+    for field, selector in selectors.items():
+        element = soup.select_one(selector)
+        if element is None:
+            fields[field] = None
+        elif field == 'job_link':
+            fields[field] = element.get('href')
+        elif field == 'company_logo_url':
+            fields[field] = element.get('src')
+        elif field == 'job_description':
+            fields[field] = element.get_text(separator='\n', strip=True)
+        else:
+            fields[field] = element.get_text(strip=True)
+    # Embedded payloads are read by the parser too
+    fields['_ld_json'] = ''.join(s.get_text() for s in soup.select('script[type="application/ld+json"]'))
+    fields['_code'] = ''.join(c.get_text() for c in soup.find_all('code'))
+    return fields
+
+
+def sanitize_for_storage(page_source: str) -> Tuple[str, Optional[str]]:
+    """
+    Sanitize a page and verify the parser would extract the same fields from it.
+
+    Returns:
+        (page to store, None) when the sanitized page can be stored, or
+        (raw page, reason) when sanitizing failed or the verification found a difference
+    """
+    try:
+        selectors = load_parser_selectors()
+        sanitized = sanitize_html(page_source, selectors)
+    except Exception as e:
+        return page_source, f"sanitizing failed: {e}"
+
+    raw_fields = extract_with_selectors(page_source, selectors)
+    sanitized_fields = extract_with_selectors(sanitized, selectors)
+    if sanitized_fields != raw_fields:
+        changed = sorted(k for k in raw_fields if raw_fields[k] != sanitized_fields.get(k))
+        return page_source, f"extraction differs for {', '.join(changed)}"
+    return sanitized, None
@@ -20,6 +20,7 @@ from prefect.cache_policies import NO_CACHE
 
 # Import constants from config file
 import config
+from html_sanitizer import sanitize_for_storage
 
 # --- Helper Function (Internal Use) ---
 def _clean_filename(text):
@@ -200,8 +201,16 @@ def save_job_html_task(driver_page_source: str, job_id: str, page_num: int, keyw
         filename = f"linkedin_{safe_keywords}_{safe_location}_p{page_num:02d}_id{job_id}.html"
         filepath = output_path / filename
 
+        page_source = driver_page_source
+        if config.SANITIZE_HTML:
+            page_source, fallback_reason = sanitize_for_storage(driver_page_source)
+            if fallback_reason:
+                logger.warning(f"Storing raw HTML for job {job_id} ({fallback_reason})")
+            else:
+                logger.debug(f"Sanitized HTML for job {job_id}: {len(driver_page_source)} -> {len(page_source)} chars")
+
         with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(driver_page_source)
+            f.write(page_source)
         logger.debug(f"Saved HTML to {filepath}") # Log only on debug
 
     except Exception as e:
@@ -0,0 +1,180 @@
+# benchmarks/corpus.py
+"""
+Synthetic LinkedIn job page generator for parser benchmarks.
+
+Pages follow the DOM structure expected by config.SELECTORS and are padded
+with the kind of markup real captures carry (inline scripts, styles, SVG
+icons) up to a target size. Each optional field is dropped with probability
+``sparsity`` so the parser's miss paths get exercised too.
+
+Usage:
+    python benchmarks/corpus.py --output-dir /tmp/linkedin_corpus --num-files 500 --target-kb 400
+"""
+
+import argparse
+import html
+import json
+import random
+from pathlib import Path
+from typing import Dict, List, Optional
+
+TITLES = ['Data Engineer', 'Senior Data Engineer', 'Analytics Engineer', 'Machine Learning Engineer',
+          'Data Scientist', 'Backend Engineer', 'Data Platform Engineer', 'BI Developer']
+COMPANIES = ['Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark Industries', 'Wayne Enterprises']
+LOCATIONS = ['Lisbon, Portugal', 'Porto, Portugal', 'Madrid, Spain', 'Berlin, Germany', 'Remote, EMEA']
+REPOSTED = ['2 days ago', 'Reposted 3 days ago', '1 week ago', 'Reposted 2 weeks ago', '5 hours ago']
+APPLICANTS = ['Over 100 applicants', '37 applicants', 'Be among the first 25 applicants', '12 applicants']
+WORKPLACE = ['On-site', 'Hybrid', 'Remote']
+EMPLOYMENT = ['Full-time', 'Part-time', 'Contract', 'Internship']
+EXPERIENCE = ['Entry level', 'Associate', 'Mid-Senior level', 'Director']
+APPLY = ['Easy Apply', 'Apply']
+SEARCHES = [('data_engineer', 'Lisbon'), ('analytics_engineer', 'Porto'), ('machine_learning', 'Remote')]
+WORDS = ('pipeline data spark python sql airflow cloud model team product platform stream batch '
+         'warehouse quality ownership impact customer scale reliable design build deliver').split()
+
+# Optional fields that can be left out of a page
+OPTIONAL_FIELDS = ['company_logo_url', 'location', 'reposted_info', 'applicant_count', 'workplace_type',
+                   'employment_type', 'experience_level', 'skills_summary', 'application_type']
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def _filler(rng: random.Random, size_bytes: int) -> str:
+    """Markup the parser never reads: scripts, styles and SVG icons."""
+    chunks: List[str] = []
+    written = 0
+    while written < size_bytes:
+        kind = rng.randrange(3)
+        if kind == 0:
+            chunk = f"<script>window.__tracking_{rng.randrange(10**6)}={json.dumps([rng.random() for _ in range(40)])};</script>"
+        elif kind == 1:
+            chunk = "<style>" + ''.join(f".c{rng.randrange(10**5)}{{margin:{rng.randrange(40)}px}}" for _ in range(30)) + "</style>"
+        else:
+            points = ' '.join(f"{rng.randrange(24)},{rng.randrange(24)}" for _ in range(40))
+            chunk = f'<svg viewBox="0 0 24 24" data-test-icon="i{rng.randrange(999)}"><polyline points="{points}"/></svg>'
+        chunks.append(chunk)
+        written += len(chunk)
+    return '\n'.join(chunks)
+
+
+def render_job_page(job_id: str, rng: random.Random, sparsity: float = 0.1,
+                    description_paragraphs: int = 8, filler_bytes: int = 0,
+                    embed_metadata: bool = False) -> str:
+    """
+    Render one job page matching config.SELECTORS.
+
+    Args:
+        job_id: LinkedIn job id used in links and the filename
+        rng: Random source (seeded for reproducible corpora)
+        sparsity: Probability that each optional field is missing
+        description_paragraphs: Length of the job description
+        filler_bytes: Amount of non-content markup to add
+        embed_metadata: Also embed a JSON-LD JobPosting payload
+
+    Returns:
+        The page as a string
+    """
+    present = {field: rng.random() >= sparsity for field in OPTIONAL_FIELDS}
+    values: Dict[str, Optional[str]] = {
+        'job_title': rng.choice(TITLES),
+        'company_name': rng.choice(COMPANIES),
+        'location': rng.choice(LOCATIONS),
+        'reposted_info': rng.choice(REPOSTED),
+        'applicant_count': rng.choice(APPLICANTS),
+        'workplace_type': rng.choice(WORKPLACE),
+        'employment_type': rng.choice(EMPLOYMENT),
+        'experience_level': rng.choice(EXPERIENCE),
+        'application_type': rng.choice(APPLY),
+    }
+    description = ''.join(f"<p>{_sentence(rng, rng.randint(12, 40))}</p>" for _ in range(description_paragraphs))
+
+    def optional(field: str, markup: str) -> str:
+        return markup if present[field] else ''
+
+    tertiary = '<span class="tvm__text">·</span>'.join([
+        f'<span class="tvm__text">{values["location"] if present["location"] else ""}</span>',
+        f'<span class="tvm__text">{values["reposted_info"] if present["reposted_info"] else ""}</span>',
+        f'<span class="tvm__text">{values["applicant_count"] if present["applicant_count"] else ""}</span>',
+    ])
+
+    ld_json = ''
+    if embed_metadata:
+        ld_json = '<script type="application/ld+json">' + json.dumps({
+            '@context': 'http://schema.org', '@type': 'JobPosting', 'title': values['job_title'],
+            'description': html.escape(description), 'identifier': {'@type': 'PropertyValue', 'value': job_id},
+            'hiringOrganization': {'@type': 'Organization', 'name': values['company_name']},
+            'url': f"https://www.linkedin.com/jobs/view/{job_id}/",
+        }) + '</script>'
+
+    return f"""<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>{values['job_title']} | LinkedIn</title>{ld_json}</head>
+<body>
+{_filler(rng, filler_bytes // 2)}
+<div class="jobs-search__job-details--container">
+  <div class="job-details-jobs-unified-top-card__company-name"><a href="/company/{values['company_name'].lower()}">{values['company_name']}</a></div>
+  {optional('company_logo_url', f'<a aria-label="{values["company_name"]} logo" href="#"><img class="ivm-view-attr__img--centered" src="https://media.licdn.com/logo/{job_id}.png"></a>')}
+  <div class="job-details-jobs-unified-top-card__job-title"><h1><a href="/jobs/view/{job_id}/?trk=flagship">{values['job_title']}</a></h1></div>
+  <div class="job-details-jobs-unified-top-card__tertiary-description-container"><span dir="ltr">{tertiary}</span></div>
+  <ul>
+    <li class="job-details-jobs-unified-top-card__job-insight job-details-jobs-unified-top-card__job-insight--highlight">
+      {optional('workplace_type', f'<span class="ui-label"><span aria-hidden="true">{values["workplace_type"]}</span></span>')}
+      {optional('employment_type', f'<span class="ui-label"><span aria-hidden="true">{values["employment_type"]}</span></span>')}
+      {optional('experience_level', f'<span dir="ltr" class="job-details-jobs-unified-top-card__job-insight-view-model-secondary">{values["experience_level"]}</span>')}
+    </li>
+    <li class="job-details-jobs-unified-top-card__job-insight">{optional('skills_summary', '<a href="#HYM">Skills: Python, SQL, +6 more</a>')}</li>
+  </ul>
+  {optional('application_type', f'<button class="jobs-apply-button"><span class="artdeco-button__text">{values["application_type"]}</span></button>')}
+  <div id="job-details"><div class="mt4">{description}</div></div>
+</div>
+{_filler(rng, filler_bytes - filler_bytes // 2)}
+</body></html>
+"""
+
+
+def generate_corpus(output_dir: Path, num_files: int = 200, target_kb: int = 300, sparsity: float = 0.1,
+                    embed_metadata: bool = False, seed: int = 42) -> List[Path]:
+    """
+    Write a reproducible corpus of synthetic job pages.
+
+    Args:
+        output_dir: Directory to write the pages to
+        num_files: Number of pages
+        target_kb: Approximate size of each page in KB
+        sparsity: Probability that each optional field is missing
+        embed_metadata: Also embed JSON-LD payloads
+        seed: Random seed
+
+    Returns:
+        Paths of the generated files
+    """
+    rng = random.Random(seed)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    paths = []
+    for i in range(num_files):
+        job_id = str(4_000_000_000 + i)
+        keywords, location = SEARCHES[i % len(SEARCHES)]
+        page = render_job_page(job_id, rng, sparsity=sparsity, filler_bytes=target_kb * 1024,
+                               embed_metadata=embed_metadata)
+        path = output_dir / f"linkedin_{keywords}_{location}_p{i // 25 + 1:02d}_id{job_id}.html"
+        path.write_text(page, encoding='utf-8')
+        paths.append(path)
+    return paths
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Generate a synthetic LinkedIn job page corpus.")
+    arg_parser.add_argument('--output-dir', type=Path, required=True)
+    arg_parser.add_argument('--num-files', type=int, default=200)
+    arg_parser.add_argument('--target-kb', type=int, default=300)
+    arg_parser.add_argument('--sparsity', type=float, default=0.1)
+    arg_parser.add_argument('--embed-metadata', action='store_true')
+    arg_parser.add_argument('--seed', type=int, default=42)
+    args = arg_parser.parse_args()
+
+    files = generate_corpus(args.output_dir, args.num_files, args.target_kb, args.sparsity,
+                            args.embed_metadata, args.seed)
+    print(f"Wrote {len(files)} pages to {args.output_dir}")
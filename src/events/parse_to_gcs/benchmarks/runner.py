@@ -0,0 +1,162 @@
+# benchmarks/runner.py
+"""
+Benchmark runner for LinkedInJobParser.
+
+Times the parser stages separately on a synthetic corpus (see corpus.py),
+reports files/sec, MB/sec and peak RSS, and compares the result against the
+committed baseline.json so regressions show up from commit to commit.
+
+Usage (from src/events/parse_to_gcs):
+    python benchmarks/runner.py                      # run and compare against the baseline
+    python benchmarks/runner.py --update-baseline    # run and record a new baseline
+"""
+
+import argparse
+import json
+import platform
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+PARSER_DIR = BENCHMARK_DIR.parent
+BASELINE_PATH = BENCHMARK_DIR / "baseline.json"
+
+# The parser modules use flat imports (import config), so run them from their own directory
+sys.path.insert(0, str(PARSER_DIR))
+sys.path.insert(0, str(BENCHMARK_DIR))
+
+from corpus import generate_corpus  # noqa: E402
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in KB on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _stage(name: str, seconds: float, files: int, total_bytes: int) -> Dict:
+    return {
+        'stage': name,
+        'seconds': round(seconds, 4),
+        'files_per_sec': round(files / seconds, 2) if seconds else None,
+        'mb_per_sec': round(total_bytes / (1024 * 1024) / seconds, 2) if seconds else None,
+    }
+
+
+def run_benchmark(num_files: int, target_kb: int, sparsity: float, batch_size: int,
+                  embed_metadata: bool, repeats: int) -> Dict:
+    """
+    Generate a corpus and time each parser stage (best of ``repeats``).
+
+    Returns:
+        Result dict with per-stage timings, corpus description and peak RSS
+    """
+    import main  # Imported late so sys.path is set up and logging config is the parser's own
+    main.logger.setLevel('WARNING')
+
+    with tempfile.TemporaryDirectory(prefix='linkedin_bench_') as tmp:
+        tmp_path = Path(tmp)
+        files = generate_corpus(tmp_path / 'html', num_files, target_kb, sparsity, embed_metadata)
+        total_bytes = sum(f.stat().st_size for f in files)
+        parser = main.LinkedInJobParser(tmp_path / 'html', tmp_path / 'out', 'bench.parquet',
+                                        html_parser=main.config.DEFAULT_HTML_PARSER)
+
+        timings: Dict[str, List[float]] = {k: [] for k in
+                                           ('process_single_file', 'process_html_batch',
+                                            'create_dataframe_from_batches', 'save_dataframe')}
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for f in files:
+                parser.process_single_file(f)
+            timings['process_single_file'].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            batches = list(parser.process_html_batch(files, batch_size=batch_size))
+            timings['process_html_batch'].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            df = parser.create_dataframe_from_batches(iter(batches))
+            timings['create_dataframe_from_batches'].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            parser.save_dataframe(df)
+            timings['save_dataframe'].append(time.perf_counter() - start)
+
+    return {
+        'recorded_at': datetime.now(timezone.utc).isoformat(),
+        'machine': f"{platform.system()} {platform.machine()} / Python {platform.python_version()}",
+        'corpus': {'num_files': num_files, 'target_kb': target_kb, 'sparsity': sparsity,
+                   'embed_metadata': embed_metadata, 'total_mb': round(total_bytes / (1024 * 1024), 2)},
+        'stages': [_stage(name, min(values), num_files, total_bytes) for name, values in timings.items()],
+        'peak_rss_mb': round(_peak_rss_mb(), 1),
+    }
+
+
+def compare_to_baseline(result: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Return a message for every stage that got slower than the baseline by more than tolerance."""
+    regressions = []
+    baseline_stages = {s['stage']: s for s in baseline.get('stages', [])}
+    for stage in result['stages']:
+        previous = baseline_stages.get(stage['stage'])
+        if not previous or not previous.get('files_per_sec') or not stage['files_per_sec']:
+            continue
+        ratio = stage['files_per_sec'] / previous['files_per_sec']
+        if ratio < 1 - tolerance:
+            regressions.append(f"{stage['stage']}: {stage['files_per_sec']} files/s vs "
+                               f"{previous['files_per_sec']} files/s in the baseline ({ratio:.0%})")
+    return regressions
+
+
+def _print_result(result: Dict) -> None:
+    corpus = result['corpus']
+    print(f"Corpus: {corpus['num_files']} files, {corpus['total_mb']} MB "
+          f"(sparsity {corpus['sparsity']}, embedded metadata: {corpus['embed_metadata']})")
+    print(f"{'stage':32} {'seconds':>10} {'files/s':>10} {'MB/s':>10}")
+    for stage in result['stages']:
+        print(f"{stage['stage']:32} {stage['seconds']:>10} {stage['files_per_sec']:>10} {stage['mb_per_sec']:>10}")
+    print(f"Peak RSS: {result['peak_rss_mb']} MB")
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmark LinkedInJobParser stages.")
+    arg_parser.add_argument('--num-files', type=int, default=200)
+    arg_parser.add_argument('--target-kb', type=int, default=300)
+    arg_parser.add_argument('--sparsity', type=float, default=0.1)
+    arg_parser.add_argument('--batch-size', type=int, default=500)
+    arg_parser.add_argument('--embed-metadata', action='store_true')
+    arg_parser.add_argument('--repeats', type=int, default=3)
+    arg_parser.add_argument('--tolerance', type=float, default=0.2,
+                            help="Allowed slowdown versus the baseline before failing (0.2 = 20%%)")
+    arg_parser.add_argument('--update-baseline', action='store_true')
+    args = arg_parser.parse_args()
+
+    result = run_benchmark(args.num_files, args.target_kb, args.sparsity, args.batch_size,
+                           args.embed_metadata, args.repeats)
+    _print_result(result)
+
+    if args.update_baseline:
+        BASELINE_PATH.write_text(json.dumps(result, indent=2) + '\n', encoding='utf-8')
+        print(f"Baseline written to {BASELINE_PATH}")
+        sys.exit(0)
+
+    if not BASELINE_PATH.is_file():
+        print("No baseline recorded yet. Run with --update-baseline to create one.")
+        sys.exit(0)
+
+    baseline = json.loads(BASELINE_PATH.read_text(encoding='utf-8'))
+    if baseline.get('corpus') != result['corpus']:
+        print("Corpus parameters differ from the baseline; skipping the comparison.")
+        sys.exit(0)
+
+    regressions = compare_to_baseline(result, baseline, args.tolerance)
+    if regressions:
+        print("Performance regressions against the baseline:")
+        for message in regressions:
+            print(f"  - {message}")
+        sys.exit(1)
+    print(f"No regressions against the baseline recorded at {baseline.get('recorded_at')}.")
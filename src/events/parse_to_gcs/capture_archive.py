@@ -0,0 +1,222 @@
+# capture_archive.py
+"""
+Archival of a run's raw HTML captures to Google Cloud Storage.
+
+The captures only live on the runner, so once selectors break there is nothing
+to re-parse. archive_captures bundles the captures of a run into one gzipped
+tar, splits it into parts that are uploaded in parallel, composes the parts
+server-side into a single object (in rounds of at most 32 sources, the GCS
+compose limit) and writes a manifest with per-file and whole-archive checksums
+next to it. restore_archive downloads an archive back into a directory after
+verifying it against its manifest.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import tarfile
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import google_crc32c
+from google.cloud.exceptions import NotFound
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# GCS accepts at most 32 source objects per compose request
+MAX_COMPOSE_SOURCES = 32
+_HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def _file_digests(file_path: Path) -> Dict[str, str]:
+    """SHA-256 (hex) and CRC32C (base64, as GCS reports it) of a file."""
+    sha256 = hashlib.sha256()
+    crc32c = google_crc32c.Checksum()
+    with open(file_path, 'rb') as f:
+        while chunk := f.read(_HASH_CHUNK_BYTES):
+            sha256.update(chunk)
+            crc32c.update(chunk)
+    return {'sha256': sha256.hexdigest(), 'crc32c': base64.b64encode(crc32c.digest()).decode('ascii')}
+
+
+def build_archive(html_files: List[Path], archive_path: Path) -> List[Dict]:
+    """
+    Bundle the captures into a gzipped tar (flat, by file name).
+
+    Returns:
+        Manifest entries (name, size, sha256) of the archived files
+    """
+    entries = []
+    with tarfile.open(archive_path, 'w:gz', compresslevel=config.ARCHIVE_COMPRESS_LEVEL) as tar:
+        for file_path in html_files:
+            tar.add(file_path, arcname=file_path.name)
+            entries.append({
+                'name': file_path.name,
+                'size': file_path.stat().st_size,
+                'sha256': _file_digests(file_path)['sha256'],
+            })
+    return entries
+
+
+def _upload_part(bucket, archive_path: Path, blob_name: str, offset: int, length: int) -> str:
+    with open(archive_path, 'rb') as f:
+        f.seek(offset)
+        data = f.read(length)
+    blob = bucket.blob(blob_name)
+    blob.upload_from_string(data, content_type='application/octet-stream', checksum='crc32c')
+    return blob_name
+
+
+def delete_objects(bucket, names: List[str]) -> None:
+    """Delete objects, skipping ones that were never written."""
+    for name in names:
+        try:
+            bucket.blob(name).delete()
+        except NotFound:
+            pass
+
+
+def compose_objects(bucket, source_names: List[str], destination_name: str) -> None:
+    """
+    Compose any number of objects into one, in rounds of at most MAX_COMPOSE_SOURCES.
+
+    Intermediate objects are deleted afterwards, also when a compose fails.
+    """
+    round_number = 0
+    intermediates: List[str] = []
+    try:
+        while len(source_names) > MAX_COMPOSE_SOURCES:
+            next_names = []
+            for i in range(0, len(source_names), MAX_COMPOSE_SOURCES):
+                group = source_names[i:i + MAX_COMPOSE_SOURCES]
+                name = f"{destination_name}.compose-{round_number}-{i // MAX_COMPOSE_SOURCES:05d}"
+                intermediates.append(name)
+                bucket.blob(name).compose([bucket.blob(n) for n in group])
+                next_names.append(name)
+            source_names = next_names
+            round_number += 1
+
+        destination = bucket.blob(destination_name)
+        destination.content_type = 'application/gzip'
+        destination.compose([bucket.blob(n) for n in source_names])
+    finally:
+        delete_objects(bucket, intermediates)
+
+
+def archive_captures(html_files: List[Path], bucket, object_name: str,
+                     part_size: int = config.ARCHIVE_PART_BYTES,
+                     max_workers: int = config.ARCHIVE_UPLOAD_WORKERS) -> Dict:
+    """
+    Archive captures to gs://<bucket>/<object_name> with a <object_name>.manifest.json.
+
+    Args:
+        html_files: Captures to archive
+        bucket: google.cloud.storage Bucket
+        object_name: Name of the composed archive object
+        part_size: Size of the parts uploaded in parallel
+        max_workers: Parallel part uploads
+
+    Returns:
+        The manifest that was written
+    """
+    part_names: List[str] = []
+    try:
+        with tempfile.TemporaryDirectory(prefix='capture_archive_') as tmp:
+            archive_path = Path(tmp) / 'captures.tar.gz'
+            file_entries = build_archive(html_files, archive_path)
+            archive_size = archive_path.stat().st_size
+            digests = _file_digests(archive_path)
+
+            # --- Upload the parts in parallel ---
+            offsets = list(range(0, archive_size, part_size)) or [0]
+            part_names = [f"{object_name}.part-{i:05d}" for i in range(len(offsets))]
+            logger.info(f"Uploading {len(html_files)} captures ({archive_size / 1024 / 1024:.1f} MB) "
+                        f"as {len(offsets)} parts with {max_workers} workers")
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                list(executor.map(
+                    lambda args: _upload_part(bucket, archive_path, *args),
+                    [(name, offset, part_size) for name, offset in zip(part_names, offsets)]
+                ))
+
+        # --- Compose server-side ---
+        compose_objects(bucket, part_names, object_name)
+    finally:
+        # Parts are only staging objects: never leave them behind, whether or not the upload succeeded
+        delete_objects(bucket, part_names)
+
+    # --- Verify the result ---
+    archive_blob = bucket.blob(object_name)
+    archive_blob.reload()
+    if archive_blob.crc32c != digests['crc32c']:
+        raise ValueError(f"Composed archive gs://{bucket.name}/{object_name} has CRC32C {archive_blob.crc32c}, "
+                         f"expected {digests['crc32c']}")
+
+    manifest = {
+        'archive': f"gs://{bucket.name}/{object_name}",
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'size': archive_size,
+        'sha256': digests['sha256'],
+        'crc32c': digests['crc32c'],
+        'parts': len(part_names),
+        'files': file_entries,
+    }
+    bucket.blob(f"{object_name}.manifest.json").upload_from_string(
+        json.dumps(manifest, indent=2), content_type='application/json'
+    )
+    logger.info(f"Archived {len(file_entries)} captures to {manifest['archive']}")
+    return manifest
+
+
+def _safe_extract(tar: tarfile.TarFile, destination_dir: Path) -> None:
+    """
+    Extract an archive without letting members escape destination_dir.
+
+    Uses the 'data' extraction filter where tarfile has it (3.10.12+, 3.11.4+);
+    otherwise checks the members itself. Archives written by build_archive only
+    hold regular files.
+    """
+    if hasattr(tarfile, 'data_filter'):
+        tar.extractall(destination_dir, filter='data')
+        return
+
+    root = destination_dir.resolve()
+    members = tar.getmembers()
+    for member in members:
+        target = (root / member.name).resolve()
+        if not (member.isfile() or member.isdir()) or root not in target.parents:
+            raise ValueError(f"Refusing to extract archive member {member.name!r}")
+    tar.extractall(destination_dir, members=members)
+
+
+def restore_archive(bucket, object_name: str, destination_dir: Path) -> List[Path]:
+    """
+    Download an archive, verify it against its manifest and extract it.
+
+    Returns:
+        Paths of the extracted captures
+    """
+    manifest = json.loads(bucket.blob(f"{object_name}.manifest.json").download_as_text())
+    destination_dir = Path(destination_dir)
+    destination_dir.mkdir(parents=True, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(prefix='capture_archive_') as tmp:
+        archive_path = Path(tmp) / 'captures.tar.gz'
+        bucket.blob(object_name).download_to_filename(str(archive_path))
+        if _file_digests(archive_path)['sha256'] != manifest['sha256']:
+            raise ValueError(f"Checksum mismatch for gs://{bucket.name}/{object_name}")
+        with tarfile.open(archive_path, 'r:gz') as tar:
+            _safe_extract(tar, destination_dir)
+
+    return [destination_dir / entry['name'] for entry in manifest['files']]
+
+
+def archive_object_name(prefix: str, ingestion_date: str, run_started_at: Optional[str] = None) -> str:
+    """Object name for a run's archive: <prefix>/ingestion_date=<date>/captures_<HHMMSS>.tar.gz."""
+    started = datetime.fromisoformat(run_started_at) if run_started_at else datetime.now(timezone.utc)
+    return f"{prefix.strip('/')}/ingestion_date={ingestion_date}/captures_{started.strftime('%H%M%S')}.tar.gz"
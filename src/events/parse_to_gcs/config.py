@@ -30,8 +30,74 @@ DEFAULT_OUTPUT_FILENAME = f"linkedin_jobs_data_{date.today().isoformat()}.parque
 
 GCS_OUTPUT_PATH = "linkedin/raw"
 
+# --- GCS Upload ---
+# The daily file is streamed row group by row group into a resumable upload session
+GCS_UPLOAD_CHUNK_SIZE = int(os.getenv("GCS_UPLOAD_CHUNK_SIZE", str(8 * 1024 * 1024)))  # Multiple of 256 KB
+GCS_UPLOAD_ROW_GROUP_SIZE = 100000
+
+# --- Raw Capture Archive ---
+# Each run's HTML captures are tarred, uploaded as parallel parts and composed into one object
+ARCHIVE_CAPTURES = os.getenv("PARSER_ARCHIVE_CAPTURES", "true").lower() == "true"
+GCS_CAPTURE_ARCHIVE_PATH = "linkedin/captures"
+ARCHIVE_PART_BYTES = 32 * 1024 * 1024
+ARCHIVE_UPLOAD_WORKERS = 8
+ARCHIVE_COMPRESS_LEVEL = 6
+
+# --- Incremental Parsing ---
+# The manifest and the partitioned dataset live inside the output directory
+PARSE_MANIFEST_FILENAME = "_parse_manifest.json"
+PARSED_DATASET_DIRNAME = "dataset"
+
+# --- Output Layout ---
+# "daily": one linkedin_scrap_<date>.parquet per day (what the GCS sink reads)
+# "partitioned": ingestion_date=<date>/search=<slug>/part-NNNNN.parquet plus a _SUCCESS marker
+OUTPUT_LAYOUT = os.getenv("PARSER_OUTPUT_LAYOUT", "daily")
+TARGET_PART_FILE_BYTES = int(os.getenv("PARSER_TARGET_PART_FILE_BYTES", str(128 * 1024 * 1024)))
+
+# --- Run Bookkeeping ---
+# Keep only the most complete record per job_id within a run
+DEDUPLICATE_JOBS = True
+RUN_STATS_FILENAME = "run_stats.json"
+
+# --- Parse Cache ---
+# Extracted fields keyed by page content hash; invalidated when SELECTORS change
+USE_PARSE_CACHE = True
+PARSE_CACHE_FILENAME = "_parse_cache.sqlite"
+PARSE_CACHE_MAX_BYTES = int(os.getenv("PARSER_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# --- Extraction Telemetry ---
+# Minimum share of parsed pages that must yield each field; a drop usually means
+# LinkedIn changed its markup and the selectors above need updating
+FIELD_HIT_RATE_THRESHOLDS = {
+    'job_id': 0.99,
+    'job_title': 0.95,
+    'company_name': 0.9,
+    'job_description': 0.9,
+    'location': 0.8,
+}
+HIT_RATE_CHECK_MIN_PAGES = 20  # Smaller runs are too noisy to judge
+# "alert": log an error and carry on; "fail": stop the flow before anything is uploaded
+HIT_RATE_ON_VIOLATION = os.getenv("PARSER_HIT_RATE_ON_VIOLATION", "alert")
+EXTRACTION_REPORT_FILENAME = "extraction_report.json"
+
+# --- Relevance Filter ---
+# Applied right after parsing so out-of-scope postings never reach GCS, BigQuery or Gemini.
+# Empty lists disable the corresponding rule. Rejected rows go to <output_dir>/rejected/.
+# Off by default, and every rule below ships empty, so the stock config keeps every row.
+RELEVANCE_FILTER_ENABLED = os.getenv("PARSER_RELEVANCE_FILTER", "false").lower() == "true"
+RELEVANCE_ALLOWED_LANGUAGES = []  # e.g. ["en", "pt"]; descriptions of unknown language are kept
+RELEVANCE_TITLE_INCLUDE = []  # e.g. ["data", "analytics", "machine learning"]
+RELEVANCE_TITLE_EXCLUDE = []  # e.g. ["sales", "recruiter"]
+RELEVANCE_EXCLUDED_EXPERIENCE_LEVELS = []  # experience_level_code values, e.g. ["internship"]
+RELEVANCE_COMPANY_BLOCKLIST = []
+REJECTED_JOBS_DIRNAME = "rejected"
+
 # --- Technical Settings ---
 DEFAULT_HTML_PARSER = 'lxml' # Preferred parser for speed
+# Read fields from embedded JSON-LD / <code> payloads first; SELECTORS fill the gaps
+USE_EMBEDDED_METADATA = True
+# Bytes of each file inspected for the <html> check and the declared charset
+HTML_SNIFF_BYTES = 4096
 
 # --- Logging Configuration ---
 # Set the desired logging level. Prefect's logger respects this.
@@ -0,0 +1,105 @@
+# dedup.py
+"""
+Within-run deduplication of parsed job records.
+
+The scraper can capture the same job on several pages or searches, which makes
+the parser emit one row per capture. JobDeduplicator keeps a hash index from
+job_id to the best record seen so far while batches stream through, so only
+one row per job reaches the DataFrame and everything downstream of it.
+"""
+
+import logging
+from typing import Any, Dict, Generator, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bookkeeping columns that say nothing about how complete a record is
+_NON_CONTENT_FIELDS = {'source_file', 'captured_at'}
+
+
+def completeness_score(record: Dict[str, Any]) -> Tuple[int, str]:
+    """
+    Rank a record: more non-empty fields first, then the most recent capture.
+
+    Returns:
+        (number of non-empty content fields, captured_at ISO string)
+    """
+    filled = sum(
+        1 for field, value in record.items()
+        if field not in _NON_CONTENT_FIELDS and value is not None and value != ''
+    )
+    return filled, record.get('captured_at') or ''
+
+
+class JobDeduplicator:
+    """Keeps the most complete record per job_id across streaming batches."""
+
+    def __init__(self):
+        self._records: List[Dict[str, Any]] = []
+        self._index: Dict[str, int] = {}  # job_id -> position in _records
+        self.dropped: List[Dict[str, Any]] = []
+        self._dropped_by_job: Dict[str, List[Dict[str, Any]]] = {}  # job_id -> its entries in dropped
+
+    def add(self, record: Dict[str, Any]) -> None:
+        """Add one record, replacing the held one for the same job if it is better."""
+        job_id = record.get('job_id')
+        if not job_id:
+            # Nothing to key on; records without job_id are passed through untouched
+            self._records.append(record)
+            return
+
+        position = self._index.get(job_id)
+        if position is None:
+            self._index[job_id] = len(self._records)
+            self._records.append(record)
+            return
+
+        current = self._records[position]
+        dropped_entries = self._dropped_by_job.setdefault(job_id, [])
+        if completeness_score(record) > completeness_score(current):
+            kept, dropped = record, current
+            self._records[position] = record
+            # Captures dropped earlier in favour of the replaced record now point at the new one
+            for entry in dropped_entries:
+                entry['kept_source_file'] = record.get('source_file')
+        else:
+            kept, dropped = current, record
+
+        entry = {
+            'job_id': job_id,
+            'dropped_source_file': dropped.get('source_file'),
+            'kept_source_file': kept.get('source_file'),
+        }
+        self.dropped.append(entry)
+        dropped_entries.append(entry)
+
+    def deduplicate(self, batches: Iterable[List[Dict[str, Any]]],
+                    batch_size: int = 500) -> Generator[List[Dict[str, Any]], None, None]:
+        """
+        Consume the parser's batches and yield deduplicated batches in first-seen order.
+
+        Args:
+            batches: Batches from LinkedInJobParser.process_html_batch
+            batch_size: Size of the yielded batches
+
+        Yields:
+            Batches of unique records
+        """
+        for batch in batches:
+            for record in batch:
+                self.add(record)
+
+        if self.dropped:
+            logger.info(f"Dropped {len(self.dropped)} duplicate records across {len(self._index)} unique jobs.")
+
+        for start in range(0, len(self._records), batch_size):
+            yield self._records[start:start + batch_size]
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Summary for the run stats."""
+        return {
+            'unique_jobs': len(self._index),
+            'duplicates_dropped': len(self.dropped),
+            'duplicates': self.dropped,
+        }
@@ -0,0 +1,226 @@
+# embedded_metadata.py
+"""
+Extraction of job fields from structured metadata embedded in LinkedIn pages.
+
+Job pages carry JSON-LD (<script type="application/ld+json">) and Voyager API
+payloads (HTML-escaped JSON inside hidden <code> blocks). Both are located with
+regular expressions on the raw bytes of the document and only the matched
+payloads are decoded, with a fast JSON parser, so no DOM has to be built and
+the page is never decoded as a whole for the fields they contain. The CSS selectors in
+config.SELECTORS remain the fallback for anything not found here.
+"""
+
+import html
+import json
+import logging
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import orjson
+
+    def _loads(payload: bytes) -> Any:
+        return orjson.loads(payload)
+except ImportError:  # orjson is optional; the stdlib decoder gives the same result
+    _loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+LD_JSON_REGEX = re.compile(
+    rb'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>', re.S | re.I
+)
+CODE_BLOCK_REGEX = re.compile(rb'<code[^>]*>\s*(\{.*?\})\s*</code>', re.S | re.I)
+URN_ID_REGEX = re.compile(r'(\d{8,})')
+FILENAME_JOB_ID_REGEX = re.compile(r'_id(\d+)\.html?$')
+_TAG_REGEX = re.compile(r'<[^>]+>')
+_BLOCK_TAG_REGEX = re.compile(r'<\s*(?:br|/p|/li|/h\d|/div)\s*/?>', re.I)
+
+# schema.org employmentType -> the wording LinkedIn shows on the page
+_EMPLOYMENT_TYPE_LABELS = {
+    'FULL_TIME': 'Full-time', 'PART_TIME': 'Part-time', 'CONTRACTOR': 'Contract',
+    'TEMPORARY': 'Temporary', 'INTERN': 'Internship', 'VOLUNTEER': 'Volunteer', 'OTHER': 'Other',
+}
+
+
+def job_id_from_filename(file_name: str) -> Optional[str]:
+    """Return the job id the scraper encoded in the capture filename, if any."""
+    match = FILENAME_JOB_ID_REGEX.search(file_name)
+    return match.group(1) if match else None
+
+
+def _html_to_text(fragment: Any) -> Optional[str]:
+    """Cheap HTML-to-text for description fragments, one line per block element."""
+    if not fragment or not isinstance(fragment, str):
+        return None
+    if '&lt;' in fragment:
+        # JSON-LD descriptions carry escaped markup
+        fragment = html.unescape(fragment)
+    text = html.unescape(_TAG_REGEX.sub('', _BLOCK_TAG_REGEX.sub('\n', fragment)))
+    lines = [line.strip() for line in text.splitlines()]
+    return '\n'.join(line for line in lines if line) or None
+
+
+def _first(value: Any) -> Any:
+    return value[0] if isinstance(value, list) and value else value
+
+
+def _as_utf8(block: bytes, encoding: str) -> bytes:
+    """JSON decoders expect UTF-8; transcode only the matched block if the page is not."""
+    if encoding.lower().replace('_', '-') in ('utf-8', 'utf8', 'ascii'):
+        return block
+    return block.decode(encoding, 'replace').encode('utf-8')
+
+
+def _decode(payloads: Iterable[bytes]) -> List[Any]:
+    decoded = []
+    for payload in payloads:
+        try:
+            decoded.append(_loads(payload))
+        except ValueError:
+            logger.debug("Skipping undecodable embedded JSON payload.")
+    return decoded
+
+
+def _map_ld_job_posting(posting: Dict) -> Dict[str, Any]:
+    """Map a schema.org JobPosting onto parser columns."""
+    fields = {}
+    organization = posting.get('hiringOrganization') or {}
+    if isinstance(organization, dict):
+        fields['company_name'] = organization.get('name')
+        logo = organization.get('logo')
+        fields['company_logo_url'] = logo.get('url') if isinstance(logo, dict) else logo
+
+    job_location = _first(posting.get('jobLocation'))
+    address = job_location.get('address') if isinstance(job_location, dict) else None
+    if isinstance(address, dict):
+        parts = [address.get(k) for k in ('addressLocality', 'addressRegion', 'addressCountry')]
+        fields['location'] = ', '.join(p for p in parts if isinstance(p, str) and p) or None
+
+    employment_type = _first(posting.get('employmentType'))
+    if isinstance(employment_type, str):
+        fields['employment_type'] = _EMPLOYMENT_TYPE_LABELS.get(employment_type.upper(), employment_type)
+    if posting.get('jobLocationType') == 'TELECOMMUTE':
+        fields['workplace_type'] = 'Remote'
+
+    identifier = posting.get('identifier')
+    job_id = identifier.get('value') if isinstance(identifier, dict) else None
+    fields['job_link'] = posting.get('url')
+    fields['job_id'] = str(job_id) if job_id else None
+    fields['job_title'] = posting.get('title')
+    fields['job_description'] = _html_to_text(posting.get('description'))
+    fields['date_posted'] = posting.get('datePosted')
+    return fields
+
+
+def _referenced_company(entity: Dict, companies_by_urn: Dict[str, Dict]) -> Optional[Dict]:
+    """Find the company entity a JobPosting points to through its companyDetails URNs."""
+    pending = [entity.get('companyDetails')]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, dict):
+            pending.extend(value.values())
+        elif isinstance(value, list):
+            pending.extend(value)
+        elif isinstance(value, str) and value in companies_by_urn:
+            return companies_by_urn[value]
+    # Without a reference, a single company on the page is unambiguous
+    return next(iter(companies_by_urn.values())) if len(companies_by_urn) == 1 else None
+
+
+def _map_voyager_job_posting(entity: Dict, companies_by_urn: Dict[str, Dict]) -> Dict[str, Any]:
+    """Map a Voyager JobPosting entity (and the company it references) onto parser columns."""
+    fields = {}
+    urn_match = URN_ID_REGEX.search(str(entity.get('entityUrn') or entity.get('jobPostingId') or ''))
+    if urn_match:
+        fields['job_id'] = urn_match.group(1)
+        fields['job_link'] = f"https://www.linkedin.com/jobs/view/{urn_match.group(1)}/"
+
+    fields['job_title'] = entity.get('title') or entity.get('jobPostingTitle')
+    fields['location'] = entity.get('formattedLocation')
+    fields['employment_type'] = entity.get('formattedEmploymentStatus')
+    fields['experience_level'] = entity.get('formattedExperienceLevel')
+
+    description = entity.get('description')
+    if isinstance(description, dict):
+        fields['job_description'] = _html_to_text(description.get('text'))
+
+    listed_at = entity.get('listedAt') or entity.get('originalListedAt')
+    if isinstance(listed_at, (int, float)):
+        fields['date_posted'] = datetime.fromtimestamp(listed_at / 1000, tz=timezone.utc).isoformat()
+
+    company = _referenced_company(entity, companies_by_urn)
+    if company:
+        fields['company_name'] = company.get('name')
+    return fields
+
+
+def _voyager_entities(payload: Any) -> List[Dict]:
+    if not isinstance(payload, dict):
+        return []
+    entities = payload.get('included')
+    if isinstance(entities, list):
+        return [e for e in entities if isinstance(e, dict)]
+    data = payload.get('data')
+    return [data] if isinstance(data, dict) else []
+
+
+def extract_embedded_fields(html_bytes: bytes, expected_job_id: Optional[str] = None,
+                            encoding: str = 'utf-8') -> Dict[str, Any]:
+    """
+    Extract job fields from embedded JSON-LD and Voyager <code> payloads.
+
+    Search result pages embed postings for every card in the list, so when an
+    expected job id is known (from the capture filename) only the matching
+    posting is used; otherwise a payload is used only if it is unambiguous.
+
+    Args:
+        html_bytes: The raw page as bytes
+        expected_job_id: Job id the page was captured for, if known
+        encoding: Declared encoding of the page
+
+    Returns:
+        Dict with the fields that could be extracted (None values removed)
+    """
+    fields: Dict[str, Any] = {}
+
+    # --- JSON-LD ---
+    postings = []
+    for document in _decode(_as_utf8(block, encoding) for block in LD_JSON_REGEX.findall(html_bytes)):
+        items = document if isinstance(document, list) else \
+            document.get('@graph', [document]) if isinstance(document, dict) else []
+        if not isinstance(items, list):
+            items = [items]
+        for item in items:
+            if isinstance(item, dict) and item.get('@type') == 'JobPosting':
+                postings.append(_map_ld_job_posting(item))
+
+    # --- Voyager payloads in <code> blocks ---
+    if b'<code' in html_bytes:
+        entities = []
+        blocks = CODE_BLOCK_REGEX.findall(html_bytes)
+        for payload in _decode(html.unescape(block.decode(encoding, 'replace')).encode('utf-8') for block in blocks):
+            entities.extend(_voyager_entities(payload))
+        companies_by_urn = {
+            e.get('entityUrn'): e for e in entities
+            if str(e.get('$type', '')).endswith('Company') and e.get('name')
+        }
+        postings.extend(
+            _map_voyager_job_posting(e, companies_by_urn)
+            for e in entities
+            if str(e.get('$type', '')).endswith('JobPosting')
+        )
+
+    if expected_job_id:
+        postings = [p for p in postings if p.get('job_id') == expected_job_id]
+    elif len({p.get('job_id') for p in postings}) > 1:
+        logger.debug("Embedded metadata describes several postings and no job id is known. Ignoring it.")
+        postings = []
+
+    # Earlier sources win; later ones only fill gaps
+    for posting in postings:
+        for field, value in posting.items():
+            if value is not None and fields.get(field) is None:
+                fields[field] = value
+
+    return fields
@@ -5,22 +5,38 @@ from pathlib import Path
 import re
 from datetime import datetime, timezone
 import logging
-import io
-from typing import List, Dict, Any, Optional, Generator, Tuple
+from typing import List, Dict, Any, Optional, Generator
 import json
+import time
 
 # --- Google Cloud Imports ---
-from google.cloud import storage
-from google.oauth2 import service_account
+from google.auth.credentials import Credentials
+
+# --- Shared GCP credentials and clients (src/events/gcp_clients.py) ---
+import sys
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+import gcp_clients
 
 # --- Local Imports ---
 import config  # Import the configuration file
+from manifest import ParseManifest
+from partitioned_writer import (GcsPartitionedWriter, LocalPartitionedWriter, SUCCESS_MARKER,
+                                search_slug_from_source_file)
+from normalization import normalize_job_fields
+from embedded_metadata import extract_embedded_fields, job_id_from_filename
+from dedup import JobDeduplicator
+from parse_cache import ParseCache, content_hash
+from telemetry import ExtractionTelemetry, check_hit_rates, write_report
+from relevance_filter import RelevanceFilter, save_rejected
+from gcs_stream import stream_parquet_to_gcs
+from capture_archive import archive_captures, archive_object_name
+from selector_scope import ScopeStrainer, scope_strainer
 
 # --- Environment Variables ---
 from dotenv import load_dotenv
 
 # --- Prefect Imports ---
-from prefect import flow, task, get_run_logger
+from prefect import flow, get_run_logger
 # from functools import lru_cache
 
 # Load environment variables from .env file
@@ -34,9 +50,7 @@ logger = logging.getLogger(__name__)
 JOB_ID_REGEX = re.compile(r'(?:/view/|/jobs/|/postings/|/opportunities/)(\d{8,})/?')
 FALLBACK_JOB_ID_REGEX = re.compile(r'/(\d{10,})')
 LESS_SPECIFIC_JOB_ID_REGEX = re.compile(r'(\d{8,})')
-
-# --- Cache for GCS credentials ---
-_gcs_credentials = None
+CHARSET_REGEX = re.compile(rb'<meta[^>]+charset=["\']?([a-z0-9_\-]+)', re.I)
 
 class LinkedInJobParser:
     """Class to handle LinkedIn job HTML parsing with better performance."""
@@ -45,7 +59,8 @@ class LinkedInJobParser:
                  input_dir: Path, 
                  output_dir: Path, 
                  output_filename: str, 
-                 html_parser: str = 'html.parser'):
+                 html_parser: str = 'html.parser',
+                 parse_cache: Optional[ParseCache] = None):
         """
         Initialize the parser with configuration.
         
@@ -54,14 +69,20 @@ class LinkedInJobParser:
             output_dir: Directory where output will be saved
             output_filename: Name of the output file
             html_parser: Parser to use with BeautifulSoup
+            parse_cache: Optional cache of extracted fields keyed by page content
         """
         self.input_dir = input_dir
         self.output_dir = output_dir
         self.output_filename = output_filename
         self.html_parser = html_parser
+        self.parse_cache = parse_cache
         self.selectors = config.SELECTORS
         self.logger = logger
+        self.telemetry = ExtractionTelemetry(self.selectors)
         self.output_path = output_dir / output_filename
+        self.dataset_dir = output_dir / config.PARSED_DATASET_DIRNAME
+        # Counters and details collected over a run, written next to the output
+        self.run_stats: Dict[str, Any] = {}
         
         # Create output directory if it doesn't exist
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -86,6 +107,17 @@ class LinkedInJobParser:
                 self.get_text_selectors[field] = selector
             else:
                 self.text_selectors[field] = selector
+        # Strainers limiting the DOM to what the still-missing fields' selectors can match
+        self._scope_strainers: Dict[frozenset, Optional[ScopeStrainer]] = {}
+
+    def _strainer_for(self, fields: List[str]) -> Optional[ScopeStrainer]:
+        """Strainer keeping only the subtrees the selectors of these fields start at (None: full DOM)."""
+        if self.html_parser == 'html5lib':  # html5lib cannot parse a subset of the document
+            return None
+        key = frozenset(fields)
+        if key not in self._scope_strainers:
+            self._scope_strainers[key] = scope_strainer(self.selectors[field] for field in fields)
+        return self._scope_strainers[key]
     
     def find_html_files(self) -> List[Path]:
         """
@@ -174,49 +206,121 @@ class LinkedInJobParser:
             # Progress logging for long-running processes
             self.logger.debug(f"Processed batch {i//batch_size + 1}/{(total_files + batch_size - 1)//batch_size}")
     
-    def process_single_file(self, file_path: Path) -> Optional[Dict]:
+    @staticmethod
+    def detect_declared_encoding(prefix: bytes) -> str:
         """
-        Process a single HTML file and extract job data more efficiently.
+        Return the charset declared in the document prefix, defaulting to UTF-8
+        (the encoding the scraper writes captures in).
         """
-        self.logger.debug(f"Processing file: {file_path.name}")
-        
-        try:
-            # Read the HTML content - use a context manager for proper resource handling
-            with open(file_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-            
-            # Quick validation check before parsing
-            if not html_content or '<html' not in html_content.lower():
-                self.logger.warning(f"File {file_path.name} seems empty or not valid HTML.")
-                return None
-            
-            # Parse HTML once for all extractions
-            soup = BeautifulSoup(html_content, self.html_parser)
-            
-            # Initialize with the source file
-            job_data = {'source_file': file_path.name}
-            
-            # Extract job link and ID first
+        match = CHARSET_REGEX.search(prefix)
+        return match.group(1).decode('ascii') if match else 'utf-8'
+
+    def _extract_with_selectors(self, soup: BeautifulSoup, job_data: Dict, fields: set) -> None:
+        """
+        Extract the given fields from the parsed DOM using the configured CSS selectors.
+
+        Args:
+            soup: Parsed page
+            job_data: Record to fill in place
+            fields: Names of the fields to extract
+        """
+        # Extract job link and ID first
+        if 'job_link' in fields:
+            start = time.perf_counter()
             link_selector = self.selectors.get('job_link')
             link_element = soup.select_one(link_selector) if link_selector else None
             job_link = link_element.get('href') if link_element else None
             job_data['job_link'] = job_link
-            job_data['job_id'] = self.extract_job_id(job_link)
-            
-            # Extract text fields in one pass
-            for field, selector in self.text_selectors.items():
+            job_data['job_id'] = job_data.get('job_id') or self.extract_job_id(job_link)
+            self.telemetry.add_time('selector:job_link', time.perf_counter() - start)
+
+        # Extract text fields in one pass
+        for field, selector in self.text_selectors.items():
+            if field in fields and field != 'job_link':
+                start = time.perf_counter()
                 element = soup.select_one(selector)
                 job_data[field] = element.get_text(strip=True) if element else None
-            
-            # Extract multi-line text fields
-            for field, selector in self.get_text_selectors.items():
+                self.telemetry.add_time(f'selector:{field}', time.perf_counter() - start)
+
+        # Extract multi-line text fields
+        for field, selector in self.get_text_selectors.items():
+            if field in fields:
+                start = time.perf_counter()
                 element = soup.select_one(selector)
                 job_data[field] = element.get_text(separator='\n', strip=True) if element else None
-            
-            # Extract attribute fields
-            for field, (selector, attribute) in self.attribute_selectors.items():
+                self.telemetry.add_time(f'selector:{field}', time.perf_counter() - start)
+
+        # Extract attribute fields
+        for field, (selector, attribute) in self.attribute_selectors.items():
+            if field in fields:
+                start = time.perf_counter()
                 element = soup.select_one(selector)
                 job_data[field] = element.get(attribute) if element else None
+                self.telemetry.add_time(f'selector:{field}', time.perf_counter() - start)
+
+    def process_single_file(self, file_path: Path) -> Optional[Dict]:
+        """
+        Process a single HTML file and extract job data more efficiently.
+        """
+        self.logger.debug(f"Processing file: {file_path.name}")
+        
+        try:
+            # Read the raw bytes once; nothing below decodes the whole document
+            html_bytes = file_path.read_bytes()
+            
+            # Quick validation check before parsing, on a small prefix only
+            prefix = html_bytes[:config.HTML_SNIFF_BYTES].lower()
+            if not html_bytes or b'<html' not in prefix:
+                self.logger.warning(f"File {file_path.name} seems empty or not valid HTML.")
+                return None
+            encoding = self.detect_declared_encoding(prefix)
+            
+            # Initialize with the source file and its capture time (the scraper writes each page once)
+            job_data = {
+                'source_file': file_path.name,
+                'captured_at': datetime.fromtimestamp(file_path.stat().st_mtime, tz=timezone.utc).isoformat()
+            }
+
+            # An unchanged page yields the same fields as last time
+            expected_job_id = job_id_from_filename(file_path.name)
+            cache_key = None
+            if self.parse_cache:
+                start = time.perf_counter()
+                cache_key = content_hash(html_bytes, expected_job_id)
+                cached_fields = self.parse_cache.get(cache_key)
+                self.telemetry.add_time('parse_cache', time.perf_counter() - start)
+                if cached_fields is not None:
+                    job_data.update(cached_fields)
+                    self.telemetry.record_page(job_data, dict.fromkeys(cached_fields, 'parse_cache'))
+                    return job_data
+
+            # Structured metadata embedded in the page is cheaper and sturdier than the DOM
+            sources = {}
+            if config.USE_EMBEDDED_METADATA:
+                start = time.perf_counter()
+                try:
+                    embedded_fields = extract_embedded_fields(html_bytes, expected_job_id, encoding)
+                except Exception as e:
+                    # A malformed payload must not cost the page; the CSS selectors still apply
+                    self.logger.warning(f"Ignoring embedded metadata in {file_path.name}: {e}")
+                    embedded_fields = {}
+                self.telemetry.add_time('embedded_metadata', time.perf_counter() - start)
+                job_data.update(embedded_fields)
+                sources = dict.fromkeys(embedded_fields, 'embedded_metadata')
+                if job_data.get('job_link') and not job_data.get('job_id'):
+                    job_data['job_id'] = self.extract_job_id(job_data['job_link'])
+
+            # CSS selectors fill whatever the embedded metadata did not provide
+            missing_fields = [field for field in self.selectors if job_data.get(field) is None]
+            if missing_fields:
+                # Parse HTML once for all remaining extractions, handing the parser the raw bytes
+                # and keeping only the subtrees those fields' selectors can match
+                start = time.perf_counter()
+                soup = BeautifulSoup(html_bytes, self.html_parser, from_encoding=encoding,
+                                     parse_only=self._strainer_for(missing_fields))
+                self.telemetry.add_time('soup_build', time.perf_counter() - start)
+                self._extract_with_selectors(soup, job_data, set(missing_fields))
+            self.telemetry.record_page(job_data, sources)
             
             # Validation - only keep records with job_id
             if not job_data.get('job_id'):
@@ -224,6 +328,8 @@ class LinkedInJobParser:
                 if not config.KEEP_RECORDS_WITHOUT_JOB_ID:
                     return None
             
+            if cache_key:
+                self.parse_cache.put(cache_key, job_data)
             return job_data
             
         except FileNotFoundError:
@@ -249,7 +355,7 @@ class LinkedInJobParser:
             'job_id', 'job_title', 'company_name', 'location', 'employment_type',
             'experience_level', 'workplace_type', 'applicant_count', 'reposted_info',
             'skills_summary', 'application_type', 'job_description', 'job_link',
-            'company_logo_url', 'source_file'
+            'company_logo_url', 'source_file', 'captured_at', 'date_posted'
         ]
         
         # Start with an empty list of dataframes
@@ -316,91 +422,109 @@ class LinkedInJobParser:
                              exc_info=config.LOGGING_LEVEL)
             return False
 
+    def append_to_dataset(self, df: pd.DataFrame, ingestion_date: str) -> Optional[Path]:
+        """
+        Append a DataFrame as new part files to the partitioned local dataset.
 
-def get_gcs_credentials() -> service_account.Credentials:
-    """
-    Get Google Cloud Storage credentials efficiently using global cache.
-    Includes logging for the raw and processed private key from environment variables.
+        Existing parts are never rewritten, so repeated runs on the same day
+        accumulate rows instead of overwriting them.
 
-    Returns:
-        GCS service account credentials
-    """
-    global _gcs_credentials
+        Args:
+            df: DataFrame with the newly parsed rows
+            ingestion_date: Partition value in YYYY-MM-DD format
+
+        Returns:
+            Path of the ingestion date partition directory, or None if nothing was written
+        """
+        if df is None or df.empty:
+            self.logger.warning("DataFrame is None or empty. Nothing to append.")
+            return None
+
+        try:
+            writer = LocalPartitionedWriter(self.dataset_dir, config.TARGET_PART_FILE_BYTES)
+            marker = writer.write(df, ingestion_date)
+        except Exception as e:
+            self.logger.error(f"Error appending DataFrame to {self.dataset_dir}: {e}",
+                             exc_info=config.LOGGING_LEVEL)
+            return None
 
-    # Return cached credentials if available
-    if _gcs_credentials is not None:
-        logger.info("Returning cached GCS credentials.")
-        return _gcs_credentials
+        self.logger.info(f"Appended {len(df)} rows in {len(marker['run_parts'])} parts to {self.dataset_dir}")
+        return self.dataset_dir / f"ingestion_date={ingestion_date}"
 
-    logger.info("Loading GCP service account credentials from environment...")
+    def write_run_stats(self) -> Path:
+        """
+        Write the collected run stats as JSON into the output directory.
 
-    # --- Debugging: Log the raw private key from os.getenv ---
-    raw_private_key_env = os.getenv("PRIVATE_KEY")
+        Returns:
+            Path of the written file
+        """
+        stats_path = self.output_dir / config.RUN_STATS_FILENAME
+        with open(stats_path, 'w', encoding='utf-8') as f:
+            json.dump(self.run_stats, f, indent=2, default=str)
+        self.logger.info(f"Run stats written to {stats_path}")
+        return stats_path
 
-    if raw_private_key_env:
-        logger.info(f"Raw PRIVATE_KEY from env (first 30 chars): '{raw_private_key_env[:30]}'")
-        logger.info(f"Raw PRIVATE_KEY from env (last 30 chars): '{raw_private_key_env[-30:]}'")
-        # Check for literal '\\n' (two characters: backslash and n)
-        logger.info(f"Raw PRIVATE_KEY from env contains literal '\\\\n': {'\\n' in raw_private_key_env}")
-        # Check for actual newline character '\n'
-        logger.info(f"Raw PRIVATE_KEY from env contains actual newline: {'\n' in raw_private_key_env}")
-    else:
-        logger.warning("PRIVATE_KEY environment variable is not set or is empty.")
-        # Depending on your logic, you might want to raise an error here immediately
-        # if private_key is essential and not caught by the later validation.
-
-    # Process the private key (handle escaped newlines if any)
-    # The default "" for os.getenv and then replacing ensures it doesn't fail if PRIVATE_KEY is None
-    private_key_processed = os.getenv("PRIVATE_KEY", "").replace('\\n', '\n')
-    # --- End Debugging Logs ---
-
-    # Read required fields from environment
-    credentials_dict = {
-        "type": os.getenv("TYPE"),
-        "project_id": os.getenv("PROJECT_ID"),
-        "private_key_id": os.getenv("PRIVATE_KEY_ID"),
-        "private_key": private_key_processed, # Use the processed key
-        "client_email": os.getenv("CLIENT_EMAIL"),
-        "client_id": os.getenv("CLIENT_ID"),
-        "auth_uri": os.getenv("AUTH_URI"),
-        "token_uri": os.getenv("TOKEN_URI"),
-        "auth_provider_x509_cert_url": os.getenv("AUTH_PROVIDER_X509_CERT_URL"),
-        "client_x509_cert_url": os.getenv("CLIENT_X509_CERT_URL"),
-        "universe_domain": os.getenv("UNIVERSE_DOMAIN") # Often optional, can be None
-    }
-
-    # Validate required fields
-    # Note: "private_key" might be empty if PRIVATE_KEY env var was empty/missing
-    # and the .replace still results in an empty string.
-    required_fields = ["type", "project_id", "private_key_id", "private_key", "client_email"]
-    for field in required_fields:
-        if not credentials_dict.get(field): # Checks for None or empty string
-            logger.error(f"Missing required GCP credential field: {field}")
-            raise ValueError(f"Missing required GCP credential field: {field}")
-
-    # Create credentials object
-    try:
-        _gcs_credentials = service_account.Credentials.from_service_account_info(credentials_dict)
-        logger.info(f"Successfully loaded GCP credentials for {credentials_dict.get('client_email', 'N/A')}")
-        return _gcs_credentials
-    except Exception as e:
-        # Log the dictionary content (excluding the private key for security) if creation fails
-        debug_dict = {k: v for k, v in credentials_dict.items() if k != "private_key"}
-        debug_dict["private_key_present_and_non_empty"] = bool(credentials_dict.get("private_key"))
-        logger.error(f"Failed to create GCP credentials: {e}. Credentials dict (key redacted): {debug_dict}", exc_info=True)
-        raise
+    def read_partition(self, ingestion_date: str) -> Optional[pd.DataFrame]:
+        """
+        Read one ingestion date partition back into a DataFrame, one row per job_id.
 
+        Parts are append-only, so a capture that changed and was parsed again
+        leaves its superseded row in an earlier part. Parts are read in the order
+        they were written (as listed in the _SUCCESS marker) and only the newest
+        row of each job_id is kept.
 
-def save_data_to_gcs(df: pd.DataFrame, gcs_bucket_name: str) -> str:
+        Args:
+            ingestion_date: Partition value in YYYY-MM-DD format
+
+        Returns:
+            DataFrame with the current rows of the partition, or None if it does not exist
+        """
+        partition_dir = self.dataset_dir / f"ingestion_date={ingestion_date}"
+        part_files = sorted(partition_dir.rglob('part-*.parquet'))
+        if not part_files:
+            return None
+
+        # Marker order is write order; parts missing from it (interrupted run) go last
+        marker_path = partition_dir / SUCCESS_MARKER
+        written_order: Dict[Path, int] = {}
+        if marker_path.is_file():
+            try:
+                marker_parts = json.loads(marker_path.read_text(encoding='utf-8')).get('parts', [])
+                written_order = {self.dataset_dir / part['path']: i for i, part in enumerate(marker_parts)}
+            except json.JSONDecodeError:
+                self.logger.warning(f"Ignoring unreadable marker {marker_path}")
+        part_files.sort(key=lambda p: written_order.get(p, len(written_order)))
+
+        df = pd.concat((pd.read_parquet(p) for p in part_files), ignore_index=True)
+        superseded = df['job_id'].notna() & df.duplicated(subset='job_id', keep='last')
+        if superseded.any():
+            self.logger.info(f"Dropping {int(superseded.sum())} superseded rows from partition {ingestion_date}")
+            df = df[~superseded].reset_index(drop=True)
+        return df
+
+
+def get_gcs_credentials() -> Credentials:
+    """
+    Get the process-wide GCP credentials (built once and shared by every client, see gcp_clients).
+
+    Returns:
+        GCS service account credentials
+    """
+    return gcp_clients.get_credentials()
+
+
+def save_data_to_gcs(df: pd.DataFrame, gcs_bucket_name: str, layout: str = config.OUTPUT_LAYOUT) -> str:
     """
     Save DataFrame directly to Google Cloud Storage efficiently.
     
     Args:
         df: DataFrame to save
         gcs_bucket_name: Name of the GCS bucket
+        layout: "daily" for a single linkedin_scrap_<date>.parquet, or "partitioned"
+            to append ingestion_date=/search= part files with a _SUCCESS marker
         
     Returns:
-        GCS URI of the uploaded file or error message
+        GCS URI of the uploaded file (or dataset prefix) or error message
     """
     if df is None or df.empty:
         logger.warning("No data was successfully collected. Skipping GCS upload.")
@@ -416,52 +540,35 @@ def save_data_to_gcs(df: pd.DataFrame, gcs_bucket_name: str) -> str:
         
         # Generate filename with timestamp
         today_date_str = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+
+        if layout == "partitioned":
+            storage_client = gcp_clients.get_storage_client()
+            writer = GcsPartitionedWriter(
+                storage_client.bucket(gcs_bucket_name),
+                gcs_output_path_prefix,
+                config.TARGET_PART_FILE_BYTES
+            )
+            marker = writer.write(df.drop(columns=['experiments'], errors='ignore'), today_date_str)
+            gcs_output_uri = f"gs://{gcs_bucket_name}/{gcs_output_path_prefix}/ingestion_date={today_date_str}/"
+            logger.info(f"Appended {len(marker['run_parts'])} parts to {gcs_output_uri} ({marker['total_rows']} rows for the day)")
+            return gcs_output_uri
+
         output_filename = f"linkedin_scrap_{today_date_str}.parquet"
         blob_name = f"{gcs_output_path_prefix}/{output_filename}"
         gcs_output_uri = f"gs://{gcs_bucket_name}/{blob_name}"
         
         logger.info(f"Preparing to upload {len(df)} records to {gcs_output_uri}")
         
-        # Get GCS credentials
-        gcs_credentials = get_gcs_credentials()
-        
-        # Create buffer for serialization
-        parquet_buffer = io.BytesIO()
-        
         # Optimize memory by dropping unnecessary columns
         column_to_drop = 'experiments'
         if column_to_drop in df.columns:
             df = df.drop(column_to_drop, axis=1)
             logger.info(f"Dropping '{column_to_drop}' column before saving to Parquet.")
         
-        # Serialize to Parquet with optimal settings
-        df.to_parquet(
-            parquet_buffer, 
-            index=False, 
-            engine='pyarrow', 
-            compression='snappy',
-            row_group_size=100000
-        )
-        
-        parquet_buffer.seek(0)
-        
-        # Calculate buffer size for logging
-        buffer_size = parquet_buffer.getbuffer().nbytes
-        logger.info(f"Serialized data size: {buffer_size / 1024 / 1024:.2f} MB.")
-        
-        # Upload to GCS
-        storage_client = storage.Client(credentials=gcs_credentials)
-        bucket = storage_client.bucket(gcs_bucket_name)
-        blob = bucket.blob(blob_name)
-        
-        # Use a longer timeout for large files
-        timeout = max(300, buffer_size // (1024 * 1024) * 5)  # 5 seconds per MB
-        
-        blob.upload_from_file(
-            parquet_buffer, 
-            content_type='application/parquet',
-            timeout=timeout
-        )
+        # Stream row groups into a resumable upload session (chunks are retried individually)
+        storage_client = gcp_clients.get_storage_client()
+        blob = storage_client.bucket(gcs_bucket_name).blob(blob_name)
+        stream_parquet_to_gcs(df, blob)
         
         logger.info(f"Successfully uploaded Parquet file to {gcs_output_uri}")
         return gcs_output_uri
@@ -482,7 +589,9 @@ def linkedin_parser_flow(
     output_dir: Path = config.DEFAULT_OUTPUT_DIR,
     output_filename: str = config.DEFAULT_OUTPUT_FILENAME,
     upload_to_gcs: bool = True,
-    batch_size: int = 500  # Added batch size parameter
+    batch_size: int = 500,  # Added batch size parameter
+    incremental: bool = True,
+    archive_raw_captures: bool = config.ARCHIVE_CAPTURES
 ):
     """
     Prefect flow to parse LinkedIn job HTML files efficiently without multithreading.
@@ -493,6 +602,10 @@ def linkedin_parser_flow(
         output_filename: Name of the output file
         upload_to_gcs: Whether to upload to GCS
         batch_size: Number of files to process in each batch
+        incremental: Only parse new or changed files (tracked by the parse manifest)
+            and append them to the partitioned dataset instead of rebuilding the output
+        archive_raw_captures: Also archive this run's raw HTML captures to GCS so they
+            can be re-parsed later (requires upload_to_gcs)
     """
     run_logger = get_run_logger()
     run_logger.info(f"Starting LinkedIn Job Parser Flow...")
@@ -501,9 +614,9 @@ def linkedin_parser_flow(
     run_logger.info(f"Using Output Filename: {output_filename}")
     run_logger.info(f"Using HTML Parser: {config.DEFAULT_HTML_PARSER}")
     run_logger.info(f"Batch Size: {batch_size}")
+    run_logger.info(f"Incremental Mode: {incremental}")
+    run_logger.info(f"Archive Raw Captures: {archive_raw_captures}")
 
-    run_logger.info(get_gcs_credentials())
-    
     # Get GCS bucket name
     gcs_bucket_name = os.getenv("GCS_BUCKET_NAME")
     
@@ -521,31 +634,145 @@ def linkedin_parser_flow(
     if not html_files:
         run_logger.error("No HTML files found. Aborting flow.")
         return
+    parser.run_stats['started_at'] = datetime.now(timezone.utc).isoformat()
+    parser.run_stats['files_found'] = len(html_files)
+
+    # Skip files that were already parsed and have not changed since
+    manifest = None
+    if incremental:
+        manifest = ParseManifest(output_dir / config.PARSE_MANIFEST_FILENAME)
+        html_files = manifest.select_changed(html_files)
+        parser.run_stats['files_unchanged'] = parser.run_stats['files_found'] - len(html_files)
+        if not html_files:
+            manifest.save()
+            run_logger.info("No new or changed HTML files since the last run. Nothing to parse.")
+            return
     
+    # Keep the raw captures so history can be re-parsed when selectors change. This runs
+    # before parsing: a run whose selectors broke is exactly the one that needs re-parsing
+    if upload_to_gcs and archive_raw_captures:
+        try:
+            bucket = gcp_clients.get_storage_client().bucket(gcs_bucket_name)
+            object_name = archive_object_name(
+                os.getenv("GCS_CAPTURE_ARCHIVE_PATH", config.GCS_CAPTURE_ARCHIVE_PATH),
+                datetime.now(timezone.utc).strftime('%Y-%m-%d'),
+                parser.run_stats['started_at']
+            )
+            archive_manifest = archive_captures(html_files, bucket, object_name)
+            parser.run_stats['capture_archive'] = archive_manifest['archive']
+            run_logger.info(f"Raw captures archived to {archive_manifest['archive']}")
+        except Exception as e:
+            run_logger.error(f"Failed to archive raw captures: {e}", exc_info=True)
+
     # Process files in batches and create DataFrame
+    parser.run_stats['files_parsed'] = len(html_files)
+    parse_cache = ParseCache(output_dir / config.PARSE_CACHE_FILENAME) if config.USE_PARSE_CACHE else None
+    parser.parse_cache = parse_cache
     data_batches = parser.process_html_batch(html_files, batch_size=batch_size)
+
+    # Keep one record per job_id (the most complete, then the latest capture)
+    deduplicator = None
+    if config.DEDUPLICATE_JOBS:
+        deduplicator = JobDeduplicator()
+        data_batches = deduplicator.deduplicate(data_batches, batch_size=batch_size)
+
     df = parser.create_dataframe_from_batches(data_batches)
+    if parse_cache:
+        parse_cache.close()
+        parser.run_stats.update(parse_cache.stats)
+        run_logger.info(f"Parse cache: {parse_cache.hits} hits, {parse_cache.misses} misses.")
+    if deduplicator:
+        parser.run_stats.update(deduplicator.stats)
+        run_logger.info(f"Deduplication dropped {len(deduplicator.dropped)} duplicate job records.")
+    
+    # Field hit rates tell us when LinkedIn markup changed under the selectors
+    extraction_report = parser.telemetry.report()
+    hit_rate_violations = check_hit_rates(extraction_report, config.FIELD_HIT_RATE_THRESHOLDS,
+                                          min_pages=config.HIT_RATE_CHECK_MIN_PAGES)
+    write_report(extraction_report, output_dir / config.EXTRACTION_REPORT_FILENAME, hit_rate_violations)
+    for violation in hit_rate_violations:
+        run_logger.error(f"Extraction hit rate below threshold - {violation}")
     
     if df is None or df.empty:
         run_logger.warning("No data was successfully processed. Aborting flow.")
+        parser.write_run_stats()
         return
+    parser.run_stats['records'] = len(df)
+
+    if hit_rate_violations and config.HIT_RATE_ON_VIOLATION == "fail":
+        parser.write_run_stats()
+        raise RuntimeError(
+            f"{len(hit_rate_violations)} fields below their extraction hit-rate threshold; "
+            f"selectors probably need updating. See {config.EXTRACTION_REPORT_FILENAME}."
+        )
+
+    # Derive typed columns (applicant counts, posting timestamps, enum codes)
+    df = normalize_job_fields(df)
+
+    # Drop out-of-scope postings before anything is saved, uploaded or labeled
+    rejected = df.iloc[0:0]
+    if config.RELEVANCE_FILTER_ENABLED:
+        df, rejected = RelevanceFilter.from_config().apply(df)
+        save_rejected(rejected, output_dir, parser.run_stats['started_at'])
+        parser.run_stats['rejected'] = RelevanceFilter.reason_counts(rejected)
+        parser.run_stats['records'] = len(df)
+        if df.empty:
+            run_logger.warning("All parsed jobs were rejected by the relevance filter. Nothing to save.")
+            if manifest:
+                for file_path in html_files:
+                    manifest.record(file_path, None, None)
+                manifest.save()
+            parser.write_run_stats()
+            return
     
     # Save locally
-    local_save_success = parser.save_dataframe(df)
-    
-    if local_save_success:
-        run_logger.info(f"Output saved locally to {parser.output_path}")
+    if incremental:
+        ingestion_date = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+        partition_dir = parser.append_to_dataset(df, ingestion_date)
+        local_save_success = partition_dir is not None
+        if local_save_success:
+            # Only commit the manifest once the rows are safely on disk
+            job_ids_by_file = dict(zip(df['source_file'], df['job_id']))
+            # Dropped duplicates point at the partition of the record that was kept
+            kept_file_by_file = {name: name for name in job_ids_by_file}
+            # Rejected jobs were parsed but have no partition
+            job_ids_by_file.update(zip(rejected['source_file'], rejected['job_id']))
+            for duplicate in (deduplicator.dropped if deduplicator else []):
+                job_ids_by_file[duplicate['dropped_source_file']] = duplicate['job_id']
+                kept_file_by_file[duplicate['dropped_source_file']] = kept_file_by_file.get(duplicate['kept_source_file'])
+            for file_path in html_files:
+                kept_file = kept_file_by_file.get(file_path.name)
+                partition = f"{partition_dir.name}/search={search_slug_from_source_file(kept_file)}"
+                manifest.record(
+                    file_path,
+                    job_ids_by_file.get(file_path.name),
+                    partition if kept_file else None
+                )
+            manifest.save()
+            run_logger.info(f"Output appended locally to {partition_dir}")
+            # A daily file must contain the whole day so same-day reruns do not shrink it;
+            # the partitioned layout appends, so only the new rows are uploaded
+            upload_df = df if config.OUTPUT_LAYOUT == "partitioned" else parser.read_partition(ingestion_date)
     else:
+        local_save_success = parser.save_dataframe(df)
+        upload_df = df
+        if local_save_success:
+            run_logger.info(f"Output saved locally to {parser.output_path}")
+    
+    if not local_save_success:
         run_logger.error("Failed to save the output DataFrame locally.")
+        upload_df = df
     
     # Upload to GCS if requested
     if upload_to_gcs:
         try:
-            gcs_uri = save_data_to_gcs(df, gcs_bucket_name)
+            gcs_uri = save_data_to_gcs(upload_df, gcs_bucket_name)
             run_logger.info(f"Data uploaded to GCS: {gcs_uri}")
         except Exception as e:
             run_logger.error(f"Failed to upload data to GCS: {e}", exc_info=True)
-    
+
+    parser.run_stats['finished_at'] = datetime.now(timezone.utc).isoformat()
+    parser.write_run_stats()
     run_logger.info(f"Flow completed successfully with {len(df)} records processed.")
 
 
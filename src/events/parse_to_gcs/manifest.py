@@ -0,0 +1,144 @@
+# manifest.py
+"""
+Content-hash manifest for incremental parsing of LinkedIn job HTML captures.
+
+The manifest remembers, for every HTML file that was already parsed, its size,
+modification time and SHA-256 content hash together with the job id and the
+dataset partition its row was appended to. On the next run only files that are
+new or whose content actually changed are handed to the parser.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class ParseManifest:
+    """Persistent record of parsed HTML files, stored as a JSON document."""
+
+    def __init__(self, manifest_path: Path):
+        """
+        Load the manifest from disk, starting empty if it does not exist yet.
+
+        Args:
+            manifest_path: Location of the manifest JSON file
+        """
+        self.manifest_path = Path(manifest_path)
+        self.entries: Dict[str, Dict] = {}
+        # Stat and hash of files selected for parsing, committed by record()
+        self.pending: Dict[str, Dict] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not self.manifest_path.is_file():
+            logger.info(f"No parse manifest at {self.manifest_path}. Starting a new one.")
+            return
+
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            # A corrupt manifest only costs a full re-parse, never wrong data
+            logger.warning(f"Could not read parse manifest {self.manifest_path}: {e}. Starting a new one.")
+            return
+
+        if payload.get('version') != MANIFEST_VERSION:
+            logger.warning(f"Parse manifest version {payload.get('version')} is not supported. Starting a new one.")
+            return
+
+        self.entries = payload.get('files', {})
+        logger.info(f"Loaded parse manifest with {len(self.entries)} entries from {self.manifest_path}")
+
+    def save(self) -> None:
+        """Write the manifest atomically so an interrupted run never truncates it."""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(self.manifest_path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'files': self.entries}, f)
+        os.replace(tmp_path, self.manifest_path)
+        logger.info(f"Saved parse manifest with {len(self.entries)} entries to {self.manifest_path}")
+
+    @staticmethod
+    def _key(file_path: Path) -> str:
+        return str(Path(file_path).resolve())
+
+    @staticmethod
+    def hash_file(file_path: Path) -> str:
+        """Return the SHA-256 hex digest of a file, read in chunks."""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def select_changed(self, html_files: Iterable[Path]) -> List[Path]:
+        """
+        Split the given files into those that need parsing and those that do not.
+
+        Files whose size and mtime match the manifest are skipped without being
+        read. Files whose stat changed are hashed; if the content hash still
+        matches, only the stat information is refreshed.
+
+        Args:
+            html_files: Candidate HTML files
+
+        Returns:
+            Files that are new or changed and need parsing
+        """
+        to_parse = []
+        unchanged = 0
+
+        for file_path in html_files:
+            key = self._key(file_path)
+            try:
+                stat = file_path.stat()
+            except OSError as e:
+                logger.warning(f"Could not stat {file_path}: {e}")
+                continue
+
+            entry = self.entries.get(key)
+            if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                unchanged += 1
+                continue
+
+            content_hash = self.hash_file(file_path)
+            if entry and entry['sha256'] == content_hash:
+                # Touched but not modified: remember the new stat and skip it
+                entry['size'] = stat.st_size
+                entry['mtime_ns'] = stat.st_mtime_ns
+                unchanged += 1
+                continue
+
+            to_parse.append(file_path)
+            self.pending[key] = {
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'sha256': content_hash,
+            }
+
+        logger.info(f"Parse manifest: {len(to_parse)} new or changed files, {unchanged} unchanged files skipped.")
+        return to_parse
+
+    def record(self, file_path: Path, job_id: Optional[str], partition: Optional[str]) -> None:
+        """
+        Record a parsed file in the manifest.
+
+        Args:
+            file_path: The HTML file that was parsed (as returned by select_changed)
+            job_id: Job id of the parsed row, or None if the file yielded no row
+            partition: Dataset partition the row was appended to, if any
+        """
+        key = self._key(file_path)
+        self.entries[key] = {
+            **self.pending.pop(key),
+            'job_id': job_id,
+            'partition': partition,
+        }
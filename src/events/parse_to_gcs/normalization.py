@@ -0,0 +1,137 @@
+# normalization.py
+"""
+Vectorized normalization of the raw text fields extracted from LinkedIn pages.
+
+The parser stores what the page shows ("Over 100 applicants", "Reposted 3 days
+ago", "Hybrid"). This stage derives typed columns from those strings so that
+downstream filtering and aggregation work on integers, timestamps and
+categoricals instead of repeated string scans. The raw columns are kept as-is.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# --- Enum categories (stable order, so categorical codes never shift) ---
+WORKPLACE_TYPES = pd.CategoricalDtype(['on_site', 'hybrid', 'remote'])
+EMPLOYMENT_TYPES = pd.CategoricalDtype(
+    ['full_time', 'part_time', 'contract', 'temporary', 'internship', 'volunteer', 'other']
+)
+EXPERIENCE_LEVELS = pd.CategoricalDtype(
+    ['internship', 'entry_level', 'associate', 'mid_senior_level', 'director', 'executive']
+)
+APPLICANT_BUCKETS = pd.CategoricalDtype(['0-25', '25-50', '50-100', '100+'], ordered=True)
+
+# Display text (lowercased) -> enum value
+_WORKPLACE_MAP = {'on-site': 'on_site', 'onsite': 'on_site', 'hybrid': 'hybrid', 'remote': 'remote'}
+_EMPLOYMENT_MAP = {
+    'full-time': 'full_time', 'part-time': 'part_time', 'contract': 'contract',
+    'temporary': 'temporary', 'internship': 'internship', 'volunteer': 'volunteer', 'other': 'other',
+}
+_EXPERIENCE_MAP = {
+    'internship': 'internship', 'entry level': 'entry_level', 'associate': 'associate',
+    'mid-senior level': 'mid_senior_level', 'director': 'director', 'executive': 'executive',
+}
+
+_AGE_UNIT_SECONDS = {
+    'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400,
+    'week': 7 * 86400, 'month': 30 * 86400, 'year': 365 * 86400,
+}
+_AGE_REGEX = r'(?P<amount>\d+)\s+(?P<unit>second|minute|hour|day|week|month|year)s?\s+ago'
+
+
+def _to_enum(series: pd.Series, mapping: dict, dtype: pd.CategoricalDtype) -> pd.Series:
+    """Map display strings onto a fixed categorical; unknown values become NaN."""
+    return series.astype('string').str.strip().str.lower().map(mapping).astype(dtype)
+
+
+def normalize_applicant_count(applicant_count: pd.Series) -> pd.DataFrame:
+    """
+    Derive a numeric applicant count and a size bucket from the raw text.
+
+    "37 applicants" -> 37, "Over 100 applicants" -> 100 (lower bound, bucket 100+),
+    "Be among the first 25 applicants" -> <NA> (bucket 0-25).
+    """
+    text = applicant_count.astype('string').str.lower()
+    number = pd.to_numeric(text.str.extract(r'(\d[\d,]*)', expand=False).str.replace(',', '', regex=False),
+                           errors='coerce').astype('Int32')
+    is_over = text.str.contains(r'\bover\b|\+', regex=True, na=False)
+    is_first = text.str.contains('among the first', regex=False, na=False)
+
+    bucket = pd.Series(pd.NA, index=applicant_count.index, dtype='object')
+    bucket[number.lt(25).fillna(False) | is_first] = '0-25'
+    bucket[number.between(25, 49).fillna(False) & ~is_first] = '25-50'
+    bucket[number.between(50, 99).fillna(False) & ~is_first] = '50-100'
+    bucket[number.ge(100).fillna(False) | (is_over & number.notna())] = '100+'
+
+    return pd.DataFrame({
+        'applicant_count_num': number.mask(is_first),
+        'applicant_count_bucket': bucket.astype(APPLICANT_BUCKETS),
+    }, index=applicant_count.index)
+
+
+def normalize_posting_age(reposted_info: pd.Series, captured_at: pd.Series) -> pd.DataFrame:
+    """
+    Turn relative ages ("Reposted 3 days ago", "2 weeks ago") into UTC timestamps.
+
+    The age is subtracted from the capture time of each page; 'posted_at' is set for
+    original postings and 'reposted_at' for reposts.
+    """
+    text = reposted_info.astype('string').str.lower()
+    parts = text.str.extract(_AGE_REGEX)
+    age_seconds = pd.to_numeric(parts['amount'], errors='coerce') * parts['unit'].map(_AGE_UNIT_SECONDS)
+    listed_at = captured_at - pd.to_timedelta(age_seconds, unit='s')
+
+    is_reposted = text.str.startswith('reposted').astype('boolean')
+    return pd.DataFrame({
+        'is_reposted': is_reposted,
+        'posted_at': listed_at.where(~is_reposted.fillna(False)),
+        'reposted_at': listed_at.where(is_reposted.fillna(False)),
+    }, index=reposted_info.index)
+
+
+def normalize_job_fields(df: pd.DataFrame, default_captured_at: Optional[datetime] = None) -> pd.DataFrame:
+    """
+    Add typed columns derived from the raw text fields of parsed jobs.
+
+    Args:
+        df: DataFrame produced by LinkedInJobParser.create_dataframe_from_batches
+        default_captured_at: Capture time used for rows without 'captured_at' (defaults to now)
+
+    Returns:
+        The DataFrame with applicant_count_num/_bucket, is_reposted, posted_at,
+        reposted_at, captured_at and the *_code enum columns added
+    """
+    if df is None or df.empty:
+        return df
+
+    def column(name: str) -> pd.Series:
+        return df[name] if name in df.columns else pd.Series(pd.NA, index=df.index, dtype='string')
+
+    fallback = pd.Timestamp(default_captured_at or datetime.now(timezone.utc))
+    if fallback.tzinfo is None:
+        fallback = fallback.tz_localize('UTC')
+    captured_at = pd.to_datetime(column('captured_at'), utc=True, errors='coerce').fillna(fallback)
+
+    normalized = df.assign(captured_at=captured_at)
+    normalized = normalized.join(normalize_applicant_count(column('applicant_count')))
+    normalized = normalized.join(normalize_posting_age(column('reposted_info'), captured_at))
+    # An absolute date from embedded metadata beats one derived from a relative age
+    date_posted = pd.to_datetime(column('date_posted'), utc=True, errors='coerce', format='ISO8601')
+    original_posting = ~normalized['is_reposted'].fillna(False)
+    normalized['posted_at'] = date_posted.where(original_posting & date_posted.notna(), normalized['posted_at'])
+    normalized['workplace_type_code'] = _to_enum(column('workplace_type'), _WORKPLACE_MAP, WORKPLACE_TYPES)
+    normalized['employment_type_code'] = _to_enum(column('employment_type'), _EMPLOYMENT_MAP, EMPLOYMENT_TYPES)
+    normalized['experience_level_code'] = _to_enum(column('experience_level'), _EXPERIENCE_MAP, EXPERIENCE_LEVELS)
+
+    logger.info(
+        f"Normalized {len(normalized)} rows: "
+        f"{normalized['applicant_count_bucket'].notna().sum()} applicant buckets, "
+        f"{(normalized['posted_at'].notna() | normalized['reposted_at'].notna()).sum()} posting timestamps, "
+        f"{normalized['workplace_type_code'].notna().sum()} workplace codes."
+    )
+    return normalized
@@ -0,0 +1,166 @@
+# parse_cache.py
+"""
+Persistent cache of parse results keyed by page content.
+
+Re-parsing a capture that has not changed (a rerun over the same directory, or
+the same posting captured again on a later day) always yields the same fields.
+ParseCache stores the extracted field dict in a SQLite file under a hash of the
+page with its volatile markup removed (scripts, styles, icons, comments and
+whitespace), so such pages skip extraction entirely.
+
+Every entry is tagged with a hash of config.SELECTORS and the parser version:
+entries written under another tag are never returned and are purged when the
+cache is opened. The store is bounded by size and evicts least recently used
+entries first.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# Bump when extraction logic changes in a way the selectors do not capture
+PARSER_VERSION = "1"
+
+# Fields that belong to the capture rather than to the page content
+_PER_FILE_FIELDS = ('source_file', 'captured_at')
+
+# Markup that changes between captures of the same posting but never carries job fields.
+# JSON-LD scripts and <code> payloads are read by embedded_metadata, so they are kept.
+_VOLATILE_MARKUP_REGEX = re.compile(
+    rb'<script(?![^>]*application/ld\+json)[^>]*>.*?</script>'
+    rb'|<style[^>]*>.*?</style>'
+    rb'|<svg[^>]*>.*?</svg>'
+    rb'|<!--.*?-->',
+    re.S | re.I
+)
+_WHITESPACE_REGEX = re.compile(rb'\s+')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS parse_cache (
+    content_hash TEXT PRIMARY KEY,
+    config_tag TEXT NOT NULL,
+    fields BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+)
+"""
+
+
+def selector_config_tag() -> str:
+    """Hash of everything that decides what extraction returns for a given page."""
+    payload = json.dumps({
+        'selectors': config.SELECTORS,
+        'use_embedded_metadata': config.USE_EMBEDDED_METADATA,
+        'parser_version': PARSER_VERSION,
+    }, sort_keys=True)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def content_hash(html_bytes: bytes, expected_job_id: Optional[str] = None) -> str:
+    """
+    Hash the page with volatile markup stripped and whitespace collapsed.
+
+    The job id from the capture filename is part of the key because embedded
+    metadata extraction picks the posting that matches it.
+    """
+    normalized = _WHITESPACE_REGEX.sub(b' ', _VOLATILE_MARKUP_REGEX.sub(b'', html_bytes))
+    digest = hashlib.blake2b(normalized, digest_size=20)
+    digest.update(b'\0' + (expected_job_id or '').encode('ascii'))
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """Size-bounded SQLite store mapping content hashes to extracted field dicts."""
+
+    def __init__(self, cache_path: Path, max_bytes: int = config.PARSE_CACHE_MAX_BYTES,
+                 commit_every: int = 200):
+        """
+        Open (or create) the cache and drop entries written under another selector config.
+
+        Args:
+            cache_path: SQLite file to use
+            max_bytes: Total size of cached field payloads before LRU eviction starts
+            commit_every: Number of writes between commits
+        """
+        self.cache_path = Path(cache_path)
+        self.max_bytes = max_bytes
+        self.commit_every = commit_every
+        self.tag = selector_config_tag()
+        self.hits = 0
+        self.misses = 0
+        self._pending_writes = 0
+
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.cache_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        purged = self._conn.execute("DELETE FROM parse_cache WHERE config_tag != ?", (self.tag,)).rowcount
+        if purged:
+            logger.info(f"Selector config changed; purged {purged} parse cache entries.")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM parse_cache").fetchone()[0]
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached fields for a content hash, or None on a miss."""
+        row = self._conn.execute(
+            "SELECT fields FROM parse_cache WHERE content_hash = ? AND config_tag = ?", (key, self.tag)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._conn.execute("UPDATE parse_cache SET last_used = ? WHERE content_hash = ?", (time.time(), key))
+        self._count_write()
+        return json.loads(row[0])
+
+    def put(self, key: str, fields: Dict[str, Any]) -> None:
+        """Store the extracted fields of a page (per-capture fields are left out)."""
+        payload = json.dumps({k: v for k, v in fields.items() if k not in _PER_FILE_FIELDS}).encode('utf-8')
+        previous = self._conn.execute("SELECT size FROM parse_cache WHERE content_hash = ?", (key,)).fetchone()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO parse_cache (content_hash, config_tag, fields, size, last_used) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, self.tag, payload, len(payload), time.time())
+        )
+        self._total_bytes += len(payload) - (previous[0] if previous else 0)
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+        self._count_write()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache is back to 90% of its budget."""
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+        rows = self._conn.execute("SELECT content_hash, size FROM parse_cache ORDER BY last_used").fetchall()
+        for key, size in rows:
+            if self._total_bytes <= target:
+                break
+            self._conn.execute("DELETE FROM parse_cache WHERE content_hash = ?", (key,))
+            self._total_bytes -= size
+            evicted += 1
+        logger.debug(f"Evicted {evicted} parse cache entries.")
+
+    def _count_write(self) -> None:
+        self._pending_writes += 1
+        if self._pending_writes >= self.commit_every:
+            self._conn.commit()
+            self._pending_writes = 0
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Summary for the run stats."""
+        return {'parse_cache_hits': self.hits, 'parse_cache_misses': self.misses}
+
+    def close(self) -> None:
+        """Commit pending writes and close the database."""
+        self._conn.commit()
+        self._conn.close()
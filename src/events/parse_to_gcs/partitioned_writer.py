@@ -0,0 +1,211 @@
+# partitioned_writer.py
+"""
+Hive-partitioned, multi-file Parquet output for parsed LinkedIn jobs.
+
+Rows are laid out as
+
+    <base>/ingestion_date=YYYY-MM-DD/search=<slug>/part-NNNNN.parquet
+
+with parts capped at a target size and a ``_SUCCESS`` marker per ingestion
+date that lists every part written so far. Parts are only ever added, never
+rewritten, so reruns on the same day append instead of overwriting.
+"""
+
+import io
+import json
+from abc import ABC, abstractmethod
+import logging
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+SUCCESS_MARKER = "_SUCCESS"
+UNKNOWN_SEARCH_SLUG = "unknown"
+
+# Matches the capture filenames written by the scraper:
+# linkedin_{keywords}_{location}_p{page}_id{job_id}.html
+SEARCH_SLUG_REGEX = re.compile(r'^linkedin_(?P<slug>.+?)_p\d+_id\d+\.html?$')
+PART_NUMBER_REGEX = re.compile(r'part-(\d+)\.parquet$')
+
+
+def search_slug_from_source_file(source_file: Optional[str]) -> str:
+    """
+    Derive the search partition value from a capture filename.
+
+    Args:
+        source_file: Name of the HTML capture, e.g. linkedin_data_engineer_Lisbon_p01_id123.html
+
+    Returns:
+        Lowercase slug such as 'data_engineer_lisbon', or 'unknown'
+    """
+    if not source_file:
+        return UNKNOWN_SEARCH_SLUG
+    match = SEARCH_SLUG_REGEX.match(source_file)
+    if not match:
+        return UNKNOWN_SEARCH_SLUG
+    return re.sub(r'[^a-z0-9_]+', '_', match.group('slug').lower()).strip('_') or UNKNOWN_SEARCH_SLUG
+
+
+def split_table(table: pa.Table, target_file_bytes: int) -> List[pa.Table]:
+    """
+    Split an Arrow table into slices of at most roughly target_file_bytes.
+
+    The in-memory size is used as the estimate, which is an upper bound for the
+    compressed Parquet size, so parts end up at or below the target.
+    """
+    if table.num_rows == 0:
+        return []
+    bytes_per_row = max(1, table.nbytes // table.num_rows)
+    rows_per_part = max(1, target_file_bytes // bytes_per_row)
+    return [table.slice(offset, rows_per_part) for offset in range(0, table.num_rows, rows_per_part)]
+
+
+class PartitionedParquetWriter(ABC):
+    """Base writer; subclasses provide storage for listing and writing objects."""
+
+    def __init__(self, target_file_bytes: int):
+        self.target_file_bytes = target_file_bytes
+
+    # --- Storage primitives (implemented by subclasses) ---
+
+    @abstractmethod
+    def _list_part_names(self, relative_dir: str) -> List[str]:
+        """File names of the parts directly below relative_dir."""
+
+    @abstractmethod
+    def _read_text(self, relative_path: str) -> Optional[str]:
+        """Contents of a text object, or None if it does not exist."""
+
+    @abstractmethod
+    def _write_bytes(self, relative_path: str, data: bytes, content_type: str) -> None:
+        """Create or replace an object."""
+
+    @abstractmethod
+    def _uri(self, relative_path: str) -> str:
+        """Printable location of an object, for logs and markers."""
+
+    # --- Shared logic ---
+
+    def _next_part_number(self, relative_dir: str) -> int:
+        numbers = [int(m.group(1)) for m in map(PART_NUMBER_REGEX.search, self._list_part_names(relative_dir)) if m]
+        return max(numbers) + 1 if numbers else 0
+
+    def write(self, df: pd.DataFrame, ingestion_date: str) -> Dict:
+        """
+        Append a DataFrame to the dataset and refresh the day's _SUCCESS marker.
+
+        Args:
+            df: Parsed job rows; the search partition is derived from 'source_file'
+            ingestion_date: Partition value in YYYY-MM-DD format
+
+        Returns:
+            The marker contents, including the parts written by this call under 'run_parts'
+        """
+        date_dir = f"ingestion_date={ingestion_date}"
+        slugs = df['source_file'].map(search_slug_from_source_file) if 'source_file' in df.columns \
+            else pd.Series(UNKNOWN_SEARCH_SLUG, index=df.index)
+
+        run_parts = []
+        for slug, group in df.groupby(slugs, sort=True):
+            search_dir = f"{date_dir}/search={slug}"
+            part_number = self._next_part_number(search_dir)
+            table = pa.Table.from_pandas(group, preserve_index=False)
+
+            for part_table in split_table(table, self.target_file_bytes):
+                buffer = io.BytesIO()
+                pq.write_table(part_table, buffer, compression='snappy')
+                relative_path = f"{search_dir}/part-{part_number:05d}.parquet"
+                self._write_bytes(relative_path, buffer.getvalue(), 'application/parquet')
+                run_parts.append({
+                    'path': relative_path,
+                    'rows': part_table.num_rows,
+                    'bytes': buffer.getbuffer().nbytes,
+                })
+                logger.info(f"Wrote {part_table.num_rows} rows ({buffer.getbuffer().nbytes / 1024:.1f} KB) to {self._uri(relative_path)}")
+                part_number += 1
+
+        marker_path = f"{date_dir}/{SUCCESS_MARKER}"
+        previous_parts = []
+        previous_marker = self._read_text(marker_path)
+        if previous_marker:
+            try:
+                previous_parts = json.loads(previous_marker).get('parts', [])
+            except json.JSONDecodeError:
+                logger.warning(f"Ignoring unreadable marker {self._uri(marker_path)}")
+
+        all_parts = previous_parts + run_parts
+        marker = {
+            'ingestion_date': ingestion_date,
+            'written_at': datetime.now(timezone.utc).isoformat(),
+            'total_rows': sum(p['rows'] for p in all_parts),
+            'parts': all_parts,
+            'run_parts': run_parts,
+        }
+        self._write_bytes(marker_path, json.dumps(marker, indent=2).encode('utf-8'), 'application/json')
+        logger.info(f"Wrote {len(run_parts)} parts and marker {self._uri(marker_path)}")
+        return marker
+
+
+class LocalPartitionedWriter(PartitionedParquetWriter):
+    """Writes the partitioned dataset below a local directory."""
+
+    def __init__(self, base_dir: Path, target_file_bytes: int):
+        super().__init__(target_file_bytes)
+        self.base_dir = Path(base_dir)
+
+    def _list_part_names(self, relative_dir: str) -> List[str]:
+        return [p.name for p in (self.base_dir / relative_dir).glob('part-*.parquet')]
+
+    def _read_text(self, relative_path: str) -> Optional[str]:
+        path = self.base_dir / relative_path
+        return path.read_text(encoding='utf-8') if path.is_file() else None
+
+    def _write_bytes(self, relative_path: str, data: bytes, content_type: str) -> None:
+        path = self.base_dir / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+    def _uri(self, relative_path: str) -> str:
+        return str(self.base_dir / relative_path)
+
+
+class GcsPartitionedWriter(PartitionedParquetWriter):
+    """Writes the partitioned dataset below a GCS prefix."""
+
+    def __init__(self, bucket, prefix: str, target_file_bytes: int):
+        """
+        Args:
+            bucket: google.cloud.storage Bucket to write to
+            prefix: Object prefix the dataset lives under (no trailing slash)
+            target_file_bytes: Approximate upper bound for each part file
+        """
+        super().__init__(target_file_bytes)
+        self.bucket = bucket
+        self.prefix = prefix.strip('/')
+
+    def _blob_name(self, relative_path: str) -> str:
+        return f"{self.prefix}/{relative_path}" if self.prefix else relative_path
+
+    def _list_part_names(self, relative_dir: str) -> List[str]:
+        blobs = self.bucket.client.list_blobs(self.bucket, prefix=self._blob_name(relative_dir) + '/')
+        return [blob.name.rsplit('/', 1)[-1] for blob in blobs]
+
+    def _read_text(self, relative_path: str) -> Optional[str]:
+        blob = self.bucket.blob(self._blob_name(relative_path))
+        return blob.download_as_text() if blob.exists() else None
+
+    def _write_bytes(self, relative_path: str, data: bytes, content_type: str) -> None:
+        blob = self.bucket.blob(self._blob_name(relative_path))
+        # 5 seconds per MB, as for the daily file upload
+        timeout = max(300, len(data) // (1024 * 1024) * 5)
+        blob.upload_from_string(data, content_type=content_type, timeout=timeout)
+
+    def _uri(self, relative_path: str) -> str:
+        return f"gs://{self.bucket.name}/{self._blob_name(relative_path)}"
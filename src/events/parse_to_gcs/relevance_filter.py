@@ -0,0 +1,173 @@
+# relevance_filter.py
+"""
+Early relevance filter for parsed jobs.
+
+Every parsed posting is uploaded, loaded into BigQuery and sent to Gemini for
+labeling, so postings that are clearly out of scope should be dropped before
+any of that. The rules live in config (RELEVANCE_*) and are applied column-wise
+on the DataFrame:
+
+- language of job_description, detected by counting stopwords per language
+  (one compiled regex per language, no external model),
+- title include / exclude keywords, each list compiled to a single alternation,
+- excluded experience levels (normalized enum codes),
+- a company blocklist.
+
+Rejected rows are returned separately with a reject_reason so they can be
+written to a side file instead of silently disappearing.
+"""
+
+import logging
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# Short, very frequent words that are distinctive for each language
+STOPWORDS = {
+    'en': 'the and of to in for with you our we are will is on be as your this that have an or',
+    'pt': 'de que para com uma os das dos em na no ao é sua seu mais ou nossa você são pelo pela',
+    'es': 'el la los las del que para con una por en es su sus más tu nuestro nuestra somos y al',
+    'fr': 'le la les des du et pour avec une dans est vous nous sur au aux sont votre notre qui',
+    'de': 'der die das und mit für ein eine ist wir sie zu auf von den dem im bei unser unsere',
+    'it': 'il la di che per con una del della sono nel nostro nostra il gli le ed al alla siamo',
+    'nl': 'de het een en van voor met wij je jouw zijn op te in ons onze bij naar als ook',
+}
+# Only the beginning of a description is needed to tell its language
+LANGUAGE_SAMPLE_CHARS = 2000
+# A description needs at least this many stopword hits before a language is assigned
+MIN_STOPWORD_HITS = 5
+
+_STOPWORD_REGEXES = {
+    language: re.compile(r'\b(?:' + '|'.join(sorted(set(words.split()), key=len, reverse=True)) + r')\b')
+    for language, words in STOPWORDS.items()
+}
+
+
+def compile_keywords(keywords: Iterable[str]) -> Optional[re.Pattern]:
+    """Compile a keyword list into one case-insensitive, word-bounded alternation (None if empty)."""
+    terms = sorted({k.strip().lower() for k in keywords if k and k.strip()}, key=len, reverse=True)
+    if not terms:
+        return None
+    return re.compile(r'\b(?:' + '|'.join(re.escape(t) for t in terms) + r')\b', re.I)
+
+
+def detect_language(text: pd.Series) -> pd.Series:
+    """
+    Detect the language of each text by stopword counts.
+
+    Returns:
+        Series of language codes ('en', 'pt', ...) or 'unknown' when the text is
+        too short or has no clear winner
+    """
+    sample = text.astype('string').str.slice(0, LANGUAGE_SAMPLE_CHARS).str.lower().fillna('')
+    counts = pd.DataFrame({language: sample.str.count(regex) for language, regex in _STOPWORD_REGEXES.items()},
+                          index=text.index)
+    detected = counts.idxmax(axis=1).where(counts.max(axis=1) >= MIN_STOPWORD_HITS, 'unknown')
+    return detected.astype('string')
+
+
+class RelevanceFilter:
+    """Applies the configured relevance rules to a DataFrame of parsed jobs."""
+
+    def __init__(self,
+                 allowed_languages: Optional[List[str]] = None,
+                 title_include: Optional[List[str]] = None,
+                 title_exclude: Optional[List[str]] = None,
+                 excluded_experience_levels: Optional[List[str]] = None,
+                 company_blocklist: Optional[List[str]] = None):
+        """
+        Args:
+            allowed_languages: Description languages to keep (empty keeps all; 'unknown' is always kept)
+            title_include: Keep only titles matching at least one of these keywords (empty keeps all)
+            title_exclude: Drop titles matching any of these keywords
+            excluded_experience_levels: experience_level_code values to drop (e.g. 'internship')
+            company_blocklist: Company names to drop (case-insensitive exact match)
+        """
+        self.allowed_languages = set(allowed_languages or [])
+        self.title_include = compile_keywords(title_include or [])
+        self.title_exclude = compile_keywords(title_exclude or [])
+        self.excluded_experience_levels = set(excluded_experience_levels or [])
+        self.company_blocklist = {c.strip().lower() for c in (company_blocklist or []) if c.strip()}
+
+    @classmethod
+    def from_config(cls) -> 'RelevanceFilter':
+        return cls(
+            allowed_languages=config.RELEVANCE_ALLOWED_LANGUAGES,
+            title_include=config.RELEVANCE_TITLE_INCLUDE,
+            title_exclude=config.RELEVANCE_TITLE_EXCLUDE,
+            excluded_experience_levels=config.RELEVANCE_EXCLUDED_EXPERIENCE_LEVELS,
+            company_blocklist=config.RELEVANCE_COMPANY_BLOCKLIST,
+        )
+
+    def apply(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Split the DataFrame into relevant and rejected rows.
+
+        Returns:
+            (kept rows, rejected rows with 'reject_reason' and 'detected_language' columns)
+        """
+        reasons = pd.Series(pd.NA, index=df.index, dtype='string')
+
+        def reject(mask: pd.Series, reason: str) -> None:
+            # The first rule that matches is the reported reason
+            reasons[mask.fillna(False) & reasons.isna()] = reason
+
+        empty = pd.Series(pd.NA, index=df.index, dtype='string')
+        titles = df.get('job_title', empty).astype('string')
+
+        if self.company_blocklist:
+            companies = df.get('company_name', empty).astype('string').str.strip().str.lower()
+            reject(companies.isin(self.company_blocklist), 'company_blocklist')
+        if self.title_exclude is not None:
+            reject(titles.str.contains(self.title_exclude, na=False), 'title_excluded')
+        if self.title_include is not None:
+            reject(~titles.str.contains(self.title_include, na=False), 'title_not_included')
+        if self.excluded_experience_levels and 'experience_level_code' in df.columns:
+            reject(df['experience_level_code'].astype('string').isin(self.excluded_experience_levels),
+                   'experience_level')
+
+        languages = None
+        if self.allowed_languages:
+            languages = detect_language(df.get('job_description', empty))
+            reject(~languages.isin(self.allowed_languages | {'unknown'}), 'language')
+
+        rejected_mask = reasons.notna()
+        rejected = df[rejected_mask].assign(reject_reason=reasons[rejected_mask])
+        if languages is not None:
+            rejected = rejected.assign(detected_language=languages[rejected_mask])
+
+        if rejected_mask.any():
+            logger.info(f"Relevance filter rejected {int(rejected_mask.sum())} of {len(df)} jobs: "
+                        f"{reasons[rejected_mask].value_counts().to_dict()}")
+        return df[~rejected_mask], rejected
+
+    @staticmethod
+    def reason_counts(rejected: pd.DataFrame) -> Dict[str, int]:
+        """Rejections per reason, for the run stats."""
+        if rejected.empty:
+            return {}
+        return {str(k): int(v) for k, v in rejected['reject_reason'].value_counts().items()}
+
+
+def save_rejected(rejected: pd.DataFrame, output_dir: Path, run_started_at: str) -> Optional[Path]:
+    """
+    Write rejected rows to a side file so filter decisions can be reviewed.
+
+    Returns:
+        Path of the written file, or None when nothing was rejected
+    """
+    if rejected.empty:
+        return None
+    rejected_dir = output_dir / config.REJECTED_JOBS_DIRNAME
+    rejected_dir.mkdir(parents=True, exist_ok=True)
+    run_tag = re.sub(r'[^0-9T]', '', run_started_at.split('.')[0])
+    rejected_path = rejected_dir / f"rejected_jobs_{run_tag}.parquet"
+    rejected.to_parquet(rejected_path, index=False)
+    logger.info(f"Wrote {len(rejected)} rejected jobs to {rejected_path}")
+    return rejected_path
@@ -0,0 +1,123 @@
+# selector_scope.py
+"""
+Scoped DOM building for the CSS selector fallback.
+
+Every selector in config.SELECTORS starts at a small, recognisable element (the
+top card's company name, the job insights list, the apply button, ...). When
+only a few fields are left for the selectors, ScopeStrainer tells BeautifulSoup
+to keep just the subtrees rooted at those elements, so the rest of the page (the
+feed, the filler markup, the description when it already came from embedded
+metadata) is never turned into Tag objects. The selectors run unchanged on the
+scoped tree and return what they would have returned on the full DOM.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from bs4 import SoupStrainer
+
+# The first compound selector: an optional tag name followed by #id, .class and [attr] parts
+_COMPOUND_REGEX = re.compile(r'^([a-zA-Z][\w-]*)?((?:[#.][\w-]+|\[[^\]]+\])*)$')
+_PART_REGEX = re.compile(r'([#.])([\w-]+)|\[\s*([\w-]+)\s*(?:([*^$~]?=)\s*["\']?([^"\'\]]*)["\']?)?\s*\]')
+_COMBINATOR_REGEX = re.compile(r'\s*[\s>+~]\s*')
+
+# (tag name, id, classes, [(attribute, operator, value)])
+Anchor = Tuple[Optional[str], Optional[str], List[str], List[Tuple[str, Optional[str], str]]]
+
+
+def selector_anchor(selector: str) -> Optional[Anchor]:
+    """
+    Parse the element a selector starts at.
+
+    Returns:
+        The anchor, or None if its first compound uses syntax this module does not
+        match (e.g. pseudo-classes), in which case the full DOM is needed
+    """
+    first = _COMBINATOR_REGEX.split(selector.strip(), maxsplit=1)[0]
+    match = _COMPOUND_REGEX.match(first)
+    if not match or not first:
+        return None
+    element_id, classes, attributes = None, [], []
+    for prefix, name, attribute, operator, value in _PART_REGEX.findall(match.group(2)):
+        if prefix == '#':
+            element_id = name
+        elif prefix == '.':
+            classes.append(name)
+        else:
+            attributes.append((attribute, operator or None, value))
+    return match.group(1), element_id, classes, attributes
+
+
+def _attribute_matches(actual: Optional[str], operator: Optional[str], expected: str) -> bool:
+    if actual is None:
+        return False
+    if operator is None:
+        return True
+    if operator == '=':
+        return actual == expected
+    if operator == '*=':
+        return expected in actual
+    if operator == '^=':
+        return actual.startswith(expected)
+    if operator == '$=':
+        return actual.endswith(expected)
+    return expected in actual.split()  # ~=
+
+
+def anchor_matches(anchor: Anchor, name: str, attrs: Dict) -> bool:
+    """Whether a start tag (as handed to the tree builder) is the element an anchor describes."""
+    tag_name, element_id, classes, attributes = anchor
+    if tag_name and tag_name.lower() != name.lower():
+        return False
+    if element_id and attrs.get('id') != element_id:
+        return False
+    if classes:
+        tag_classes = attrs.get('class') or []
+        if isinstance(tag_classes, str):
+            tag_classes = tag_classes.split()
+        if not all(cls in tag_classes for cls in classes):
+            return False
+    for attribute, operator, value in attributes:
+        actual = attrs.get(attribute)
+        if isinstance(actual, list):
+            actual = ' '.join(actual)
+        if not _attribute_matches(actual, operator, value):
+            return False
+    return True
+
+
+class ScopeStrainer(SoupStrainer):
+    """Keeps the subtrees rooted at any of the anchors, and nothing outside them."""
+
+    def __init__(self, anchors: Iterable[Anchor]):
+        super().__init__()
+        self.anchors = list(anchors)
+
+    def _keeps(self, name: str, attrs: Optional[Dict]) -> bool:
+        return any(anchor_matches(anchor, name, attrs or {}) for anchor in self.anchors)
+
+    # beautifulsoup4 >= 4.13 asks before creating each top-level tag and string
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        return self._keeps(name, attrs)
+
+    def allow_string_creation(self, string) -> bool:
+        return False
+
+    # Older releases call search_tag for each top-level start tag instead
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        if isinstance(markup_name, str):
+            return markup_name if self._keeps(markup_name, dict(markup_attrs or {})) else None
+        return super().search_tag(markup_name, markup_attrs)
+
+
+def scope_strainer(selectors: Iterable[str]) -> Optional[ScopeStrainer]:
+    """
+    Strainer keeping only what the given selectors can match.
+
+    Returns:
+        None if any selector's anchor cannot be determined (build the full DOM then)
+    """
+    anchors = [selector_anchor(selector) for selector in selectors]
+    if not anchors or any(anchor is None for anchor in anchors):
+        return None
+    return ScopeStrainer(anchors)
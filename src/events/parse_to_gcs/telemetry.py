@@ -0,0 +1,125 @@
+# telemetry.py
+"""
+Per-field extraction telemetry for LinkedInJobParser.
+
+When LinkedIn changes its markup, selectors silently start returning None.
+ExtractionTelemetry counts, per field, how many parsed pages yielded a value
+and which source produced it (parse cache, embedded metadata or CSS
+selector), and accumulates the time spent in every backend and selector. The
+flow writes the resulting report next to its output and checks it against
+config.FIELD_HIT_RATE_THRESHOLDS before anything is uploaded.
+"""
+
+import json
+import logging
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionTelemetry:
+    """Accumulates field hit counts and extraction timings over a run."""
+
+    def __init__(self, fields: Iterable[str]):
+        """
+        Args:
+            fields: Names of the fields to report on (normally the keys of config.SELECTORS)
+        """
+        self.fields = list(fields)
+        self.pages = 0
+        self.hits: Dict[str, int] = defaultdict(int)
+        self.hits_by_source: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self.calls: Dict[str, int] = defaultdict(int)
+
+    def add_time(self, name: str, seconds: float) -> None:
+        """Add time spent in a backend ('embedded_metadata', 'soup_build', ...) or a selector ('selector:<field>')."""
+        self.seconds[name] += seconds
+        self.calls[name] += 1
+
+    def record_page(self, job_data: Dict[str, Any], sources: Dict[str, str]) -> None:
+        """
+        Count the fields found on one parsed page.
+
+        Args:
+            job_data: The extracted record
+            sources: Field name -> source that produced it ('parse_cache', 'embedded_metadata', 'selector')
+        """
+        self.pages += 1
+        for field in self.fields:
+            if job_data.get(field) not in (None, ''):
+                self.hits[field] += 1
+                self.hits_by_source[field][sources.get(field, 'selector')] += 1
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Build the run report.
+
+        Returns:
+            Dict with the page count, per-field hit/null rates and per-backend timings
+        """
+        fields = {}
+        for field in self.fields:
+            hits = self.hits[field]
+            selector_key = f"selector:{field}"
+            fields[field] = {
+                'hits': hits,
+                'nulls': self.pages - hits,
+                'hit_rate': round(hits / self.pages, 4) if self.pages else None,
+                'null_rate': round(1 - hits / self.pages, 4) if self.pages else None,
+                'hits_by_source': dict(self.hits_by_source[field]),
+                'selector_calls': self.calls.get(selector_key, 0),
+                'selector_seconds': round(self.seconds.get(selector_key, 0.0), 4),
+            }
+        backends = {
+            name: {'calls': self.calls[name], 'seconds': round(seconds, 4),
+                   'ms_per_call': round(seconds * 1000 / self.calls[name], 3) if self.calls[name] else None}
+            for name, seconds in sorted(self.seconds.items()) if not name.startswith('selector:')
+        }
+        return {'pages': self.pages, 'fields': fields, 'backends': backends}
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Summary for the run stats."""
+        return {'pages_with_telemetry': self.pages}
+
+
+def check_hit_rates(report: Dict[str, Any], thresholds: Dict[str, float],
+                    min_pages: int = 0) -> List[str]:
+    """
+    Compare field hit rates against their thresholds.
+
+    Args:
+        report: Output of ExtractionTelemetry.report
+        thresholds: Field name -> minimum hit rate (0-1)
+        min_pages: Below this many pages the rates are too noisy to judge
+
+    Returns:
+        One message per field below its threshold (empty when healthy)
+    """
+    if report['pages'] < min_pages:
+        logger.info(f"Only {report['pages']} pages parsed; skipping the hit-rate check (minimum {min_pages}).")
+        return []
+
+    violations = []
+    for field, threshold in thresholds.items():
+        field_report = report['fields'].get(field)
+        if not field_report or field_report['hit_rate'] is None:
+            continue
+        if field_report['hit_rate'] < threshold:
+            violations.append(
+                f"{field}: hit rate {field_report['hit_rate']:.1%} below threshold {threshold:.0%} "
+                f"({field_report['nulls']} of {report['pages']} pages without a value)"
+            )
+    return violations
+
+
+def write_report(report: Dict[str, Any], report_path: Path, violations: Optional[List[str]] = None) -> Path:
+    """Write the telemetry report (and any threshold violations) as JSON."""
+    payload = dict(report, violations=violations or [])
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2)
+    logger.info(f"Extraction report written to {report_path}")
+    return report_path
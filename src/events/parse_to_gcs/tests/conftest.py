@@ -0,0 +1,7 @@
+# tests/conftest.py
+import sys
+from pathlib import Path
+
+# The parser modules use flat imports (import config), so put their directory on sys.path
+PARSER_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PARSER_DIR))
@@ -0,0 +1,158 @@
+# tests/test_capture_archive.py
+import base64
+import random
+import tarfile
+
+import google_crc32c
+import pytest
+from google.cloud.exceptions import NotFound
+
+import capture_archive
+from capture_archive import archive_captures, restore_archive
+
+
+class FakeBlob:
+    def __init__(self, bucket, name):
+        self.bucket, self.name = bucket, name
+        self.content_type = None
+
+    def upload_from_string(self, data, **kwargs):
+        if self.name in self.bucket.fail_uploads:
+            raise ConnectionError(f"upload of {self.name} failed")
+        self.bucket.objects[self.name] = data.encode('utf-8') if isinstance(data, str) else data
+
+    def compose(self, sources):
+        if self.bucket.fail_compose:
+            raise ConnectionError("compose failed")
+        self.bucket.objects[self.name] = b''.join(self.bucket.objects[s.name] for s in sources)
+
+    def delete(self):
+        if self.bucket.objects.pop(self.name, None) is None:
+            raise NotFound(self.name)
+
+    def reload(self):
+        pass
+
+    @property
+    def crc32c(self):
+        return base64.b64encode(google_crc32c.Checksum(self.bucket.objects[self.name]).digest()).decode('ascii')
+
+    def download_as_text(self):
+        return self.bucket.objects[self.name].decode('utf-8')
+
+    def download_to_filename(self, filename):
+        with open(filename, 'wb') as f:
+            f.write(self.bucket.objects[self.name])
+
+
+class FakeBucket:
+    name = 'test-bucket'
+
+    def __init__(self):
+        self.objects = {}
+        self.fail_uploads = set()
+        self.fail_compose = False
+
+    def blob(self, name):
+        return FakeBlob(self, name)
+
+
+@pytest.fixture
+def captures(tmp_path):
+    capture_dir = tmp_path / 'captures'
+    capture_dir.mkdir()
+    rng = random.Random(42)  # Incompressible, so the archive spans many parts
+    paths = []
+    for i in range(40):
+        path = capture_dir / f"linkedin_data_engineer_lisbon_p01_id{4000000000 + i}.html"
+        path.write_bytes(f"<html>{i}</html>".encode('utf-8') + rng.randbytes(2048))
+        paths.append(path)
+    return paths
+
+
+def test_archive_round_trip_without_data_filter(captures, tmp_path, monkeypatch):
+    bucket = FakeBucket()
+    archive_captures(captures, bucket, 'raw/captures.tar.gz', part_size=1024, max_workers=4)
+    assert sorted(bucket.objects) == ['raw/captures.tar.gz', 'raw/captures.tar.gz.manifest.json']
+
+    # Interpreters before 3.10.12 have no extraction filters
+    monkeypatch.delattr(tarfile, 'data_filter', raising=False)
+    restored = restore_archive(bucket, 'raw/captures.tar.gz', tmp_path / 'restored')
+    assert [p.read_bytes() for p in restored] == [p.read_bytes() for p in captures]
+
+
+def test_fallback_extraction_rejects_escaping_members(tmp_path, monkeypatch):
+    archive_path = tmp_path / 'evil.tar.gz'
+    payload = tmp_path / 'payload.html'
+    payload.write_text('x')
+    with tarfile.open(archive_path, 'w:gz') as tar:
+        tar.add(payload, arcname='../escaped.html')
+
+    monkeypatch.delattr(tarfile, 'data_filter', raising=False)
+    with tarfile.open(archive_path, 'r:gz') as tar, pytest.raises(ValueError):
+        capture_archive._safe_extract(tar, tmp_path / 'restored')
+    assert not (tmp_path / 'escaped.html').exists()
+
+
+def test_failed_upload_leaves_no_parts(captures):
+    bucket = FakeBucket()
+    bucket.fail_uploads = {'raw/captures.tar.gz.part-00003'}
+    with pytest.raises(ConnectionError):
+        archive_captures(captures, bucket, 'raw/captures.tar.gz', part_size=1024, max_workers=4)
+    assert bucket.objects == {}
+
+
+def test_failed_compose_leaves_no_parts_or_intermediates(captures, monkeypatch):
+    bucket = FakeBucket()
+    monkeypatch.setattr(capture_archive, 'MAX_COMPOSE_SOURCES', 4)
+    original_compose = FakeBlob.compose
+
+    def compose_then_fail_on_destination(self, sources):
+        if self.name == 'raw/captures.tar.gz':
+            raise ConnectionError("compose failed")
+        original_compose(self, sources)
+
+    monkeypatch.setattr(FakeBlob, 'compose', compose_then_fail_on_destination)
+    with pytest.raises(ConnectionError):
+        archive_captures(captures, bucket, 'raw/captures.tar.gz', part_size=1024, max_workers=4)
+    assert bucket.objects == {}
+
+
+BROKEN_PAGE = '<html><body><div>markup changed</div></body></html>'
+# Only the title link still matches its selector, so every other field's hit rate is 0
+TITLE_ONLY_PAGE = ('<html><body><div class="job-details-jobs-unified-top-card__job-title"><h1>'
+                   '<a href="https://www.linkedin.com/jobs/view/40000000{i}/">Data Engineer</a></h1></div></body></html>')
+
+
+@pytest.mark.parametrize("page, hit_rate_mode", [
+    (BROKEN_PAGE, "alert"),      # no job_id anywhere: the flow stops on an empty DataFrame
+    (TITLE_ONLY_PAGE, "fail"),   # only ids and titles parse: the hit-rate gate raises
+], ids=["nothing-parses", "hit-rate-fail"])
+def test_flow_archives_captures_of_broken_selector_runs(tmp_path, monkeypatch, page, hit_rate_mode):
+    import logging
+    from types import SimpleNamespace
+
+    import main
+
+    input_dir = tmp_path / 'html'
+    input_dir.mkdir()
+    for i in range(3):
+        (input_dir / f'capture_{i}.html').write_text(page.format(i=i))
+    bucket = FakeBucket()
+    monkeypatch.setattr(main, 'get_run_logger', lambda: logging.getLogger('test_flow'))
+    monkeypatch.setattr(main.gcp_clients, 'get_storage_client', lambda: SimpleNamespace(bucket=lambda name: bucket))
+    monkeypatch.setattr(main.config, 'HIT_RATE_CHECK_MIN_PAGES', 1)
+    monkeypatch.setattr(main.config, 'HIT_RATE_ON_VIOLATION', hit_rate_mode)
+    monkeypatch.setattr(main.config, 'USE_PARSE_CACHE', False)
+    monkeypatch.setattr(main.config, 'KEEP_RECORDS_WITHOUT_JOB_ID', False)
+
+    try:
+        main.linkedin_parser_flow.fn(input_dir=input_dir, output_dir=tmp_path / 'out',
+                                     upload_to_gcs=True, archive_raw_captures=True)
+    except RuntimeError as e:
+        assert hit_rate_mode == "fail" and "hit-rate threshold" in str(e)
+    else:
+        assert hit_rate_mode != "fail"
+
+    archives = [name for name in bucket.objects if name.endswith('.tar.gz')]
+    assert len(archives) == 1
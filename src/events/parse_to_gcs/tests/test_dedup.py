@@ -0,0 +1,46 @@
+# tests/test_dedup.py
+from dedup import JobDeduplicator
+
+
+def capture(source_file, captured_at, **fields):
+    return {'job_id': '4000000001', 'source_file': source_file, 'captured_at': captured_at, **fields}
+
+
+def test_replaced_record_repoints_earlier_duplicates():
+    deduplicator = JobDeduplicator()
+    first = capture('a.html', '2025-01-01T08:00:00', job_title='Engineer')
+    second = capture('b.html', '2025-01-01T07:00:00', job_title='Engineer')  # older: dropped for a.html
+    third = capture('c.html', '2025-01-01T09:00:00', job_title='Engineer', company_name='Acme')
+
+    [kept] = list(deduplicator.deduplicate([[first, second], [third]]))
+
+    assert kept == [third]
+    assert deduplicator.dropped == [
+        {'job_id': '4000000001', 'dropped_source_file': 'b.html', 'kept_source_file': 'c.html'},
+        {'job_id': '4000000001', 'dropped_source_file': 'a.html', 'kept_source_file': 'c.html'},
+    ]
+
+
+def test_every_dropped_capture_points_at_the_final_record():
+    deduplicator = JobDeduplicator()
+    for source_file, captured_at in [('a.html', '08:00'), ('b.html', '09:00'), ('c.html', '10:00')]:
+        # Same content: the latest capture wins each time
+        deduplicator.add(capture(source_file, f'2025-01-01T{captured_at}:00', job_title='Engineer'))
+
+    assert {entry['dropped_source_file']: entry['kept_source_file'] for entry in deduplicator.dropped} == {
+        'a.html': 'c.html',
+        'b.html': 'c.html',
+    }
+
+
+def test_other_jobs_are_not_repointed():
+    deduplicator = JobDeduplicator()
+    deduplicator.add({'job_id': '1', 'source_file': 'x.html', 'captured_at': '1'})
+    deduplicator.add({'job_id': '1', 'source_file': 'y.html', 'captured_at': '0'})
+    deduplicator.add({'job_id': '2', 'source_file': 'p.html', 'captured_at': '0'})
+    deduplicator.add({'job_id': '2', 'source_file': 'q.html', 'captured_at': '1'})
+
+    assert [(e['dropped_source_file'], e['kept_source_file']) for e in deduplicator.dropped] == [
+        ('y.html', 'x.html'),
+        ('p.html', 'q.html'),
+    ]
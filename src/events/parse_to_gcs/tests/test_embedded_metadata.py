@@ -0,0 +1,37 @@
+# tests/test_embedded_metadata.py
+import json
+
+import pytest
+
+from embedded_metadata import extract_embedded_fields
+
+
+def _page(document) -> bytes:
+    return (f'<html><head><script type="application/ld+json">{json.dumps(document)}</script>'
+            f'</head><body></body></html>').encode('utf-8')
+
+
+POSTING = {'@type': 'JobPosting', 'title': 'Data Engineer', 'identifier': {'value': '4000000001'}}
+
+
+@pytest.mark.parametrize('job_location', ['Lisbon, Portugal', ['Lisbon', 'Porto'], [{'address': 'Lisbon'}], None])
+def test_unstructured_job_location_is_ignored(job_location):
+    fields = extract_embedded_fields(_page({**POSTING, 'jobLocation': job_location}), '4000000001')
+    assert fields['job_title'] == 'Data Engineer'
+    assert 'location' not in fields
+
+
+@pytest.mark.parametrize('graph, job_title', [
+    ('not a list', None),
+    (POSTING, 'Data Engineer'),
+    ([POSTING, 'stray', 42], 'Data Engineer'),
+])
+def test_graph_that_is_not_a_list_of_dicts(graph, job_title):
+    fields = extract_embedded_fields(_page({'@context': 'http://schema.org', '@graph': graph}), '4000000001')
+    assert fields.get('job_title') == job_title
+
+
+def test_structured_job_location():
+    job_location = [{'address': {'addressLocality': 'Lisbon', 'addressCountry': 'PT'}}]
+    fields = extract_embedded_fields(_page({**POSTING, 'jobLocation': job_location}), '4000000001')
+    assert fields['location'] == 'Lisbon, PT'
@@ -0,0 +1,87 @@
+# tests/test_gcs_stream.py
+import io
+import os
+import random
+import sys
+import uuid
+from pathlib import Path
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from gcs_stream import stream_parquet_to_gcs
+
+# The shared clients live in src/events, as for main.py
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+import gcp_clients  # noqa: E402
+
+
+class _UploadStream(io.BytesIO):
+    """Stands in for blob.open("wb"): keeps the bytes once the stream is closed."""
+
+    def __init__(self, blob):
+        super().__init__()
+        self._blob = blob
+
+    def close(self):
+        if not self.closed:
+            self._blob.data = self.getvalue()
+        super().close()
+
+
+class _Bucket:
+    name = 'test-bucket'
+
+
+class FakeBlob:
+    name = 'out/linkedin_scrap_2025-01-01.parquet'
+    bucket = _Bucket()
+    data = None
+
+    def open(self, mode, **kwargs):
+        return _UploadStream(self)
+
+
+def test_streams_object_dtype_frame_across_row_groups():
+    df = pd.DataFrame({
+        'job_id': pd.Series([str(i) for i in range(25)], dtype=object),
+        'job_title': pd.Series([None] * 10 + [f"title {i}" for i in range(15)], dtype=object),
+        'applicant_count_num': pd.array(range(25), dtype='Int64'),
+    })
+    blob = FakeBlob()
+
+    stats = stream_parquet_to_gcs(df, blob, row_group_size=10)
+
+    parquet_file = pq.ParquetFile(io.BytesIO(blob.data))
+    assert stats['rows'] == 25
+    assert parquet_file.metadata.num_row_groups == 3
+    assert str(parquet_file.schema_arrow.field('job_id').type) == 'string'
+    assert str(parquet_file.schema_arrow.field('job_title').type) == 'string'
+    result = parquet_file.read().to_pandas()
+    assert result['job_id'].tolist() == df['job_id'].tolist()
+    assert result['job_title'].isna().sum() == 10
+
+
+@pytest.mark.skipif(not os.getenv("STORAGE_EMULATOR_HOST"), reason="needs a GCS emulator (STORAGE_EMULATOR_HOST)")
+def test_streams_to_the_emulator_in_several_chunks():
+    gcp_clients.reset()
+    bucket = gcp_clients.get_storage_client().create_bucket(f"stream-test-{uuid.uuid4().hex[:8]}")
+    blob_name = 'linkedin/raw/linkedin_scrap_2025-01-01.parquet'
+    rng = random.Random(7)
+    df = pd.DataFrame({
+        'job_id': [str(4_000_000_000 + i) for i in range(20_000)],
+        'job_description': [rng.randbytes(48).hex() for _ in range(20_000)],
+    })
+    try:
+        stats = stream_parquet_to_gcs(df, bucket.blob(blob_name), row_group_size=5_000, chunk_size=256 * 1024)
+
+        data = bucket.blob(blob_name).download_as_bytes()
+        assert stats['rows'] == 20_000
+        assert stats['bytes'] == len(data) > 2 * 256 * 1024  # more than one resumable chunk
+        parquet_file = pq.ParquetFile(io.BytesIO(data))
+        assert parquet_file.metadata.num_row_groups == 4
+        pd.testing.assert_frame_equal(parquet_file.read().to_pandas(), df, check_dtype=False)
+    finally:
+        bucket.delete(force=True)
+        gcp_clients.reset()
@@ -0,0 +1,48 @@
+# tests/test_incremental.py
+import os
+import re
+import sys
+from pathlib import Path
+
+import config
+from main import LinkedInJobParser
+from manifest import ParseManifest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+from corpus import generate_corpus  # noqa: E402
+
+INGESTION_DATE = "2025-01-01"
+
+
+def _incremental_run(parser: LinkedInJobParser, manifest: ParseManifest) -> int:
+    """Parse the new or changed files and append them, as the flow does in incremental mode."""
+    html_files = manifest.select_changed(parser.find_html_files())
+    df = parser.create_dataframe_from_batches(parser.process_html_batch(html_files, batch_size=10))
+    partition_dir = parser.append_to_dataset(df, INGESTION_DATE)
+    for file_path, job_id in zip(html_files, df['job_id']):
+        manifest.record(file_path, job_id, partition_dir.name)
+    manifest.save()
+    return len(html_files)
+
+
+def test_reparsed_edited_file_replaces_its_row(tmp_path):
+    input_dir, output_dir = tmp_path / "html", tmp_path / "out"
+    output_dir.mkdir()
+    files = generate_corpus(input_dir, num_files=30, target_kb=2, sparsity=0.0)
+    parser = LinkedInJobParser(input_dir, output_dir, config.DEFAULT_OUTPUT_FILENAME)
+    manifest = ParseManifest(output_dir / config.PARSE_MANIFEST_FILENAME)
+
+    assert _incremental_run(parser, manifest) == 30
+
+    edited = files[7]
+    job_id = re.search(r'_id(\d+)\.html$', edited.name).group(1)
+    page = edited.read_text(encoding='utf-8')
+    edited.write_text(re.sub(r'(<h1><a [^>]*>)[^<]*', r'\1Edited Title', page), encoding='utf-8')
+    os.utime(edited, ns=(edited.stat().st_atime_ns, edited.stat().st_mtime_ns + 1_000_000_000))
+
+    assert _incremental_run(parser, manifest) == 1
+
+    partition = parser.read_partition(INGESTION_DATE)
+    assert len(partition) == 30
+    assert partition['job_id'].is_unique
+    assert partition.loc[partition['job_id'] == job_id, 'job_title'].tolist() == ["Edited Title"]
@@ -0,0 +1,74 @@
+# tests/test_selector_scope.py
+import sys
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+import config
+import main
+from main import LinkedInJobParser
+from selector_scope import anchor_matches, scope_strainer, selector_anchor
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+from corpus import generate_corpus  # noqa: E402
+
+
+@pytest.mark.parametrize('field', sorted(config.SELECTORS))
+def test_every_configured_selector_has_an_anchor(field):
+    assert selector_anchor(config.SELECTORS[field]) is not None
+
+
+def test_anchor_parsing_and_matching():
+    anchor = selector_anchor("li.insight.insight--highlight[data-x='1'] span > a")
+    assert anchor == ('li', None, ['insight', 'insight--highlight'], [('data-x', '=', '1')])
+    assert anchor_matches(anchor, 'li', {'class': 'insight insight--highlight', 'data-x': '1'})
+    assert anchor_matches(anchor, 'LI', {'class': ['insight--highlight', 'insight'], 'data-x': '1'})
+    assert not anchor_matches(anchor, 'li', {'class': 'insight', 'data-x': '1'})
+    assert not anchor_matches(anchor, 'div', {'class': 'insight insight--highlight', 'data-x': '1'})
+
+    logo = selector_anchor("a[aria-label*='logo'] img")
+    assert anchor_matches(logo, 'a', {'aria-label': 'Acme logo'})
+    assert not anchor_matches(logo, 'a', {'href': '#'})
+    assert anchor_matches(selector_anchor('#job-details > div.mt4'), 'div', {'id': 'job-details'})
+
+
+@pytest.mark.parametrize('selector', ['li:first-child span', '*', ''])
+def test_unsupported_anchor_means_full_dom(selector):
+    assert selector_anchor(selector) is None
+    assert scope_strainer([config.SELECTORS['job_title'], selector]) is None
+
+
+@pytest.mark.parametrize('html_parser', ['lxml', 'html.parser'])
+@pytest.mark.parametrize('embed_metadata', [False, True])
+def test_scoped_dom_extracts_the_same_fields_as_the_full_dom(tmp_path, html_parser, embed_metadata):
+    files = generate_corpus(tmp_path / 'html', num_files=40, target_kb=4, sparsity=0.3,
+                            embed_metadata=embed_metadata)
+    scoped = LinkedInJobParser(tmp_path / 'html', tmp_path / 'out', 'x.parquet', html_parser=html_parser)
+    full = LinkedInJobParser(tmp_path / 'html', tmp_path / 'out', 'x.parquet', html_parser=html_parser)
+    full._strainer_for = lambda fields: None
+
+    for file_path in files:
+        assert scoped.process_single_file(file_path) == full.process_single_file(file_path)
+
+
+def test_fields_from_embedded_metadata_are_not_built_into_the_dom(tmp_path, monkeypatch):
+    [page] = generate_corpus(tmp_path / 'html', num_files=1, target_kb=200, sparsity=0.0, embed_metadata=True)
+    built = []
+
+    def recording_soup(*args, **kwargs):
+        soup = BeautifulSoup(*args, **kwargs)
+        built.append(soup)
+        return soup
+
+    monkeypatch.setattr(main, 'BeautifulSoup', recording_soup)
+    parser = LinkedInJobParser(tmp_path / 'html', tmp_path / 'out', 'x.parquet', html_parser='lxml')
+    job_data = parser.process_single_file(page)
+
+    [soup] = built
+    full_dom = BeautifulSoup(page.read_bytes(), 'lxml')
+    # Title, company, link and description came from JSON-LD; only the top card's other fields were parsed
+    assert job_data['job_description'] and job_data['skills_summary'] and job_data['application_type']
+    assert soup.select_one('#job-details') is None
+    assert soup.select_one('head') is None
+    assert len(soup.find_all(True)) * 20 < len(full_dom.find_all(True))